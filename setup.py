@@ -101,6 +101,7 @@ setuptools.setup(
             'chain_walk = pycolab.examples.classics.chain_walk:main',
             'cliff_walk = pycolab.examples.classics.cliff_walk:main',
             'four_rooms = pycolab.examples.classics.four_rooms:main',
+            'pycolab_benchmarks = pycolab.benchmarks.run:main',
         ],
     },
 
@@ -33,7 +33,9 @@ def ascii_art_to_game(art,
                       sprites=None, drapes=None, backdrop=things.Backdrop,
                       update_schedule=None,
                       z_order=None,
-                      occlusion_in_layers=True):
+                      occlusion_in_layers=True,
+                      instance_maps=False,
+                      tile_size=None):
   """Construct a pycolab game from an ASCII art diagram.
 
   This function helps to turn ASCII art diagrams like the following
@@ -73,6 +75,10 @@ def ascii_art_to_game(art,
       Partial(MySprite, 'yawning', drink_quantity='three pints')
       Partial(MySprite, mood='asleep', drink_quantity='four pints')
 
+  If you build many games that differ only in their art (e.g. a new level for
+  every episode), consider using `compile_game_spec` instead, which checks all
+  of the other arguments just once.
+
   Args:
     art: An ASCII art diagram depicting a game board. This should be a list or
         tuple whose values are all strings containing the same number of ASCII
@@ -129,6 +135,10 @@ def ascii_art_to_game(art,
         **NOTE: This flag also determines the occlusion behavior in `layers`
         arguments to all game entities' `update` methods; see docstrings in
         [things.py] for details.**
+    instance_maps: If `True`, the `Engine` also renders per-pixel entity
+        instance ID and footprint character maps; see the `Engine` constructor.
+    tile_size: If not None, the `Engine` only repaints the changed tiles of
+        this size on the board; see the `Engine` constructor.
 
   Returns:
     An initialised `Engine` object as described.
@@ -140,6 +150,56 @@ def ascii_art_to_game(art,
         the requirements stipulated in Args:. The exception messages should make
         most errors fairly easy to debug.
   """
+  return compile_game_spec(
+      what_lies_beneath, sprites=sprites, drapes=drapes, backdrop=backdrop,
+      update_schedule=update_schedule, z_order=z_order,
+      occlusion_in_layers=occlusion_in_layers,
+      instance_maps=instance_maps, tile_size=tile_size).instantiate(art)
+
+
+def compile_game_spec(what_lies_beneath,
+                      sprites=None, drapes=None, backdrop=things.Backdrop,
+                      update_schedule=None,
+                      z_order=None,
+                      occlusion_in_layers=True,
+                      instance_maps=False,
+                      tile_size=None):
+  """Prepare to construct many pycolab games from different ASCII art diagrams.
+
+  `ascii_art_to_game` spends much of its time normalising and checking the
+  arguments that describe a game's `Sprite`s, `Drape`s, update schedule and so
+  on. Games that build a new `Engine` for every episode usually pass the same
+  arguments each time, with only the art changing. This function does all of
+  that work once and returns a `GameTemplate`, whose `instantiate` method
+  builds games from ASCII art diagrams with only the work that depends on the
+  art itself. In other words,
+
+      ascii_art.compile_game_spec(what_lies_beneath, **kwargs).instantiate(art)
+
+  is equivalent to `ascii_art.ascii_art_to_game(art, what_lies_beneath,
+  **kwargs)`.
+
+  Args:
+    what_lies_beneath: see `ascii_art_to_game`. If this is an ASCII art
+        diagram, then every diagram passed to `instantiate` must have the same
+        shape.
+    sprites: see `ascii_art_to_game`.
+    drapes: see `ascii_art_to_game`.
+    backdrop: see `ascii_art_to_game`.
+    update_schedule: see `ascii_art_to_game`.
+    z_order: see `ascii_art_to_game`.
+    occlusion_in_layers: see `ascii_art_to_game`.
+    instance_maps: see `ascii_art_to_game`.
+    tile_size: see `ascii_art_to_game`.
+
+  Returns:
+    A `GameTemplate` as described.
+
+  Raises:
+    TypeError: when `update_schedule` is neither a "flat" list of characters
+        nor a list of lists of characters.
+    ValueError: numerous causes; see `ascii_art_to_game`.
+  """
   ### 1. Set default arguments, normalise arguments, derive various things ###
 
   # Convert sprites and drapes to be dicts of Partials only. "Bare" Sprite
@@ -211,21 +271,12 @@ def ascii_art_to_game(art,
         'any character specified in what_lies_beneath must not be one of the '
         'characters used as keys in the sprites or drapes arguments.')
 
-  ### 3. Convert all ASCII art to numpy arrays ###
-
-  # Now convert the ASCII art array to a numpy array of uint8s.
-  art = ascii_art_to_uint8_nparray(art)
+  ### 3. Convert the ASCII art for what_lies_beneath to numpy ###
 
-  # In preparation for masking out sprites and drapes from the ASCII art array
-  # (to make the background), do similar for what_lies_beneath.
-  if isinstance(what_lies_beneath, str):
-    what_lies_beneath = np.full_like(art, ord(what_lies_beneath))
-  else:
+  # If what_lies_beneath is a diagram and not a single character, it's only
+  # worth converting it to a numpy array once.
+  if not isinstance(what_lies_beneath, str):
     what_lies_beneath = ascii_art_to_uint8_nparray(what_lies_beneath)
-    if art.shape != what_lies_beneath.shape:
-      raise ValueError(
-          'if not a single ASCII character, what_lies_beneath must be ASCII '
-          'art whose shape is the same as that of the ASCII art in art.')
 
   ### 4. Other miscellaneous preparation ###
 
@@ -238,58 +289,135 @@ def ascii_art_to_game(art,
     group_id = '{:05d}'.format(i)
     update_group_for.update({character: group_id for character in update_group})
 
-  ### 5. Construct engine; populate with Sprites and Drapes ###
-
-  game = engine.Engine(*art.shape, occlusion_in_layers=occlusion_in_layers)
-
-  # Sprites and Drapes are added according to the depth-first traversal of the
-  # update schedule.
-  for character in flat_update_schedule:
-    # Switch to this character's update group.
-    game.update_group(update_group_for[character])
-    # Find locations where this character appears in the ASCII art.
-    mask = art == ord(character)
-
-    if character in drapes:
-      # Add the drape to the Engine.
-      partial = drapes[character]
-      game.add_prefilled_drape(character, mask,
-                               partial.pycolab_thing,
-                               *partial.args, **partial.kwargs)
-
-    if character in sprites:
-      # Get the location of the sprite in the ASCII art, if there was one.
-      row, col = np.where(mask)
-      if len(row) > 1:
-        raise ValueError('sprite character {} can appear in at most one place '
-                         'in art.'.format(character))
-      # If there was a location, convert it to integer values; otherwise, 0,0.
-      # gpylint doesn't know how implicit bools work with numpy arrays...
-      row, col = (int(row), int(col)) if len(row) > 0 else (0, 0)  # pylint: disable=g-explicit-length-test
-
-      # Add the sprite to the Engine.
-      partial = sprites[character]
-      game.add_sprite(character, (row, col),
-                      partial.pycolab_thing,
-                      *partial.args, **partial.kwargs)
-
-    # Clear out the newly-added Sprite or Drape from the ASCII art.
-    art[mask] = what_lies_beneath[mask]
-
-  ### 6. Impose specified Z-order ###
-
-  game.set_z_order(z_order)
-
-  ### 7. Add the Backdrop to the engine ###
-
-  game.set_prefilled_backdrop(
-      characters=''.join(chr(c) for c in np.unique(art)),
-      prefill=art.view(np.uint8),
-      backdrop_class=backdrop.pycolab_thing,
-      *backdrop.args, **backdrop.kwargs)
-
-  # That's all, folks!
-  return game
+  return GameTemplate(
+      what_lies_beneath=what_lies_beneath,
+      sprites=sprites, drapes=drapes, backdrop=backdrop,
+      flat_update_schedule=flat_update_schedule,
+      update_group_for=update_group_for,
+      z_order=z_order,
+      occlusion_in_layers=occlusion_in_layers,
+      instance_maps=instance_maps,
+      tile_size=tile_size)
+
+
+class GameTemplate(object):
+  """A checked, ready-to-use description of a pycolab game minus its art.
+
+  Make these with `compile_game_spec`, then use `instantiate` to build game
+  engines from ASCII art diagrams.
+  """
+
+  def __init__(self, what_lies_beneath, sprites, drapes, backdrop,
+               flat_update_schedule, update_group_for, z_order,
+               occlusion_in_layers, instance_maps, tile_size):
+    """Construct a `GameTemplate`. Use `compile_game_spec` instead."""
+    self._what_lies_beneath = (ord(what_lies_beneath)
+                               if isinstance(what_lies_beneath, str)
+                               else what_lies_beneath)
+    self._backdrop = backdrop
+    self._z_order = list(z_order)
+    self._occlusion_in_layers = occlusion_in_layers
+    self._instance_maps = instance_maps
+    self._tile_size = tile_size
+
+    # Everything needed to add each Sprite and Drape to a new game, in the
+    # order that they are added: the depth-first traversal of the update
+    # schedule.
+    self._entities = [
+        (character, ord(character), update_group_for[character],
+         sprites.get(character), drapes.get(character))
+        for character in flat_update_schedule]
+
+  def instantiate(self, art):
+    """Construct a pycolab game from an ASCII art diagram.
+
+    Args:
+      art: An ASCII art diagram depicting a game board, as described for
+          `ascii_art_to_game`, or a 2-D `np.uint8` array of ASCII values like
+          those made by `ascii_art_to_uint8_nparray` (which is not modified).
+
+    Returns:
+      An initialised `Engine` object, as `ascii_art_to_game` would make.
+
+    Raises:
+      ValueError: `art` is not a valid ASCII art diagram, its shape doesn't
+          match the shape of the `what_lies_beneath` diagram given to
+          `compile_game_spec`, or a sprite character appears more than once.
+      TypeError: `art` was neither a list of strings nor a numpy array.
+    """
+    ### 1. Convert the ASCII art to a numpy array ###
+
+    # We'll be erasing Sprites and Drapes from the art as we go, so numpy
+    # arrays must be copied.
+    if isinstance(art, np.ndarray):
+      art = np.array(art, dtype=np.uint8)
+      if art.ndim != 2:
+        raise ValueError('numpy arrays passed to GameTemplate.instantiate must '
+                         'be 2-D.')
+    else:
+      art = ascii_art_to_uint8_nparray(art)
+
+    what_lies_beneath = self._what_lies_beneath
+    if (isinstance(what_lies_beneath, np.ndarray) and
+        art.shape != what_lies_beneath.shape):
+      raise ValueError(
+          'if not a single ASCII character, what_lies_beneath must be ASCII '
+          'art whose shape is the same as that of the ASCII art in art.')
+
+    ### 2. Construct engine; populate with Sprites and Drapes ###
+
+    game = engine.Engine(*art.shape,
+                         occlusion_in_layers=self._occlusion_in_layers,
+                         instance_maps=self._instance_maps,
+                         tile_size=self._tile_size)
+
+    for character, ascii_value, group_id, sprite, drape in self._entities:
+      # Switch to this character's update group.
+      game.update_group(group_id)
+      # Find locations where this character appears in the ASCII art.
+      mask = art == ascii_value
+
+      if drape is not None:
+        # Add the drape to the Engine.
+        game.add_prefilled_drape(character, mask,
+                                 drape.pycolab_thing,
+                                 *drape.args, **drape.kwargs)
+
+      if sprite is not None:
+        # Get the location of the sprite in the ASCII art, if there was one.
+        row, col = np.where(mask)
+        if len(row) > 1:
+          raise ValueError('sprite character {} can appear in at most one '
+                           'place in art.'.format(character))
+        # If there was a location, convert it to integer values; otherwise, 0,0.
+        # gpylint doesn't know how implicit bools work with numpy arrays...
+        row, col = (int(row[0]), int(col[0])) if len(row) > 0 else (0, 0)  # pylint: disable=g-explicit-length-test
+
+        # Add the sprite to the Engine.
+        game.add_sprite(character, (row, col),
+                        sprite.pycolab_thing,
+                        *sprite.args, **sprite.kwargs)
+
+      # Clear out the newly-added Sprite or Drape from the ASCII art.
+      art[mask] = (what_lies_beneath if isinstance(what_lies_beneath, int)
+                   else what_lies_beneath[mask])
+
+    ### 3. Impose specified Z-order ###
+
+    game.set_z_order(self._z_order)
+
+    ### 4. Add the Backdrop to the engine ###
+
+    # Counting beats sorting (np.unique) for finding the characters left over.
+    characters = np.flatnonzero(np.bincount(art.ravel(), minlength=128))
+    game.set_prefilled_backdrop(
+        characters=''.join(chr(c) for c in characters),
+        prefill=art.view(np.uint8),
+        backdrop_class=self._backdrop.pycolab_thing,
+        *self._backdrop.args, **self._backdrop.kwargs)
+
+    # That's all, folks!
+    return game
 
 
 def ascii_art_to_uint8_nparray(art):
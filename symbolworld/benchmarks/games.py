@@ -0,0 +1,198 @@
+# Copyright 2017 the pycolab Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The games that the pycolab benchmarks play.
+
+Each benchmark is a `Benchmark`: a name, a function that builds a fresh episode
+of a game, and the actions that a random policy chooses between. Quit actions
+are left out, so that episodes only end when the game says so.
+
+All games are imported lazily, when a benchmark first builds an episode, so
+that one game's missing dependencies don't keep the others from running.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import importlib
+import os
+
+import numpy as np
+
+
+class Benchmark(
+    collections.namedtuple('Benchmark', ['name', 'make_episode', 'actions'])):
+  """A game to benchmark.
+
+  There are three members:
+
+  * `name`: the benchmark's name.
+  * `make_episode`: a callable taking a `np.random.RandomState` and returning
+    a new, not-yet-started `Episode` of the game. Games with random levels use
+    the `RandomState` to pick one.
+  * `actions`: a list of the actions that a random policy may take.
+  """
+  __slots__ = ()
+
+
+class Episode(object):
+  """Uniform interface to one episode of a game, whatever its type."""
+
+  def start(self):
+    """Start the episode; returns True iff the game is already over."""
+    raise NotImplementedError()
+
+  def step(self, action):
+    """Take `action`; returns True iff the game is now over."""
+    raise NotImplementedError()
+
+
+class EngineEpisode(Episode):
+  """An `Episode` of a game played directly on a pycolab `Engine`."""
+
+  def __init__(self, engine):
+    self._engine = engine
+
+  def start(self):
+    self._engine.its_showtime()
+    return self._engine.game_over
+
+  def step(self, action):
+    self._engine.play(action)
+    return self._engine.game_over
+
+
+class GymEpisode(Episode):
+  """An `Episode` of a game played through a gym environment."""
+
+  def __init__(self, env):
+    self._env = env
+
+  def start(self):
+    self._env.reset()
+    return False
+
+  def step(self, action):
+    _, _, done, _ = self._env.step(action)
+    return done
+
+
+def _example(module_name, *args):
+  """A `make_episode` for `pycolab.examples.<module_name>.make_game(*args)`."""
+  def make_episode(rng):
+    del rng  # Unused.
+    module = importlib.import_module('pycolab.examples.' + module_name)
+    return EngineEpisode(module.make_game(*args))
+  return make_episode
+
+
+def _lp_rnn_example(module_name, *args):
+  """Like `_example`, but for games in `examples/research/lp-rnn`.
+
+  The hyphen in the directory name means that these games are not in an
+  importable package, so we load them from their files.
+  """
+  def make_episode(rng):
+    del rng  # Unused.
+    module = _load_lp_rnn_module(module_name)
+    return EngineEpisode(module.make_game(*args))
+  return make_episode
+
+
+def _load_lp_rnn_module(module_name):
+  """Load `examples/research/lp-rnn/<module_name>.py` as a module, once."""
+  if module_name not in _lp_rnn_modules:
+    import importlib.util  # pylint: disable=g-import-not-at-top
+    path = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                        'examples', 'research', 'lp-rnn', module_name + '.py')
+    spec = importlib.util.spec_from_file_location(
+        'pycolab_lp_rnn_' + module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    _lp_rnn_modules[module_name] = module
+  return _lp_rnn_modules[module_name]
+
+_lp_rnn_modules = {}
+
+
+def _symbolic_gridworld(rng):
+  """A `make_episode` for the symbolic gridworld, with a seeded level."""
+  _headless_qt()
+  from pycolab import level_generator  # pylint: disable=g-import-not-at-top
+  from pycolab.envs import symbolic_gridworld  # pylint: disable=g-import-not-at-top
+  seed = rng.randint(2**31)
+  level = level_generator.generate_level(seed)
+  return EngineEpisode(symbolic_gridworld.make_game(
+      level, rng=np.random.RandomState(seed)))
+
+
+def _simple_symbol_world_env(rng):
+  """A `make_episode` for `SimpleSymbolWorldEnv`.
+
+  The environment draws its own levels in `reset`, so unlike the other
+  benchmarks, this one does not play the same levels every time.
+  """
+  del rng  # Unused.
+  if _envs.get('SimpleSymbolWorldEnv') is None:
+    _headless_qt()
+    from pycolab.envs import symbolic_gridworld  # pylint: disable=g-import-not-at-top
+    _envs['SimpleSymbolWorldEnv'] = symbolic_gridworld.SimpleSymbolWorldEnv()
+  return GymEpisode(_envs['SimpleSymbolWorldEnv'])
+
+# Building a SimpleSymbolWorldEnv builds a Qt UI too, so we only do it once.
+_envs = {}
+
+
+def _headless_qt():
+  """Keep Qt from looking for a display, unless the user says otherwise."""
+  os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+
+# All of the benchmarks, in the order that they run, except for the ones in
+# `SKIPPED`.
+BENCHMARKS = collections.OrderedDict((b.name, b) for b in [
+    Benchmark('hello_world', _example('hello_world'), [0, 1, 2, 3, 5]),
+    Benchmark('scrolly_maze', _example('scrolly_maze', 0), [0, 1, 2, 3, 4]),
+    Benchmark('better_scrolly_maze', _example('better_scrolly_maze', 0),
+              [0, 1, 2, 3, 4]),
+    Benchmark('warehouse_manager', _example('warehouse_manager', 0),
+              [0, 1, 2, 3, 4]),
+    Benchmark('extraterrestrial_marauders',
+              _example('extraterrestrial_marauders'), [0, 1, 2, 3]),
+    Benchmark('chain_walk', _example('classics.chain_walk'), [0, 1, 2]),
+    Benchmark('cliff_walk', _example('classics.cliff_walk'), [0, 1, 2, 3, 4]),
+    Benchmark('four_rooms', _example('classics.four_rooms'), [0, 1, 2, 3, 4]),
+    # The lp-rnn games, configured as in their papers (i.e. their defaults).
+    Benchmark('cued_catch',
+              _lp_rnn_example('cued_catch', 10, 10, 100, False, 0.0, 40),
+              [1, 2, 3]),
+    Benchmark('sequence_recall', _lp_rnn_example('sequence_recall'),
+              [1, 2, 3, 4, 5]),
+    Benchmark('t_maze', _lp_rnn_example('t_maze', 4, False, 1000, 50, 280),
+              [1, 2, 3, 4, 5]),
+    Benchmark('symbolic_gridworld', _symbolic_gridworld, [0, 1, 2, 3]),
+    Benchmark('SimpleSymbolWorldEnv', _simple_symbol_world_env, [0, 1, 2, 3]),
+])
+
+# Benchmarks left out of the suite unless they're asked for by name, and why.
+# The example games' Sprites and Drapes predate the `img` and `drape_list`
+# members that the renderer paints from, so they fail on their first frame.
+_PREDATES_RENDERER = ('its Sprites and Drapes have no img or drape_list to '
+                      'render, so it fails with AttributeError')
+SKIPPED = collections.OrderedDict((name, _PREDATES_RENDERER) for name in [
+    'hello_world', 'scrolly_maze', 'better_scrolly_maze', 'warehouse_manager',
+    'extraterrestrial_marauders', 'chain_walk', 'cliff_walk', 'four_rooms',
+    'cued_catch', 'sequence_recall', 't_maze'])
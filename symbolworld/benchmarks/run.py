@@ -0,0 +1,318 @@
+# Copyright 2017 the pycolab Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Run the pycolab benchmarks, or compare the results of two runs.
+
+To benchmark every game in `games.BENCHMARKS` and save the results:
+
+    python -m pycolab.benchmarks.run --output before.json
+
+Each benchmark plays its game headlessly with a seeded random policy and
+reports steps per second, median and 99th-percentile step latency, reset
+latency (building a new game and starting it), and the peak memory allocated
+by Python during a shorter second run. (Memory is measured separately because
+tracing allocations slows everything down.) Benchmarks that crash report the
+error instead. Benchmarks in `games.SKIPPED` report why they were skipped, and
+only run if `--benchmarks` names them.
+
+To check a new set of results against an old one:
+
+    python -m pycolab.benchmarks.run --compare before.json after.json
+
+This lists every metric that got worse by more than `--tolerance` (10% by
+default), and exits with status 1 if there were any.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import collections
+import json
+import platform
+import sys
+import timeit
+
+import numpy as np
+import six
+
+from pycolab.benchmarks import games
+
+
+# The metrics that `compare` checks, and whether bigger values are better.
+METRICS = collections.OrderedDict([
+    ('steps_per_sec', True),
+    ('step_p50_ms', False),
+    ('step_p99_ms', False),
+    ('reset_mean_ms', False),
+    ('peak_memory_bytes', False),
+])
+
+
+class Regression(
+    collections.namedtuple('Regression',
+                           ['benchmark', 'metric', 'baseline', 'candidate',
+                            'change'])):
+  """A metric that got worse. `change` is the relative worsening, e.g. 0.25."""
+  __slots__ = ()
+
+
+def run_benchmark(benchmark, steps=1000, seed=0, memory_steps=100,
+                  timer=timeit.default_timer):
+  """Play a `games.Benchmark` with a random policy and measure performance.
+
+  Args:
+    benchmark: the `games.Benchmark` to run.
+    steps: number of game steps to time. New episodes start whenever the
+        previous one ends.
+    seed: seed for the random policy and for any random level choices.
+    memory_steps: number of game steps in the separate run that measures peak
+        memory; 0 to skip it.
+    timer: a callable returning the current time in seconds.
+
+  Returns:
+    a dict of results, with keys `steps`, `episodes`, `steps_per_sec`,
+    `step_p50_ms`, `step_p99_ms`, `reset_mean_ms`, `reset_p50_ms`, and
+    `peak_memory_bytes` (None if memory was not measured).
+
+  Raises:
+    RuntimeError: an episode of the game was over before it began.
+  """
+  step_times, reset_times = _play(benchmark, steps, seed, timer)
+  step_ms = 1e3 * step_times
+  reset_ms = 1e3 * reset_times
+  return collections.OrderedDict([
+      ('steps', steps),
+      ('episodes', len(reset_times)),
+      ('steps_per_sec', steps / step_times.sum() if steps else 0.0),
+      ('step_p50_ms', float(np.percentile(step_ms, 50)) if steps else 0.0),
+      ('step_p99_ms', float(np.percentile(step_ms, 99)) if steps else 0.0),
+      ('reset_mean_ms', float(reset_ms.mean()) if reset_times.size else 0.0),
+      ('reset_p50_ms', (float(np.percentile(reset_ms, 50))
+                        if reset_times.size else 0.0)),
+      ('peak_memory_bytes', (_peak_memory(benchmark, memory_steps, seed)
+                             if memory_steps else None)),
+  ])
+
+
+def run_suite(names=None, steps=1000, seed=0, memory_steps=100, log=None):
+  """Run several benchmarks, collecting their results in a JSON-ready dict.
+
+  Args:
+    names: names of benchmarks in `games.BENCHMARKS` to run; by default, all
+        but the ones in `games.SKIPPED`, which are reported as skipped.
+    steps: see `run_benchmark`.
+    seed: see `run_benchmark`.
+    memory_steps: see `run_benchmark`.
+    log: a file to write progress messages to, or None for silence.
+
+  Returns:
+    a dict with two keys: `meta`, describing the run and the machine, and
+    `results`, mapping each benchmark name to its `run_benchmark` results or,
+    if the benchmark raised an exception, to a dict holding an `error` string,
+    or if it was skipped, to a dict holding the `skipped` reason.
+
+  Raises:
+    KeyError: a name in `names` is not a known benchmark.
+  """
+  skipped = games.SKIPPED if names is None else {}
+  if names is None: names = list(games.BENCHMARKS)
+  benchmarks = [games.BENCHMARKS[name] for name in names]
+
+  results = collections.OrderedDict()
+  for benchmark in benchmarks:
+    if benchmark.name in skipped:
+      results[benchmark.name] = {'skipped': skipped[benchmark.name]}
+      if log: print('Skipping {}: {}.'.format(
+          benchmark.name, skipped[benchmark.name]), file=log)
+      continue
+    if log: print('Running {}...'.format(benchmark.name), file=log)
+    try:
+      results[benchmark.name] = run_benchmark(
+          benchmark, steps=steps, seed=seed, memory_steps=memory_steps)
+    except Exception as error:  # pylint: disable=broad-except
+      results[benchmark.name] = {
+          'error': '{}: {}'.format(type(error).__name__, error)}
+    if log: print('  {}'.format(dict(results[benchmark.name])), file=log)
+
+  meta = collections.OrderedDict([
+      ('steps', steps),
+      ('seed', seed),
+      ('memory_steps', memory_steps),
+      ('python', platform.python_version()),
+      ('numpy', np.__version__),
+      ('platform', platform.platform()),
+  ])
+  return collections.OrderedDict([('meta', meta), ('results', results)])
+
+
+def compare(baseline, candidate, tolerance=0.1):
+  """Find metrics that got worse between two sets of `run_suite` results.
+
+  Only benchmarks that appear in both sets are compared. A benchmark that
+  worked in `baseline` but failed or was skipped in `candidate` is reported as
+  a regression of the metric `error` or `skipped`, with None for the
+  `baseline` and `change` values.
+
+  Args:
+    baseline: results from `run_suite`, e.g. from before a change.
+    candidate: results from `run_suite`, e.g. from after a change.
+    tolerance: how much worse, as a fraction of the baseline value, a metric
+        may get without counting as a regression.
+
+  Returns:
+    a list of `Regression`s, ordered by benchmark and metric.
+  """
+  regressions = []
+  baseline_results = baseline['results']
+  for name, candidate_result in six.iteritems(candidate['results']):
+    baseline_result = baseline_results.get(name)
+    if (baseline_result is None or 'error' in baseline_result or
+        'skipped' in baseline_result): continue
+    failure = next((key for key in ('error', 'skipped')
+                    if key in candidate_result), None)
+    if failure is not None:
+      regressions.append(Regression(name, failure, None,
+                                    candidate_result[failure], None))
+      continue
+
+    for metric, bigger_is_better in six.iteritems(METRICS):
+      old = baseline_result.get(metric)
+      new = candidate_result.get(metric)
+      if not old or new is None: continue  # Also skips zero baselines.
+      change = (old - new) / old if bigger_is_better else (new - old) / old
+      if change > tolerance:
+        regressions.append(Regression(name, metric, old, new, change))
+  return regressions
+
+
+### Private helpers ###
+
+
+def _play(benchmark, steps, seed, timer):
+  """Time `steps` random steps of `benchmark`, resetting when episodes end.
+
+  Returns:
+    a 2-tuple of float arrays: the time of each step, and the time of each
+    reset (building and starting a new episode), in seconds.
+  """
+  rng = np.random.RandomState(seed)
+  actions = benchmark.actions
+  step_times = np.zeros(steps)
+  reset_times = []
+
+  game_over = True
+  for step in six.moves.range(steps):
+    if game_over:
+      start = timer()
+      episode = benchmark.make_episode(rng)
+      game_over = episode.start()
+      reset_times.append(timer() - start)
+      if game_over:
+        raise RuntimeError('An episode of benchmark {} was over before it '
+                           'began.'.format(benchmark.name))
+
+    action = actions[rng.randint(len(actions))]
+    start = timer()
+    game_over = episode.step(action)
+    step_times[step] = timer() - start
+
+  return step_times, np.array(reset_times)
+
+
+def _peak_memory(benchmark, steps, seed):
+  """Peak bytes allocated by Python while playing `steps` steps, or None.
+
+  Returns None on Pythons without `tracemalloc`.
+  """
+  try:
+    import tracemalloc  # pylint: disable=g-import-not-at-top
+  except ImportError:
+    return None
+  already_tracing = tracemalloc.is_tracing()
+  if not already_tracing: tracemalloc.start()
+  try:
+    tracemalloc.clear_traces()
+    _play(benchmark, steps, seed, timeit.default_timer)
+    _, peak = tracemalloc.get_traced_memory()
+  finally:
+    if not already_tracing: tracemalloc.stop()
+  return peak
+
+
+def _format_regressions(regressions, tolerance):
+  """Helper: a human-readable report of the output of `compare`."""
+  if not regressions:
+    return 'No regressions worse than {:.0%}.'.format(tolerance)
+  lines = ['{} regression(s) worse than {:.0%}:'.format(len(regressions),
+                                                         tolerance)]
+  for regression in regressions:
+    if regression.metric == 'error':
+      lines.append('  {}: now fails with {}'.format(regression.benchmark,
+                                                     regression.candidate))
+    elif regression.metric == 'skipped':
+      lines.append('  {}: now skipped: {}'.format(regression.benchmark,
+                                                   regression.candidate))
+    else:
+      lines.append('  {}: {} {:.4g} -> {:.4g} ({:.1%} worse)'.format(
+          regression.benchmark, regression.metric, regression.baseline,
+          regression.candidate, regression.change))
+  return '\n'.join(lines)
+
+
+def main(argv=None):
+  if argv is None: argv = sys.argv
+  parser = argparse.ArgumentParser(
+      prog='python -m pycolab.benchmarks.run',
+      description='Benchmark pycolab games, or compare benchmark results.')
+  parser.add_argument(
+      '--benchmarks', metavar='NAMES', default=None,
+      help='Comma-separated benchmarks to run (default: all of {}).'.format(
+          ', '.join(name for name in games.BENCHMARKS
+                    if name not in games.SKIPPED)))
+  parser.add_argument('--steps', metavar='N', type=int, default=1000,
+                      help='Game steps to time for each benchmark.')
+  parser.add_argument('--memory_steps', metavar='N', type=int, default=100,
+                      help='Game steps for measuring peak memory; 0 to skip.')
+  parser.add_argument('--seed', metavar='S', type=int, default=0,
+                      help='Seed for random policies and levels.')
+  parser.add_argument('--output', metavar='FILE', default=None,
+                      help='Write JSON results here instead of to stdout.')
+  parser.add_argument('--compare', metavar=('BASELINE', 'CANDIDATE'), nargs=2,
+                      default=None,
+                      help='Compare two results files instead of running.')
+  parser.add_argument('--tolerance', metavar='T', type=float, default=0.1,
+                      help='Relative worsening allowed by --compare.')
+  flags = parser.parse_args(argv[1:])
+
+  if flags.compare:
+    with open(flags.compare[0]) as f: baseline = json.load(f)
+    with open(flags.compare[1]) as f: candidate = json.load(f)
+    regressions = compare(baseline, candidate, flags.tolerance)
+    print(_format_regressions(regressions, flags.tolerance))
+    return 1 if regressions else 0
+
+  names = flags.benchmarks.split(',') if flags.benchmarks else None
+  results = run_suite(names, steps=flags.steps, seed=flags.seed,
+                      memory_steps=flags.memory_steps, log=sys.stderr)
+  if flags.output:
+    with open(flags.output, 'w') as f: json.dump(results, f, indent=2)
+  else:
+    print(json.dumps(results, indent=2))
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main(sys.argv))
@@ -0,0 +1,115 @@
+# Copyright 2017 the pycolab Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""How the symbolic gridworld's speed scales with the size of its board.
+
+    python -m pycolab.benchmarks.scaling --output scaling.json
+
+plays the symbolic gridworld on square boards of several sizes (50 to 2000
+cells per side by default), each with the usual handful of objects, both with
+the default renderer (`dense`) and with dirty-tile rendering (`tiles`; see
+`Engine`). Results have the same format as those of `run.py`, with benchmarks
+named like `gridworld/2000/tiles`, so `run.py --compare` can compare them.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import collections
+import json
+import sys
+
+import numpy as np
+
+from pycolab.benchmarks import games
+from pycolab.benchmarks import run
+
+
+DEFAULT_SIZES = (50, 100, 250, 500, 1000, 2000)
+
+# Renderer configurations to try: names and `tile_size` arguments.
+RENDERERS = collections.OrderedDict([('dense', None), ('tiles', 32)])
+
+
+def scaling_benchmark(size, renderer):
+  """A `games.Benchmark` of the symbolic gridworld on a `size`-square board.
+
+  Args:
+    size: number of cells on each side of the board.
+    renderer: a key of `RENDERERS`.
+
+  Returns:
+    the `games.Benchmark`.
+  """
+  tile_size = RENDERERS[renderer]
+
+  def make_episode(rng):
+    games._headless_qt()  # pylint: disable=protected-access
+    from pycolab import level_generator  # pylint: disable=g-import-not-at-top
+    from pycolab.envs import symbolic_gridworld  # pylint: disable=g-import-not-at-top
+    seed = rng.randint(2**31)
+    level = level_generator.generate_level(seed, grid_size=size)
+    return games.EngineEpisode(symbolic_gridworld.make_game(
+        level, tile_size=tile_size, rng=np.random.RandomState(seed)))
+  return games.Benchmark('gridworld/{}/{}'.format(size, renderer),
+                         make_episode, [0, 1, 2, 3])
+
+
+def main(argv=None):
+  if argv is None: argv = sys.argv
+  parser = argparse.ArgumentParser(
+      prog='python -m pycolab.benchmarks.scaling',
+      description='Benchmark the symbolic gridworld at several board sizes.')
+  parser.add_argument(
+      '--sizes', metavar='SIZES',
+      default=','.join(str(size) for size in DEFAULT_SIZES),
+      help='Comma-separated board sizes (cells per side).')
+  parser.add_argument(
+      '--renderers', metavar='NAMES', default=','.join(RENDERERS),
+      help='Comma-separated renderers to try, from: {}.'.format(
+          ', '.join(RENDERERS)))
+  parser.add_argument('--steps', metavar='N', type=int, default=200,
+                      help='Game steps to time for each benchmark.')
+  parser.add_argument('--seed', metavar='S', type=int, default=0,
+                      help='Seed for random policies and levels.')
+  parser.add_argument('--output', metavar='FILE', default=None,
+                      help='Write JSON results here instead of to stdout.')
+  flags = parser.parse_args(argv[1:])
+
+  # Memory isn't measured: tracing allocations on huge boards is very slow.
+  results = collections.OrderedDict()
+  for size in [int(size) for size in flags.sizes.split(',')]:
+    for renderer in flags.renderers.split(','):
+      benchmark = scaling_benchmark(size, renderer)
+      print('Running {}...'.format(benchmark.name), file=sys.stderr)
+      results[benchmark.name] = run.run_benchmark(
+          benchmark, steps=flags.steps, seed=flags.seed, memory_steps=0)
+      print('  {:.3f} ms/step'.format(results[benchmark.name]['step_p50_ms']),
+            file=sys.stderr)
+
+  output = collections.OrderedDict([
+      ('meta', collections.OrderedDict([('steps', flags.steps),
+                                        ('seed', flags.seed)])),
+      ('results', results)])
+  if flags.output:
+    with open(flags.output, 'w') as f: json.dump(output, f, indent=2)
+  else:
+    print(json.dumps(output, indent=2))
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main(sys.argv))
@@ -23,6 +23,7 @@ import copy
 import numpy as np
 
 from pycolab import rendering
+from pycolab import things
 
 import six
 
@@ -112,8 +113,12 @@ class ObservationCropper(object):
     self._valid_pad_chars = set(
         [] if self._engine is None else
         list(self._engine.things) + list(self._engine.backdrop.palette))
-    # Pre-allocated observation, for speed.
+    # Pre-allocated observation, for speed, used when cropping windows extend
+    # beyond the observation. We also remember the padding character and the
+    # region copied from the observation in the last crop into this buffer.
     self._cropped = None
+    self._cropped_pad_char = None
+    self._cropped_to_slice = None
 
   def _do_crop(self, observation,
                top_row, left_col, bottom_row_exclusive, right_col_exclusive,
@@ -128,10 +133,18 @@ class ObservationCropper(object):
     `pad_char` must be one of the characters associated with the game's
     `Sprite`s, `Drape`s, or `Backdrop`.
 
-    For speed, the cropped observation is computed by manipulating the
-    instance variable `self._cropped`; thus, this method is not thread-safe.
-    One workaround for applications that need thread safety would be to call
-    `_do_crop` under a lock, then copy its result before releasing the lock.
+    Observations may have 2-D character `board`s or 3-D RGB `board`s; either
+    way, the `symbolic_board` and `layers` are cropped alongside the `board`.
+    In the padded part of an RGB `board`, all channels are 0, which is the
+    colour of the board where no entity has been painted.
+
+    If the cropping window lies entirely inside the observation, the members of
+    the returned observation are numpy views of those of `observation`, and no
+    data is copied at all. Otherwise, the cropped observation is copied into
+    the instance variable `self._cropped`, which is pre-filled with padding;
+    thus, this method is not thread-safe. One workaround for applications that
+    need thread safety would be to call `_do_crop` under a lock, then copy its
+    result before releasing the lock.
 
     Args:
       observation: `Observation` to crop.
@@ -146,7 +159,8 @@ class ObservationCropper(object):
 
     Returns:
       an observation cropped as described. You must copy this observation if
-      you need it to last longer than the next call to `_do_crop`.
+      you need it to last longer than the next call to `_do_crop`, or longer
+      than `observation` itself.
 
     Raises:
       ValueError: `pad_char` is not a character used by `Sprite`s, `Drape`s, or
@@ -156,41 +170,50 @@ class ObservationCropper(object):
     """
     crop_rows = bottom_row_exclusive - top_row
     crop_cols = right_col_exclusive - left_col
-    obs_rows, obs_cols = observation.board.shape
+    obs_rows, obs_cols = observation.symbolic_board.shape
+
+    if pad_char is not None and pad_char not in self._valid_pad_chars:
+      raise ValueError(
+          'An `ObservationCropper` tried to fill empty space with a character '
+          'that isn\'t used by the current game engine.')
+
+    ### 1. If the window is inside the observation, just make views. ###
+
+    if (top_row >= 0 and left_col >= 0 and
+        bottom_row_exclusive <= obs_rows and right_col_exclusive <= obs_cols):
+      window = np.s_[top_row:bottom_row_exclusive, left_col:right_col_exclusive]
+      return rendering.Observation(
+          board=observation.board[window],
+          symbolic_board=observation.symbolic_board[window],
+          layers={char: layer[window]
+                  for char, layer in six.iteritems(observation.layers)})
+
+    if pad_char is None:
+      raise RuntimeError(
+          'An ObservationCropper attempted to crop a region that extends '
+          'beyond the observation without specifying a character to fill the '
+          'void that exists out there.')
 
-    ### 1. Prepare the observation that recevies the crop. ###
+    ### 2. Prepare the observation that receives the crop. ###
 
     # See whether we need to allocate a new cropped observation. This is a
     # superficial check; it doesn't detect rare cases where the types of
     # characters in an observation have changed. We have a backup plan for that,
     # though; look for the KeyError exception handler below.
+    board_shape = (crop_rows, crop_cols) + observation.board.shape[2:]
     if (self._cropped is None or
-        self._cropped.board.shape != (crop_rows, crop_cols) or
+        self._cropped.board.shape != board_shape or
+        self._cropped.board.dtype != observation.board.dtype or
         len(self._cropped.layers) != len(observation.layers)):
       self._cropped = rendering.Observation(
-          board=np.zeros((crop_rows, crop_cols), dtype=observation.board.dtype),
+          board=np.zeros(board_shape, dtype=observation.board.dtype),
+          symbolic_board=np.zeros((crop_rows, crop_cols),
+                                  dtype=observation.symbolic_board.dtype),
           layers={c: np.zeros((crop_rows, crop_cols), dtype=bool)
                   for c in observation.layers})
+      self._cropped_pad_char = None
 
-    if self._pad_char is None:
-      # If there is no padding, verify that the cropping window does not extend
-      # outside of the observation.
-      if (top_row < 0 or left_col < 0 or
-          bottom_row_exclusive > obs_rows or right_col_exclusive > obs_cols):
-        raise RuntimeError(
-            'An ObservationCropper attempted to crop a region that extends '
-            'beyond the observation without specifying a character to fill the '
-            'void that exists out there.')
-    else:
-      # Otherwise, pre-fill the observation with the padding character.
-      if self._pad_char not in self._valid_pad_chars: raise ValueError(
-          'An `ObservationCropper` tried to fill empty space with a character '
-          'that isn\'t used by the current game engine.')
-      self._cropped.board.fill(ord(self._pad_char))
-      for char, layer in six.iteritems(self._cropped.layers):
-        layer.fill(self._pad_char == char)
-
-    ### 2. Compute the slices of data that we will copy. ###
+    ### 3. Compute the slices of data that we will copy. ###
 
     # Figure out the portion of the observation covered by the cropping window.
     from_tr = max(0, top_row)
@@ -206,9 +229,29 @@ class ObservationCropper(object):
     to_rce = min(crop_cols, max(0, obs_cols - left_col))
     to_slice = np.s_[to_tr:to_bre, to_lc:to_rce]
 
-    ### 3. Attempt to copy the data into the cropped observation. ###
+    ### 4. Pad the part of the cropped observation outside of the copy. ###
+
+    # Only the strips around the copied region need padding, and the padding
+    # from the last crop is still in place outside of the region copied then.
+    # To keep things simple, we re-pad the whole buffer only if the pad
+    # character or the copied region has changed since the last crop.
+    if (self._cropped_pad_char, self._cropped_to_slice) != (pad_char, to_slice):
+      if self._cropped_pad_char != pad_char:
+        self._cropped.symbolic_board.fill(ord(pad_char))
+        for char, layer in six.iteritems(self._cropped.layers):
+          layer.fill(pad_char == char)
+        self._cropped.board.fill(_board_pad_value(self._cropped.board,
+                                                  pad_char))
+      else:
+        self._pad_outside(to_slice, pad_char)
+      self._cropped_pad_char = pad_char
+      self._cropped_to_slice = to_slice
+
+    ### 5. Attempt to copy the data into the cropped observation. ###
 
     self._cropped.board[to_slice] = observation.board[from_slice]
+    self._cropped.symbolic_board[to_slice] = (
+        observation.symbolic_board[from_slice])
     # It's here in the copy where we might discover that we need to allocate a
     # new cropped observation after all---it happens when a layer we'd like to
     # copy turns out not to exist in the observation. We abandon the
@@ -226,6 +269,19 @@ class ObservationCropper(object):
 
     return self._cropped
 
+  def _pad_outside(self, to_slice, pad_char):
+    """Pad the four strips of `self._cropped` around `to_slice`."""
+    row_slice, col_slice = to_slice
+    strips = [np.s_[:row_slice.start, :], np.s_[row_slice.stop:, :],
+              np.s_[row_slice, :col_slice.start],
+              np.s_[row_slice, col_slice.stop:]]
+    board_pad = _board_pad_value(self._cropped.board, pad_char)
+    for strip in strips:
+      self._cropped.symbolic_board[strip] = ord(pad_char)
+      self._cropped.board[strip] = board_pad
+      for char, layer in six.iteritems(self._cropped.layers):
+        layer[strip] = pad_char == char
+
 
 class FixedCropper(ObservationCropper):
   """A cropper that cuts a fixed subwindow from an `Observation`."""
@@ -364,6 +420,8 @@ class ScrollingCropper(ObservationCropper):
     # The location of the top-left corner of the scrolling window is
     # uninitialised at first.
     self._corner = None
+    # The instances of `LargeDrape`s we're tracking, keyed by character.
+    self._tracked_instances = {}
 
   def set_engine(self, engine):
     """Overrides `set_engine` to do checks and an internal reset.
@@ -389,8 +447,28 @@ class ScrollingCropper(ObservationCropper):
                   (self._engine.rows, self._engine.cols)))
       # Force crop to reinitialise the window.
       self._corner = None
+      self._tracked_instances = {}
 
   def crop(self, observation):
+    # Crop out the scrolling window.
+    tlr, tlc = self.track()
+    return self._do_crop(
+        observation,
+        tlr, tlc,
+        tlr + self._rows, tlc + self._cols,
+        self._pad_char)
+
+  def track(self):
+    """Move the scrolling window to follow the tracked entities.
+
+    `crop` calls this method itself, so there is usually no need to call it.
+    It's public so that the window placement logic can be used without the
+    cropping, e.g. to compute the window corners for a `BatchCropper`. Call it
+    (or `crop`) once per observation, just as `crop` would be called.
+
+    Returns:
+      the new `(row, col)` top-left corner of the scrolling window.
+    """
     # Identify the location we should track.
     centroid = self._centroid_to_track()
 
@@ -417,13 +495,7 @@ class ScrollingCropper(ObservationCropper):
       # Otherwise do no update at all. Wait for a trackable thing to wander back
       # into the window so that we can start tracking it again.
 
-    # Crop out the scrolling window.
-    tlr, tlc = self._corner  # pylint: disable=unpacking-non-sequence
-    return self._do_crop(
-        observation,
-        tlr, tlc,
-        tlr + self._rows, tlc + self._cols,
-        self._pad_char)
+    return self._corner
 
   @property
   def rows(self):
@@ -563,6 +635,13 @@ class ScrollingCropper(ObservationCropper):
     This method works by inspecting `Sprite`s and `Drape`s within the game
     engine and not via analysing observations.
 
+    The locations of large entities (`things.ILarge`) are shifted to the
+    centroids of their image footprints. A `LargeDrape` is a collection of
+    distinct objects, so instead of the centroid of its whole curtain, we track
+    one of its instances: the same one as last time if it's still there, or else
+    the one nearest to where we were looking. As long as the tracked instance
+    doesn't move, this costs O(1) time per frame.
+
     Args:
       entity: ASCII character designating the game entity whose centroid we
           should attempt to find.
@@ -587,12 +666,380 @@ class ScrollingCropper(ObservationCropper):
     # no position at all.
     try:
       if not sprite_or_drape.visible: return None
-      return tuple(sprite_or_drape.position)
+      position = tuple(sprite_or_drape.position)
     except AttributeError:
       pass
+    else:
+      return self._footprint_centroid(sprite_or_drape, position)
 
-    # If here, it's a Drape, not a Sprite. Compute the centroid of its
-    # curtain and return that. An empty Drape has no centroid.
+    # If here, it's a Drape, not a Sprite. Large drapes get instance tracking.
+    if isinstance(sprite_or_drape, things.LargeDrape):
+      instance = self._tracked_instance(entity, sprite_or_drape)
+      if instance is None: return None
+      return self._footprint_centroid(sprite_or_drape, instance)
+
+    # Otherwise, compute the centroid of its curtain and return that. An empty
+    # Drape has no centroid.
     curtain = sprite_or_drape.curtain
     if not curtain.any(): return None
     return tuple(int(np.median(dim)) for dim in curtain.nonzero())
+
+  def _footprint_centroid(self, entity, position):
+    """Shift `position` to the footprint centroid of `entity`, if it has one."""
+    if not isinstance(entity, things.ILarge): return position
+    drow, dcol = entity.footprint_centre
+    return position[0] + drow, position[1] + dcol
+
+  def _tracked_instance(self, character, drape):
+    """Choose the instance of a `LargeDrape` that we should track.
+
+    Args:
+      character: ASCII character of `drape`.
+      drape: a `LargeDrape`.
+
+    Returns:
+      the `(row, col)` location of the instance to track, or None if `drape`
+      has no instances at all.
+    """
+    # Keep tracking the same instance for as long as it exists.
+    last = self._tracked_instances.get(character)
+    if last is not None and drape.curtain[last]: return last
+
+    # Otherwise, choose the instance nearest to where we were last looking.
+    instances = drape.drape_list
+    if not len(instances):
+      self._tracked_instances.pop(character, None)
+      return None
+    if last is not None:
+      target = last
+    elif self._corner is not None:
+      target = (self._corner[0] + self._rows // 2,
+                self._corner[1] + self._cols // 2)
+    else:
+      target = instances[0]
+    nearest = instances[np.argmin(np.square(instances - target).sum(axis=1))]
+    self._tracked_instances[character] = (int(nearest[0]), int(nearest[1]))
+    return self._tracked_instances[character]
+
+
+class FieldOfViewCropper(ObservationCropper):
+  """A cropper that hides whatever a game entity can't see.
+
+  A `FieldOfViewCropper` doesn't change the size of an `Observation`; instead,
+  it hides every cell that can't be seen from the position of the `Sprite` it
+  tracks, because an opaque character (a wall, say) is in the way, or because
+  the cell is too far away. In the `board`, hidden cells are painted over with
+  `pad_char` (or, in RGB `board`s, with 0 in all channels, as in the padding
+  of other croppers), as they are in the `symbolic_board` and the `layers`.
+  Which cells are visible is available separately from the `visible` property,
+  e.g. for use as an extra observation channel.
+
+  A cell is visible if the cell before it on the straight line from the viewer
+  is visible and not opaque, where "before" means one step closer to the
+  viewer in Chebyshev distance, rounded to the nearest cell. Opaque cells are
+  visible themselves, so walls are seen but not seen through. All cells the
+  same distance from the viewer are worked out at once, starting with those
+  next to the viewer and stopping early once none are visible; the line-of-
+  sight geometry is worked out only once, when the first observation arrives.
+  The visible cells are remembered, and reused for as long as the viewer and
+  the opaque cells stay where they are.
+
+  Observations given to `crop` must be full game boards, as made by the
+  `Engine`, and not, for example, the output of another cropper.
+  """
+
+  def __init__(self, to_track, opaque='#', pad_char=' ', radius=None):
+    """Initialise a `FieldOfViewCropper`.
+
+    Args:
+      to_track: the character of the `Sprite` that does the seeing.
+      opaque: an indexable of ASCII characters that can't be seen through. A
+          string value containing these characters works.
+      pad_char: ASCII character to fill hidden cells of the `symbolic_board`
+          and the `layers` with; also the fill for character `board`s.
+      radius: if not None, cells further than this from the viewer (in
+          Euclidean distance, counting cells) are hidden as well.
+    """
+    super(FieldOfViewCropper, self).__init__()
+    self._to_track = to_track
+    self._opaque = list(opaque)
+    self._pad_char = pad_char
+    self._radius = radius
+    self._sightlines = None  # Line-of-sight geometry; see `_sightlines_for`.
+
+  def set_engine(self, engine):
+    """Inform the `FieldOfViewCropper` where observations are coming from.
+
+    Args:
+      engine: the pycolab game engine that will generate the observations
+          passed to `crop`; see `ObservationCropper.set_engine`.
+
+    Raises:
+      ValueError: `pad_char` is not a character used by `Sprite`s, `Drape`s, or
+          the `Backdrop` of `engine`.
+    """
+    super(FieldOfViewCropper, self).set_engine(engine)
+    if engine is not None and self._pad_char not in self._valid_pad_chars:
+      raise ValueError(
+          'A `FieldOfViewCropper` tried to fill hidden space with a character '
+          'that isn\'t used by the current game engine.')
+
+  def crop(self, observation):
+    """Hide the parts of `observation` that the tracked `Sprite` can't see.
+
+    Args:
+      observation: observation to crop, a `rendering.Observation`.
+
+    Returns:
+      a `rendering.Observation` the same size as `observation` with hidden
+      cells painted over as described in the class docstring. You must copy
+      this observation if you need it to last longer than the next call to
+      `crop`.
+    """
+    opaque = np.zeros(observation.symbolic_board.shape, dtype=bool)
+    for char in self._opaque:
+      if char in observation.layers: opaque |= observation.layers[char]
+    position = tuple(self._engine.things[self._to_track].position)
+    if (position != self._seen_from or
+        not np.array_equal(opaque, self._seen_opaque)):
+      self._visible = self._look(position, opaque)
+      self._visible.setflags(write=False)
+      self._hidden = ~self._visible
+      self._seen_from, self._seen_opaque = position, opaque
+
+    # Allocate the observation that receives the crop, if we need to, as in
+    # `_do_crop`.
+    if (self._cropped is None or
+        self._cropped.board.shape != observation.board.shape or
+        self._cropped.board.dtype != observation.board.dtype or
+        set(self._cropped.layers) != set(observation.layers)):
+      self._cropped = rendering.Observation(
+          board=np.zeros_like(observation.board),
+          symbolic_board=np.zeros_like(observation.symbolic_board),
+          layers={c: np.zeros_like(layer)
+                  for c, layer in six.iteritems(observation.layers)})
+
+    hidden = self._hidden
+    pad = ord(self._pad_char)
+    np.copyto(self._cropped.board, observation.board)
+    self._cropped.board[hidden] = 0 if observation.board.ndim == 3 else pad
+    np.copyto(self._cropped.symbolic_board, observation.symbolic_board)
+    self._cropped.symbolic_board[hidden] = pad
+    for char, layer in six.iteritems(self._cropped.layers):
+      np.logical_and(observation.layers[char], self._visible, out=layer)
+      if char == self._pad_char: layer |= hidden
+    return self._cropped
+
+  @property
+  def visible(self):
+    """A read-only boolean mask of the cells visible in the last crop."""
+    return self._visible
+
+  ### Private helpers ###
+
+  def _set_engine_root_impl(self, engine):
+    super(FieldOfViewCropper, self)._set_engine_root_impl(engine)
+    self._seen_from = None   # The viewer position and opaque cells...
+    self._seen_opaque = None
+    self._visible = None     # ...from which these cells were visible.
+    self._hidden = None
+
+  def _look(self, position, opaque):
+    """Compute which cells of the board are visible from `position`."""
+    rows, cols = opaque.shape
+    reach, rings, before, in_range = self._sightlines_for(rows, cols)
+    size = 2 * reach + 1
+
+    # The opaque cells in a window centred on the viewer; off the board,
+    # everything is opaque.
+    row, col = position
+    padded = np.pad(opaque, reach, 'constant', constant_values=True)
+    clear = ~padded[row:row + size, col:col + size].ravel()
+
+    seen = np.zeros(size * size, dtype=bool)
+    seen[reach * size + reach] = True
+    for ring in rings:
+      behind = before[ring]
+      seen[ring] = seen[behind] & clear[behind]
+      if not seen[ring].any(): break
+    seen &= in_range
+
+    # Copy the window back onto the board.
+    visible = np.zeros((rows + 2 * reach, cols + 2 * reach), dtype=bool)
+    visible[row:row + size, col:col + size] = seen.reshape(size, size)
+    return visible[reach:reach + rows, reach:reach + cols]
+
+  def _sightlines_for(self, rows, cols):
+    """Line-of-sight geometry for a board of this size, computed once.
+
+    Returns:
+      a 4-tuple: the furthest distance `reach` from the viewer that could be
+      visible; a list of arrays of the flat indices of cells in a window of
+      size `2 * reach + 1` centred on the viewer, one for each Chebyshev
+      distance 1..`reach`; the flat index of the cell before each cell on the
+      line from the viewer; and a flat mask of the cells within `radius`.
+    """
+    if self._sightlines is not None and self._sightlines[0] == (rows, cols):
+      return self._sightlines[1]
+
+    reach = max(rows, cols) - 1
+    if self._radius is not None: reach = min(reach, int(self._radius))
+    size = 2 * reach + 1
+    drows, dcols = np.mgrid[-reach:reach + 1, -reach:reach + 1]
+    distance = np.maximum(np.abs(drows), np.abs(dcols))
+    shrink = (distance - 1) / np.maximum(distance, 1)
+    before = ((np.round(drows * shrink).astype(np.int64) + reach) * size +
+              np.round(dcols * shrink).astype(np.int64) + reach).ravel()
+    distance = distance.ravel()
+    rings = [np.flatnonzero(distance == d) for d in range(1, reach + 1)]
+    if self._radius is None:
+      in_range = np.ones(size * size, dtype=bool)
+    else:
+      in_range = (drows ** 2 + dcols ** 2 <= self._radius ** 2).ravel()
+
+    self._sightlines = ((rows, cols), (reach, rings, before, in_range))
+    return self._sightlines[1]
+
+
+class BatchCropper(object):
+  """Crop many same-sized windows out of an `Observation` at once.
+
+  Where an `ObservationCropper` makes one cropped `Observation` at a time, a
+  `BatchCropper` takes a list of `W` window corners and makes a single
+  "batched" `Observation` whose members have an extra leading dimension: the
+  `board` is `(W, rows, cols)` (or `(W, rows, cols, 3)` for RGB boards), the
+  `symbolic_board` is `(W, rows, cols)`, and each layer is `(W, rows, cols)`.
+  All windows are extracted with one gather from a padded copy of the board,
+  which is much faster than cropping many windows one by one.
+
+  The window corners can come from anywhere, including from the `track` method
+  of `ScrollingCropper`s:
+
+      trackers = [cropping.ScrollingCropper(9, 9, [c], pad_char='#')
+                  for c in 'abcdefgh']
+      batch_cropper = cropping.BatchCropper(9, 9, pad_char='#')
+      for cropper in trackers + [batch_cropper]: cropper.set_engine(engine)
+      ...
+      views = batch_cropper.crop(observation, [t.track() for t in trackers])
+
+  The layers of the batched observation are derived from its `symbolic_board`,
+  just as the `Engine` derives the layers of its own observations.
+  """
+
+  def __init__(self, rows, cols, pad_char=None):
+    """Initialise a `BatchCropper`.
+
+    Args:
+      rows: Height of the cropping windows.
+      cols: Width of the cropping windows.
+      pad_char: ASCII fill character to use when a cropping window extends
+          beyond the bounds of the observation, or None if the cropping windows
+          will always remain in bounds (in which case a `RuntimeError` is
+          raised if one does not).
+    """
+    self._rows = rows
+    self._cols = cols
+    self._pad_char = pad_char
+    self._row_offsets = np.arange(rows)
+    self._col_offsets = np.arange(cols)
+    self.set_engine(None)
+
+  def set_engine(self, engine):
+    """Inform the `BatchCropper` where observations are coming from.
+
+    Args:
+      engine: the pycolab game engine that will generate the observations
+          passed to `crop`; see `ObservationCropper.set_engine`.
+
+    Raises:
+      ValueError: `pad_char` is not a character used by `Sprite`s, `Drape`s, or
+          the `Backdrop` of `engine`.
+    """
+    self._engine = engine
+    if (engine is not None and self._pad_char is not None and
+        self._pad_char not in
+        list(engine.things) + list(engine.backdrop.palette)): raise ValueError(
+            'A `BatchCropper` tried to fill empty space with a character '
+            'that isn\'t used by the current game engine.')
+    # Copies of the board and symbolic board, surrounded by a ring of padding
+    # that is as wide as the cropping window. Allocated by `crop`.
+    self._padded_board = None
+    self._padded_symbolic_board = None
+
+  def crop(self, observation, corners):
+    """Crop windows out of `observation`.
+
+    Args:
+      observation: observation to crop, a `rendering.Observation`.
+      corners: a sequence of `W` `(row, col)` top-left corners of the cropping
+          windows, or an equivalent `(W, 2)` integer array.
+
+    Returns:
+      a batched `rendering.Observation` as described in the class docstring.
+      Its members are freshly allocated, so they may be kept as long as you
+      like.
+
+    Raises:
+      RuntimeError: a cropping window extends beyond the bounds of
+          `observation`, and `pad_char` was None.
+    """
+    obs_rows, obs_cols = observation.symbolic_board.shape
+    corners = np.asarray(corners, dtype=np.int64).reshape(-1, 2)
+
+    if self._pad_char is None:
+      if (np.any(corners < 0) or
+          np.any(corners + (self._rows, self._cols) > (obs_rows, obs_cols))):
+        raise RuntimeError(
+            'A BatchCropper attempted to crop a region that extends beyond the '
+            'observation without specifying a character to fill the void that '
+            'exists out there.')
+    else:
+      # Windows further out than this are entirely padding anyway.
+      corners = np.clip(corners, (-self._rows, -self._cols), (obs_rows, obs_cols))
+
+    # Copy the observation into the middle of the padded boards, allocating
+    # them first if necessary.
+    board_shape = ((obs_rows + 2 * self._rows, obs_cols + 2 * self._cols) +
+                   observation.board.shape[2:])
+    if (self._padded_board is None or
+        self._padded_board.shape != board_shape or
+        self._padded_board.dtype != observation.board.dtype):
+      self._padded_board = np.full(
+          board_shape,
+          (0 if self._pad_char is None else
+           _board_pad_value(observation.board, self._pad_char)),
+          dtype=observation.board.dtype)
+      self._padded_symbolic_board = np.full(
+          board_shape[:2],
+          0 if self._pad_char is None else ord(self._pad_char),
+          dtype=observation.symbolic_board.dtype)
+    interior = np.s_[self._rows:self._rows + obs_rows,
+                     self._cols:self._cols + obs_cols]
+    self._padded_board[interior] = observation.board
+    self._padded_symbolic_board[interior] = observation.symbolic_board
+
+    # Gather all of the windows at once.
+    row_indices = corners[:, 0, None] + self._rows + self._row_offsets
+    col_indices = corners[:, 1, None] + self._cols + self._col_offsets
+    gather = np.s_[row_indices[:, :, None], col_indices[:, None, :]]
+    symbolic_board = self._padded_symbolic_board[gather]
+    return rendering.Observation(
+        board=self._padded_board[gather],
+        symbolic_board=symbolic_board,
+        layers={char: np.equal(symbolic_board, ord(char))
+                for char in observation.layers})
+
+  @property
+  def rows(self):
+    """The height of the cropping windows."""
+    return self._rows
+
+  @property
+  def cols(self):
+    """The width of the cropping windows."""
+    return self._cols
+
+
+def _board_pad_value(board, pad_char):
+  """What to pad `board` with: black for RGB boards, else `ord(pad_char)`."""
+  return 0 if board.ndim == 3 else ord(pad_char)
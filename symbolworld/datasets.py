@@ -0,0 +1,225 @@
+# Copyright 2017 the pycolab Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Streaming transitions from recorded episodes, e.g. for offline RL.
+
+A `TrajectoryLoader` reads a recording made by `recording.EpisodeRecorder`
+and yields batches of transitions:
+
+    loader = datasets.TrajectoryLoader(
+        '/tmp/episodes', symbolic_gridworld.make_replay_game, batch_size=256,
+        observation='layers', characters='#Pa@K', shuffle=True, seed=0)
+    for batch in loader.batches():
+      train(batch.observations, batch.actions, batch.rewards,
+            batch.next_observations, batch.dones)
+
+Recordings don't store observations, so the loader recreates them by
+replaying each episode, in a pool of background threads that works a few
+episodes ahead of the consumer. Only those few episodes are ever in memory.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+from concurrent import futures
+import threading
+
+import numpy as np
+
+from pycolab import recording
+
+
+class Transitions(
+    collections.namedtuple('Transitions',
+                           ['observations', 'actions', 'rewards',
+                            'next_observations', 'dones'])):
+  """A batch of `N` transitions, as arrays whose first dimension is `N`.
+
+  `rewards` are float32, with rewards of None as 0.0. `dones` are True for
+  transitions that ended an episode (those with a discount of 0).
+  `observations` and `next_observations` are in the loader's chosen format.
+  """
+  __slots__ = ()
+
+
+# Formats for observations, and how to make them from `Observation`s.
+OBSERVATION_FORMATS = ('symbolic', 'rgb', 'layers')
+
+
+class TrajectoryLoader(object):
+  """Batches of transitions from a recording, prefetched in the background.
+
+  Batches may mix transitions from several episodes, so the boards of all of
+  the episodes read into the same `batches()` should have the same size.
+  """
+
+  def __init__(self, directory, make_game, batch_size, observation='symbolic',
+               characters=None, shuffle=False, seed=None, num_workers=2,
+               prefetch=4, drop_remainder=False):
+    """Construct a `TrajectoryLoader`.
+
+    Args:
+      directory: a recording directory made by a `recording.EpisodeRecorder`.
+      make_game: the `make_game` callable for replaying the recording's
+          episodes; see `recording.Recording`. With more than one worker, it
+          is called from several threads at once, so it must not share state
+          like the global `np.random` between calls.
+      batch_size: number of transitions in each batch.
+      observation: the format of observations: `'symbolic'` for
+          `symbolic_board` arrays, `'rgb'` for RGB `board` arrays, or
+          `'layers'` for a stack of the boolean `layers` of `characters`.
+      characters: a sequence of characters whose layers to stack, in order.
+          Required for `'layers'` observations only.
+      shuffle: whether to visit episodes in a random order. (Transitions
+          within an episode stay in order.)
+      seed: seed for the shuffling.
+      num_workers: number of threads replaying episodes. Use 1 for a
+          `make_game` that isn't thread-safe.
+      prefetch: number of episodes to replay ahead of the consumer.
+      drop_remainder: whether to drop the last batch of `batches()` if it has
+          fewer than `batch_size` transitions.
+
+    Raises:
+      ValueError: `observation` is not a format in `OBSERVATION_FORMATS`, or
+          `characters` is missing for `'layers'` observations, or `batch_size`,
+          `num_workers` or `prefetch` is less than 1.
+    """
+    if observation not in OBSERVATION_FORMATS:
+      raise ValueError('observation must be one of {}, not {!r}.'.format(
+          OBSERVATION_FORMATS, observation))
+    if observation == 'layers' and not characters:
+      raise ValueError('A TrajectoryLoader needs characters to make layers '
+                       'observations.')
+    for name, value in [('batch_size', batch_size),
+                        ('num_workers', num_workers), ('prefetch', prefetch)]:
+      if value < 1:
+        raise ValueError('{} must be at least 1, not {}.'.format(name, value))
+
+    self._directory = directory
+    self._make_game = make_game
+    self._batch_size = batch_size
+    self._observation = observation
+    self._characters = list(characters or [])
+    self._shuffle = shuffle
+    self._rng = np.random.RandomState(seed)
+    self._num_workers = num_workers
+    self._prefetch = prefetch
+    self._drop_remainder = drop_remainder
+
+    # Each thread replays with its own Recording, since replay has state.
+    self._local = threading.local()
+    self._num_episodes = len(recording.Recording(directory))
+
+  def __len__(self):
+    """The number of episodes in the recording."""
+    return self._num_episodes
+
+  def episode(self, index):
+    """All transitions of the episode at `index`, as one `Transitions`."""
+    recorded_episode = self._recording().episode(index)
+    observations = np.stack([self._format(observation) for observation in
+                             self._recording().replay(index)])
+    rewards = np.nan_to_num(np.asarray(recorded_episode.rewards))
+    return Transitions(
+        observations=observations[:-1],
+        actions=np.array(recorded_episode.actions),
+        rewards=rewards.astype(np.float32),
+        next_observations=observations[1:],
+        dones=np.asarray(recorded_episode.discounts) == 0)
+
+  def batches(self, episodes=None):
+    """Yield `Transitions` batches from episodes, replayed in the background.
+
+    Args:
+      episodes: indices of the episodes to read, in order; by default, all
+          episodes, shuffled if the loader was made with `shuffle=True`.
+
+    Yields:
+      `Transitions` with `batch_size` transitions each, except perhaps the
+      last (see `drop_remainder`).
+    """
+    if episodes is None:
+      episodes = np.arange(self._num_episodes)
+      if self._shuffle: self._rng.shuffle(episodes)
+    episodes = list(episodes)
+
+    executor = futures.ThreadPoolExecutor(self._num_workers)
+    pending = collections.deque()
+    try:
+      next_episode = 0
+      buffered = []  # Transitions not yet batched, in order.
+      num_buffered = 0
+      while next_episode < len(episodes) or pending:
+        # Keep the workers `prefetch` episodes ahead of us.
+        while next_episode < len(episodes) and len(pending) < self._prefetch:
+          pending.append(executor.submit(self.episode, episodes[next_episode]))
+          next_episode += 1
+
+        transitions = pending.popleft().result()
+        buffered.append(transitions)
+        num_buffered += len(transitions.actions)
+        while num_buffered >= self._batch_size:
+          batch, buffered = _split(buffered, self._batch_size)
+          num_buffered -= self._batch_size
+          yield batch
+
+      if num_buffered and not self._drop_remainder:
+        yield _split(buffered, num_buffered)[0]
+    finally:
+      for future in pending: future.cancel()
+      executor.shutdown(wait=False)
+
+  def __iter__(self):
+    return self.batches()
+
+  def _recording(self):
+    """This thread's `recording.Recording`."""
+    if getattr(self._local, 'recording', None) is None:
+      self._local.recording = recording.Recording(self._directory,
+                                                  self._make_game)
+    return self._local.recording
+
+  def _format(self, observation):
+    """Convert an `Observation` to the loader's observation format."""
+    if self._observation == 'symbolic': return observation.symbolic_board
+    if self._observation == 'rgb': return observation.board
+    return np.stack([observation.layers[character]
+                     for character in self._characters])
+
+
+def _split(buffered, size):
+  """Split the first `size` transitions from a list of `Transitions`.
+
+  Returns:
+    a 2-tuple: a `Transitions` of the first `size` transitions, and a list of
+    `Transitions` holding the rest.
+  """
+  taken = []
+  remaining = size
+  while remaining:
+    transitions = buffered[0]
+    length = len(transitions.actions)
+    if length <= remaining:
+      taken.append(transitions)
+      buffered = buffered[1:]
+      remaining -= length
+    else:
+      taken.append(Transitions(*[field[:remaining] for field in transitions]))
+      buffered = ([Transitions(*[field[remaining:] for field in transitions])] +
+                  buffered[1:])
+      remaining = 0
+  batch = Transitions(*[np.concatenate(fields) for fields in zip(*taken)])
+  return batch, buffered
@@ -25,9 +25,11 @@ from __future__ import division
 from __future__ import print_function
 
 import collections
+import copy
 
 import numpy as np
 
+from pycolab import hashing
 from pycolab import plot
 from pycolab import rendering
 from pycolab import things
@@ -95,7 +97,8 @@ class Engine(object):
   now!) and then the docstring for the `Engine` constructor.
   """
 
-  def __init__(self, rows, cols, occlusion_in_layers=True):
+  def __init__(self, rows, cols, occlusion_in_layers=True,
+               instance_maps=False, tile_size=None):
     """Construct a new pycolab game engine.
 
     Builds a new pycolab game engine, ready to be populated with a `Backdrop`,
@@ -207,10 +210,26 @@ class Engine(object):
           **NOTE: This flag also determines the occlusion behavior in `layers`
           arguments to all game entities' `update` methods; see docstrings in
           [things.py] for details.**
+      instance_maps: If `True`, each rendering also fills in the per-pixel
+          `instance_ids` and `footprint_board` maps, which are available via the
+          `Engine` properties of the same names.
+      tile_size: If not None, the `Engine` renders with a
+          `rendering.DirtyTileObservationRenderer` with tiles of this size,
+          which only repaints the parts of the board that change. This makes
+          rendering much cheaper for very large boards where little moves.
+          Can't be combined with `instance_maps`.
+
+    Raises:
+      ValueError: both `instance_maps` and `tile_size` were specified.
     """
+    if instance_maps and tile_size is not None:
+      raise ValueError('An Engine cannot make instance maps when rendering '
+                       'with dirty tiles (tile_size={}).'.format(tile_size))
     self._rows = rows
     self._cols = cols
     self._occlusion_in_layers = occlusion_in_layers
+    self._instance_maps = instance_maps
+    self._tile_size = tile_size
 
     # This game's Plot object
     self._the_plot = plot.Plot()
@@ -245,6 +264,17 @@ class Engine(object):
     # Code should not keep local references to this object or its members.
     self._board = None
 
+    # The Zobrist hash of the symbolic board, a copy of the symbolic board that
+    # it was computed for, and notes on what was painted there (see
+    # `_paint_notes`). All are only brought up to date when the user asks for
+    # `state_hash`.
+    self._state_hash = None
+    self._hashed_board = None
+    self._hashed_notes = None
+
+    # An optional `profiling.Profiler` that times the parts of each frame.
+    self._profiler = None
+
   def set_backdrop(self, characters, backdrop_class, *args, **kwargs):
     """Add a `Backdrop` to this `Engine`.
 
@@ -556,6 +586,9 @@ class Engine(object):
     # to a more efficient structure.
     self._update_groups = [(key, self._update_groups[key])
                            for key in sorted(self._update_groups.keys())]
+    # Names for the profiler to time each entity's updates under.
+    self._update_names = {character: 'update/' + character
+                          for character in self._sprites_and_drapes}
 
     # And, I guess we promised to do this:
     self._current_update_group = None
@@ -564,8 +597,12 @@ class Engine(object):
     chars = set(self._sprites_and_drapes.keys()).union(self._backdrop.palette)
 
     # Note: The original renderer had occlusion setting, it's not implemented in this Symbolic gridworld
-    self._renderer = rendering.SymbolicObservationRenderer(
-        self._rows, self._cols, chars)
+    if self._tile_size is None:
+      self._renderer = rendering.SymbolicObservationRenderer(
+          self._rows, self._cols, chars, instance_maps=self._instance_maps)
+    else:
+      self._renderer = rendering.DirtyTileObservationRenderer(
+          self._rows, self._cols, chars, tile_size=self._tile_size)
 
 
     # Render a "pre-initial" board rendering from all of the data in the
@@ -573,13 +610,13 @@ class Engine(object):
     # input to these entities to collect their updates for the very first frame;
     # as it accesses data members inside the entities directly, it doesn't
     # actually run any of their code (unless implementers ignore notes that say
-    # "Final. Do not override.").
-    self._render()
+    # "Final. Do not override."). Nobody sees its RGB board, so we skip it.
+    self._render(rgb=False)
 
     # The behaviour of this method is now identical to play() with None actions.
     return self.play(None)
 
-  def play(self, actions):
+  def play(self, actions, repeat=1, rgb=True):
     """Perform another game iteration, applying player actions.
 
     Receives an action (or actions) from the player (or players). Consults the
@@ -588,12 +625,27 @@ class Engine(object):
     collects reward(s) for the last action and determines whether the episode
     has terminated.
 
+    If `repeat` is greater than 1, the same `actions` are applied for up to
+    `repeat` consecutive game iterations ("frame skipping"), stopping early if
+    the episode terminates. Rewards from all of these iterations are summed.
+    Intermediate iterations keep `symbolic_board` and the layers up to date for
+    the game entities, but skip painting the RGB `board`, which is only painted
+    for the observation that is finally returned. If `rgb` is False, it isn't
+    painted for that observation either, unless the episode has ended; this is
+    for users who never look at the RGB `board`, like agents that only see the
+    `symbolic_board`.
+
     Args:
       actions: Actions supplied by the external agent(s) in response to the last
           board. Could be a scalar, could be an arbitrarily nested structure
           of... stuff, it's entirely up to the game you're making. When the game
           begins, however, it is guaranteed to be None. Used for the `update()`
           method of the `Backdrop` and all `Sprite`s and `Layer`s.
+      repeat: number of consecutive game iterations to which `actions` should
+          be applied. Must be at least 1.
+      rgb: whether to paint the RGB `board` of the returned observation. If
+          False, its contents are undefined (see
+          `SymbolicObservationRenderer.clear`).
 
     Returns:
       A three-tuple with the following members:
@@ -603,7 +655,8 @@ class Engine(object):
           `actions` in response to the last observation. This reward can be any
           type---it all depends on what the `Backdrop`, `Sprite`s, and `Drape`s
           have communicated to the `Plot`. If none have communicated anything at
-          all, this will be None.
+          all, this will be None. When `repeat` is greater than 1, this is the
+          sum of the non-None rewards of all iterations performed.
         * A reinforcement learning discount factor value. By default, it will be
           1.0 if the game is still ongoing; if the game has just terminated
           (before the player got a chance to do anything!), `discount` will be
@@ -614,6 +667,7 @@ class Engine(object):
       RuntimeError: if this method has been called before the `Engine` has
           been finalised via `its_showtime()`, or if this method has been called
           after the episode has terminated.
+      ValueError: `repeat` is less than 1.
     """
     if not self._showtime:
       raise RuntimeError('play() cannot be called until the Engine is placed '
@@ -621,21 +675,107 @@ class Engine(object):
     if self._game_over:
       raise RuntimeError('play() was called after the episode handled by this '
                          'Engine has terminated.')
+    if repeat < 1:
+      raise ValueError('play() was called with repeat={}, but actions must be '
+                       'applied at least once.'.format(repeat))
+
+    profiler = self._profiler
+    reward = None
+    for iteration in range(repeat):
+      paint_rgb = rgb and iteration == repeat - 1
+      if profiler is not None: frame_start = profiler.timer()
+
+      # Update Backdrop and all Sprites and Drapes.
+      self._update_and_render(actions, paint_rgb=paint_rgb)
+
+      # Apply all plot directives that the Backdrop, Sprites, and Drapes have
+      # submitted to the Plot during the update.
+      if profiler is None:
+        iteration_reward, discount, should_rerender = (
+            self._apply_and_clear_plot())
+      else:
+        iteration_reward, discount, should_rerender = self._timed(
+            'apply_and_clear_plot', self._apply_and_clear_plot)
+
+      # Accumulate rewards. As in `Story`, we avoid `+=` in case the reward is a
+      # mutable object that the game might still be holding on to.
+      if iteration_reward is not None:
+        reward = (iteration_reward if reward is None
+                  else reward + iteration_reward)
+
+      # If directives in the Plot changed our state in any way that would change
+      # the appearance of the observation (e.g. changing the z-order), we'll
+      # have to re-render it before we return it.
+      if should_rerender: self._render(rgb=paint_rgb or self._game_over)
+
+      if profiler is not None:
+        profiler.add('frame', profiler.timer() - frame_start)
+        profiler.end_frame()
+
+      if self._game_over: break
+
+    # Return first-frame rendering to the user.
+    return self._board, reward, discount
 
-    # Update Backdrop and all Sprites and Drapes.
-    self._update_and_render(actions)
+  def snapshot(self):
+    """Save the state of the game, so that it can be restored later.
 
-    # Apply all plot directives that the Backdrop, Sprites, and Drapes have
-    # submitted to the Plot during the update.
-    reward, discount, should_rerender = self._apply_and_clear_plot()
+    The snapshot holds deep copies of the `Backdrop`, all `Sprite`s and
+    `Drape`s, and the `Plot`, so it is unaffected by further play. The images
+    (`img`) of large game entities and the `Backdrop`'s `Palette` never change,
+    so they are shared with the snapshot rather than copied.
 
-    # If directives in the Plot changed our state in any way that would change
-    # the appearance of the observation (e.g. changing the z-order), we'll have
-    # to re-render it before we return it.
-    if should_rerender: self._render()
+    Snapshots are opaque; the only thing to do with them is to pass them to
+    `restore`, possibly many times. They may only be restored into the `Engine`
+    that made them.
 
-    # Return first-frame rendering to the user.
-    return self._board, reward, discount
+    Returns:
+      A snapshot of the game's state.
+
+    Raises:
+      RuntimeError: if this method has been called before the `Engine` has
+          been finalised via `its_showtime()`.
+    """
+    if not self._showtime:
+      raise RuntimeError('snapshot() cannot be called until the Engine is '
+                         'placed in "play mode" via the its_showtime() method.')
+    return _EngineSnapshot(self, self._copy_state(self._state()))
+
+  def restore(self, snapshot):
+    """Return the game to the state saved in `snapshot`.
+
+    Args:
+      snapshot: a snapshot made by this `Engine`'s `snapshot` method.
+
+    Raises:
+      ValueError: `snapshot` was made by a different `Engine`.
+    """
+    if not isinstance(snapshot, _EngineSnapshot) or snapshot.engine is not self:
+      raise ValueError('restore() was called with a snapshot that was not made '
+                       'by this Engine.')
+    # Copy again, so that the snapshot can be restored more than once.
+    (self._backdrop, self._sprites_and_drapes, self._update_groups,
+     self._the_plot, self._game_over) = self._copy_state(snapshot.state)
+    # The renderer holds no game state, so a re-rendering gets us back the last
+    # observation.
+    self._render()
+
+  def set_profiler(self, profiler):
+    """Time the parts of each game iteration with a `profiling.Profiler`.
+
+    May be called at any time. The `Engine` does no timing at all unless it
+    has a profiler, so profiling costs nothing unless you ask for it. See
+    `profiling.py` for what gets timed.
+
+    Args:
+      profiler: a `profiling.Profiler`, or None to stop profiling.
+    """
+    self._profiler = profiler
+
+  @property
+  def profiler(self):
+    """The `profiling.Profiler` given to `set_profiler`, or None."""
+    return self._profiler
 
   @property
   def the_plot(self):
@@ -653,6 +793,39 @@ class Engine(object):
   def game_over(self):
     return self._game_over
 
+  @property
+  def state_hash(self):
+    """A 64-bit Zobrist hash of the current game board.
+
+    The hash is a function of the last rendered `symbolic_board` only: it
+    doesn't see state that is hidden inside game entities or the `Plot`. Each
+    call rehashes only the cells where a `Sprite` or `Drape` has come or gone
+    since the last call (see `hashing.py`). The whole board is only compared
+    with the one last hashed if the z-order has changed, or if the `Backdrop`
+    has or may have changed (see `things.Backdrop.curtain_version`). So the
+    cost depends on how much has moved, not on the size of the board: about
+    50us on a 1000x1000 board, against 0.6ms for hashing the board's bytes
+    (which is quicker on small boards, though). The hash is the same integer
+    for equal boards in any `Engine`, even in another process, so it's good
+    for transposition tables, novelty counts, and deduplicating episodes. It
+    stays correct across `restore` calls.
+
+    Returns:
+      the hash as a Python integer, or None if the game has not been rendered
+      yet (i.e. `its_showtime` has not been called).
+    """
+    if self._board is None: return None
+    notes = self._paint_notes()
+    if self._hashed_board is None:
+      self._hashed_board = np.copy(self._board.symbolic_board)
+      self._state_hash = hashing.zobrist_hash(self._hashed_board)
+    else:
+      self._state_hash = hashing.update_zobrist_hash(
+          self._state_hash, self._hashed_board, self._board.symbolic_board,
+          self._repainted_positions(self._hashed_notes, notes))
+    self._hashed_notes = notes
+    return self._state_hash
+
   @property
   def z_order(self):
     """Obtain a copy of the game's current z-order."""
@@ -694,22 +867,94 @@ class Engine(object):
 
   ### Private helpers ###
 
-  def _update_and_render(self, actions):
+  def _state(self):
+    """All of the game state that changes during play, as a tuple."""
+    return (self._backdrop, self._sprites_and_drapes, self._update_groups,
+            self._the_plot, self._game_over)
+
+  def _copy_state(self, state):
+    """Deep-copy a tuple from `_state`, sharing entity images and palettes."""
+    memo = {id(state[0].palette): state[0].palette}  # The Backdrop's Palette.
+    for entity in six.itervalues(state[1]):  # The Sprites and Drapes.
+      img = getattr(entity, 'img', None)
+      if img is not None: memo[id(img)] = img
+    return copy.deepcopy(state, memo)
+
+  def _paint_notes(self):
+    """Notes on what the last rendering painted where, for `state_hash`.
+
+    Returns:
+      None if any `Drape` has no `drape_list`; otherwise, a 2-tuple: the
+      `Backdrop`'s `curtain_version`, and a dict in z-order mapping each
+      entity's character to where it was painted: a row, column tuple (or None
+      if invisible) for a `Sprite`, and the `drape_list` for a `Drape`.
+    """
+    anchors = collections.OrderedDict()
+    for character, entity in six.iteritems(self._sprites_and_drapes):
+      if isinstance(entity, things.Sprite):
+        anchors[character] = tuple(entity.position) if entity.visible else None
+      else:
+        anchors[character] = getattr(entity, 'drape_list', None)
+        if anchors[character] is None: return None
+    return self._backdrop.curtain_version, anchors
+
+  def _repainted_positions(self, old_notes, new_notes):
+    """Flat board positions that may differ between two `_paint_notes`.
+
+    Returns:
+      a list or 1-D integer array of positions, or None if the boards must be
+      compared in full: the notes are incomplete, the `Backdrop` may have
+      changed, or the z-order has changed.
+    """
+    if old_notes is None or new_notes is None: return None
+    (old_version, old_anchors), (new_version, new_anchors) = old_notes, new_notes
+    if new_version is None or new_version != old_version: return None
+    if list(old_anchors) != list(new_anchors): return None
+
+    # The boards can only differ where some entity was painted before or after;
+    # `update_zobrist_hash` checks which of those cells really changed. Sprite
+    # positions stay Python integers, since there are usually only a few.
+    cols = self._cols
+    positions = []  # Flat positions of Sprites.
+    arrays = []  # Row, column locations of Drapes, as (N, 2) arrays.
+    for character, anchor in six.iteritems(new_anchors):
+      last = old_anchors[character]
+      if anchor is last: continue
+      if isinstance(anchor, np.ndarray):
+        arrays.extend([last, anchor])
+      elif anchor != last:
+        positions.extend(cell[0] * cols + cell[1] for cell in (last, anchor)
+                         if cell is not None)
+    if not arrays: return positions
+    cells = np.concatenate(arrays)
+    return np.concatenate([cells[:, 0] * cols + cells[:, 1],
+                           np.array(positions, dtype=np.int64)])
+
+  def _update_and_render(self, actions, paint_rgb=True):
     """Perform all game entity updates and render the next observation.
 
     This private method is the heart of the `Engine`: as dictated by the update
     order, it consults the `Backdrop` and all `Sprite`s and `Layer`s for
     updates, then renders the game board (`self._board`) based on those updates.
 
+    Renderings made between update groups are only consumed by the entities in
+    later update groups, so they never paint the RGB `board`. The rendering
+    after the final update group paints it if `paint_rgb` is True or if the
+    game has asked for the episode to terminate.
+
     Args:
       actions: Actions supplied by the external agent(s) in response to the last
           board. Could be a scalar, could be an arbitrarily nested structure
           of... stuff, it's entirely up to the game you're making. When the game
           begins, however, it is guaranteed to be None. Used for the `update()`
           method of the `Backdrop` and all `Sprite`s and `Layer`s.
+      paint_rgb: whether the final rendering should paint the RGB `board`.
     """
     assert self._board, (
         '_update_and_render() called without a prior rendering of the board')
+    # With a profiler, updates are timed by `_timed`; without one, they're
+    # called directly, so that profiling costs nothing unless it's turned on.
+    profiler = self._profiler
 
     # A new frame begins!
     self._the_plot.frame += 1
@@ -717,23 +962,53 @@ class Engine(object):
     # We start with the backdrop; it doesn't really belong to an update group,
     # or it belongs to the first update group, depending on how you look at it.
     self._the_plot.update_group = None
-    self._backdrop.update(actions,
-                          self._board.symbolic_board, self._board.layers,
-                          self._sprites_and_drapes, self._the_plot)
+    if profiler is None:
+      self._backdrop.update(actions,
+                            self._board.symbolic_board, self._board.layers,
+                            self._sprites_and_drapes, self._the_plot)
+    else:
+      self._timed('backdrop', self._backdrop.update, actions,
+                  self._board.symbolic_board, self._board.layers,
+                  self._sprites_and_drapes, self._the_plot)
 
     # Now we proceed through each of the update groups in the prescribed order.
-    for update_group, entities in self._update_groups:
+    last_group_index = len(self._update_groups) - 1
+    for group_index, (update_group, entities) in enumerate(self._update_groups):
+      if profiler is not None: group_start = profiler.timer()
+
       # First, consult each item in this update group for updates.
       self._the_plot.update_group = update_group
       for entity in entities:
-        entity.update(actions,
-                      self._board.symbolic_board, self._board.layers,
+        if profiler is None:
+          entity.update(actions,
+                        self._board.symbolic_board, self._board.layers,
+                        self._backdrop, self._sprites_and_drapes,
+                        self._the_plot)
+        else:
+          self._timed(self._update_names[entity.character], entity.update,
+                      actions, self._board.symbolic_board, self._board.layers,
                       self._backdrop, self._sprites_and_drapes, self._the_plot)
 
       # Next, repaint the board to reflect the updates from this update group.
-      self._render()
-
-  def _render(self):
+      if group_index < last_group_index:
+        self._render(rgb=False)
+      else:
+        self._render(rgb=(
+            paint_rgb or self._the_plot._get_engine_directives().game_over))  # pylint: disable=protected-access
+
+      if profiler is not None:
+        profiler.add('group/{}'.format(update_group),
+                     profiler.timer() - group_start)
+
+  def _timed(self, name, method, *args):
+    """Call `method(*args)`, adding its running time to the profiler."""
+    timer = self._profiler.timer
+    start = timer()
+    result = method(*args)
+    self._profiler.add(name, timer() - start)
+    return result
+
+  def _render(self, rgb=True):
     """Render a new game board.
 
     Computes a new rendering of the game board, and assigns it to `self._board`,
@@ -744,10 +1019,22 @@ class Engine(object):
     Each object is "painted" on the board in a prescribed order: the `Backdrop`
     first, then the `Sprite`s and `Drape`s according to the z-order (the order
     in which they appear in `self._sprites_and_drapes`
+
+    Args:
+      rgb: whether to paint the RGB `board` as well. If False, only the
+          `symbolic_board` and layers of the new rendering are meaningful.
     """
-    self._renderer.clear()
+    if self._profiler is None:
+      self._paint_board(rgb)
+    else:
+      self._timed('render', self._paint_board, rgb)
+
+  def _paint_board(self, rgb):
+    """Does the actual work of `_render`."""
+    self._renderer.clear(rgb=rgb)
     # TODO Add backdrop support, it's currently not rendering backdrop
-    self._renderer.paint_all_of(self._backdrop.curtain)
+    self._renderer.paint_all_of(self._backdrop.curtain,
+                                self._backdrop.curtain_version)
     for character, entity in six.iteritems(self._sprites_and_drapes):
       # By now we should have checked fairly carefully that all entities in
       # _sprites_and_drapes are Sprites or Drapes.
@@ -762,6 +1049,26 @@ class Engine(object):
   def board(self):
       return self._board
 
+  @property
+  def instance_ids(self):
+    """Per-pixel entity instance IDs for the last rendering, or None.
+
+    Only available if the `Engine` was constructed with `instance_maps=True`;
+    see `rendering.SymbolicObservationRenderer.instance_ids` for details. Like
+    the observation itself, the returned array should be treated as read-only
+    and will be overwritten by the next rendering.
+    """
+    return None if self._renderer is None else self._renderer.instance_ids
+
+  @property
+  def footprint_board(self):
+    """Per-pixel characters over whole entity footprints, or None.
+
+    Only available if the `Engine` was constructed with `instance_maps=True`;
+    see `rendering.SymbolicObservationRenderer.footprint_board` for details.
+    """
+    return None if self._renderer is None else self._renderer.footprint_board
+
 
   def _apply_and_clear_plot(self):
     """Apply directives to this `Engine` found in its `Plot` object.
@@ -879,6 +1186,16 @@ class Engine(object):
         raise ValueError('Character {} is not an ASCII character'.format(char))
 
 
+class _EngineSnapshot(object):
+  """Opaque container for `Engine` snapshots. See `Engine.snapshot`."""
+
+  __slots__ = ('engine', 'state')
+
+  def __init__(self, engine, state):
+    self.engine = engine
+    self.state = state
+
+
 class Palette(object):
   """A helper class for turning human-readable characters into numerical values.
 
@@ -961,6 +1278,9 @@ class Palette(object):
     self._legal_characters = set(legal_characters)
 
   def __getattr__(self, name):
+    # Private and special names are never characters. Refusing them here keeps
+    # copy and pickle from recursing into a `Palette` under construction.
+    if name.startswith('_'): raise AttributeError(name)
     return self._actual_lookup(name, AttributeError)
 
   def __getitem__(self, key):
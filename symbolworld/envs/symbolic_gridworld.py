@@ -62,34 +62,44 @@ from gym import spaces
 from pycolab import ascii_art
 from pycolab import cropping
 from pycolab import human_ui_qt
+from pycolab import sensors
 from pycolab import things as plab_things
+from pycolab.prefab_parts import drapes as prefab_drapes
 from pycolab.prefab_parts import sprites as prefab_sprites
+from pycolab.protocols import distances
+from pycolab.protocols import logging as plab_logging
 from pycolab.plot import Plot
 from pycolab.level_generator import generate_level
 from pycolab.config import *
 
 
-def make_game(init_board):
-    """Builds and returns a Better Scrolly Maze game for the selected level."""
+def make_game(init_board, tile_size=None, rng=None):
+    """Builds and returns a Better Scrolly Maze game for the selected level.
 
-    return ascii_art.ascii_art_to_game(
-        init_board, what_lies_beneath=' ',
+    Pass a `tile_size` to render with dirty tiles, which is much faster for
+    very large boards (see `Engine`). The colours of the game's entities are
+    drawn from `rng`, a `np.random.RandomState`, or from a new, unseeded one;
+    each game has its own colours, so games can be made in parallel.
+    """
+    colors = make_colors(np.random.RandomState() if rng is None else rng)
+    return ascii_art.compile_game_spec(
+        what_lies_beneath=' ',
         sprites={
-            'P': PlayerSprite,
-            'a': PatrollerSprite,
+            'P': ascii_art.Partial(PlayerSprite, colors['sprite']),
         },
         drapes={
-            'K': KeyDrape,
-            '@': GoalDrape},
+            'a': ascii_art.Partial(PatrollerDrape, colors['patroller']),
+            'K': ascii_art.Partial(KeyDrape, colors['key']),
+            '@': ascii_art.Partial(GoalDrape, colors['goal'])},
         update_schedule=['a', 'K', 'P', '@'],
-        z_order='aK@P')
+        z_order='aK@P',
+        tile_size=tile_size).instantiate(init_board)
 
 class PlayerSprite(prefab_sprites.LargerObject):
     """A `Sprite` for our player, the maze explorer."""
 
-    def __init__(self, corner, position, character):
+    def __init__(self, corner, position, character, color):
         """Constructor: just tells `MazeWalker` we can't walk through walls."""
-        color = get_color('sprite')
         # Example of a 5 x 5 diamond, Key: relative position to center, Value: RGB value
         img = {(-2, 0): color,
                (-1, -1): color,
@@ -124,13 +134,14 @@ class PlayerSprite(prefab_sprites.LargerObject):
         if actions == 5:  # just quit?
             the_plot.terminate_episode()
 
-class PatrollerSprite(prefab_sprites.LargerObject):
-    """Wanders back and forth horizontally, killing the player on contact."""
+class PatrollerDrape(prefab_drapes.SpriteSwarm):
+    """All of the patrollers, which wander back and forth horizontally, killing
+    the player on contact. A swarm, so that many patrollers cost about as much
+    as one."""
 
-    def __init__(self, corner, position, character):
+    def __init__(self, curtain, character, color):
         """Constructor: list impassables, initialise direction."""
 
-        color = get_color('patroller')
         # Example of a 5 x 5 diamond, Key: relative position to center, Value: RGB value
         img = {(-2, 0): color,
                (-1, -1): color,
@@ -142,29 +153,25 @@ class PatrollerSprite(prefab_sprites.LargerObject):
                (1, 1): color,
                (2, 0): color,
                }
-        super(PatrollerSprite, self).__init__(
-            img, corner, position, character, impassable='#')
-        # Choose our initial direction based on our character value.
-        self._moving_east = False
+        super(PatrollerDrape, self).__init__(
+            img, curtain, character, impassable='#')
+        # All patrollers start out moving westward.
+        self._set_velocities((0, -1))
 
     def update(self, actions, board, layers, backdrop, things, the_plot):
-        del actions, backdrop  # Unused.
+        del actions, layers, backdrop  # Unused.
 
         # We only move once every two game iterations.
-        if the_plot.frame % 2:
-            self._stay(board, the_plot)  # Also not strictly necessary.
-            return
+        if the_plot.frame % 2: return
 
-        # If there is a wall next to us, we ought to switch direction.
-        row, col = self.position
-        if layers['#'][row, col - 3]: self._moving_east = True
-        if layers['#'][row, col + 3]: self._moving_east = False
+        # Patrollers that run into a wall turn around, and move the other way.
+        blocked = self._move(board)
+        if blocked.any():
+            self._set_velocities(-self.velocities[blocked], blocked)
+            self._move(board, self.velocities * blocked[:, np.newaxis])
 
-        # Make our move. If we're now in the same cell as the player, it's instant
-        # game over!
-        (self._east if self._moving_east else self._west)(board, the_plot)
-        # if self.position == things['P'].position: the_plot.terminate_episode()
-        if self.is_colliding(things['P']): the_plot.terminate_episode()
+        # If any of us is now touching the player, it's instant game over!
+        if self._touching(things['P']).any(): the_plot.terminate_episode()
 
 class GoalDrape(plab_things.LargeDrape, plab_things.ILarge):
     """A `Drape` handling all of the coins.
@@ -172,11 +179,11 @@ class GoalDrape(plab_things.LargeDrape, plab_things.ILarge):
     This Drape detects when a player traverses a coin, removing the coin and
     crediting the player for the collection. Terminates if all coins are gone.
     """
+    NOTES_CURTAIN_CHANGES = True
 
-    def __init__(self, curtain, character):
+    def __init__(self, curtain, character, color):
         """Constructor: list impassables, initialise direction."""
 
-        color = get_color('goal')
         # Example of a 5 x 5 diamond, Key: relative position to center, Value: RGB value
         img = {
                 (-2, -2): color,
@@ -211,9 +218,10 @@ class GoalDrape(plab_things.LargeDrape, plab_things.ILarge):
                     and the_plot['key_count'] > 0:
 
                 the_plot['key_count'] -= 1
-                the_plot.log('Goal reached at {}!'.format(player_pattern_position))
+                the_plot.log('Goal reached at {}!', player_pattern_position)
                 the_plot.add_reward(100)
                 self.curtain[drape_coord[0], drape_coord[1]] = False
+                self._curtain_changed()
                 if not self.curtain.any(): the_plot.terminate_episode()
                 break
 
@@ -222,9 +230,10 @@ class KeyDrape(plab_things.LargeDrape, plab_things.ILarge):
 
     A key is needed to unlock the goal
     """
-    def __init__(self, curtain, character):
+    NOTES_CURTAIN_CHANGES = True
+
+    def __init__(self, curtain, character, color):
         """Constructor: list impassables, initialise direction."""
-        color = get_color('key')
         img = {
             (-1, -2): color,
             (-1, -1): color,
@@ -251,7 +260,7 @@ class KeyDrape(plab_things.LargeDrape, plab_things.ILarge):
 
         for drape_coord in self.drape_list:
             if self.is_colliding(things['P'], drape_coord):
-                the_plot.log('Key collected at {}!'.format(player_pattern_position))
+                the_plot.log('Key collected at {}!', player_pattern_position)
                 the_plot.add_reward(100)
 
                 if 'key_count' not in the_plot:
@@ -259,6 +268,7 @@ class KeyDrape(plab_things.LargeDrape, plab_things.ILarge):
                 the_plot['key_count'] += 1
 
                 self.curtain[drape_coord[0], drape_coord[1]] = False
+                self._curtain_changed()
                 break
 
 class SimpleSymbolWorldEnv(gym.Env):
@@ -282,18 +292,65 @@ class SimpleSymbolWorldEnv(gym.Env):
         stay = -1
 
 
-    def __init__(self):
+    def __init__(self, log_level=plab_logging.INFO, distance_shaping=0.,
+                 field_of_view=False, view_radius=None, observation='board',
+                 num_rays=16, ray_range=GRID_SIZE):
+        ''' log_level: the least important level of message the game logs
+        (see protocols/logging.py); plab_logging.OFF turns logging off.
+        distance_shaping: if nonzero, each step's reward also gets this much
+        for every step the player has come closer to its next target, a key
+        or (holding one) a goal, along the shortest path through the maze.
+        field_of_view: if True, observations show only what the player can
+        see past the walls, out to view_radius cells if that's given; the
+        mask of visible cells is self.visible (see FieldOfViewCropper).
+        observation: 'board' for pycolab Observations, or 'rays' for a dict
+        of the 'distances' to, and the 'characters' of, the first things hit
+        by num_rays rays from the player, going ray_range cells (see
+        RaySensor). In 'rays' mode the RGB board is not painted, so render()
+        shows nothing new; rays already stop at the first thing they hit, so
+        this mode can't be combined with field_of_view '''
+        if observation not in ('board', 'rays'):
+            raise ValueError('observation must be \'board\' or \'rays\', '
+                             'not {!r}'.format(observation))
+        if observation == 'rays' and field_of_view:
+            raise ValueError('field_of_view only applies to \'board\' '
+                             'observations, not \'rays\'')
+        self.log_level = log_level
+        self.observation = observation
+        self._sensor = None
+        self._num_rays = num_rays
+        self._ray_range = ray_range
+        self.distance_shaping = distance_shaping
+        self._field_of_view = (
+            cropping.FieldOfViewCropper('P', radius=view_radius)
+            if field_of_view else None)
         self.actions = SimpleSymbolWorldEnv.Actions
         self.action_space = spaces.Discrete(len(self.actions))
 
-        self.observation_space = spaces.Dict({
-            'image': spaces.Box(
-                low=0,
-                high=255,
-                shape=(GRID_SIZE, GRID_SIZE, 3),
-                dtype='uint8'
-            )
-        })
+        if observation == 'rays':
+            self.observation_space = spaces.Dict({
+                'distances': spaces.Box(
+                    low=0,
+                    high=ray_range,
+                    shape=(num_rays,),
+                    dtype='float32'
+                ),
+                'characters': spaces.Box(
+                    low=0,
+                    high=255,
+                    shape=(num_rays,),
+                    dtype='uint8'
+                )
+            })
+        else:
+            self.observation_space = spaces.Dict({
+                'image': spaces.Box(
+                    low=0,
+                    high=255,
+                    shape=(GRID_SIZE, GRID_SIZE, 3),
+                    dtype='uint8'
+                )
+            })
 
         # Range of possible rewards
         self.reward_range = (0, 1)
@@ -312,17 +369,79 @@ class SimpleSymbolWorldEnv(gym.Env):
 
     def step(self, action):
 
-        obs, reward, discount_factor = self._game_engine.play(action)
-        self.obs = obs
-        return obs, reward, self._game_engine.game_over, None
-
-    def reset(self):
-        reset_colors()
-        init_gameboard = generate_level()
-        self._game_engine = make_game(init_gameboard)
-        self.obs, _, _ = self._game_engine.its_showtime()
-
-        pass
+        self._board, reward, discount_factor = self._game_engine.play(
+            action, rgb=self.observation != 'rays')
+        obs = self.obs = self._observe()
+        if self.distance_shaping:
+            distance = self._target_distance()
+            if distance is not None and self._distance is not None:
+                reward = ((reward or 0) +
+                          self.distance_shaping * (self._distance - distance))
+            self._distance = distance
+        return (obs, reward, self._game_engine.game_over,
+                {'action_mask': self.action_mask})
+
+    def reset(self, seed=None):
+        ''' Start a new episode; with a seed, the level and colours are
+        reproducible (see make_replay_game) '''
+        rng = np.random.RandomState(seed)
+        self.level = generate_level(rng=rng)
+        self._game_engine = make_game(self.level, rng=rng)
+        plab_logging.set_level(self._game_engine.the_plot, self.log_level)
+        self._board = self._game_engine.its_showtime()[0]
+        self._distance = (self._target_distance() if self.distance_shaping
+                          else None)
+        if self._field_of_view is not None:
+            self._field_of_view.set_engine(self._game_engine)
+        if self.observation == 'rays' and self._sensor is None:
+            self._sensor = sensors.RaySensor(
+                self._num_rays, self._ray_range,
+                footprint=self._game_engine.things['P'].img)
+        self.obs = self._observe()
+
+    def _observe(self):
+        ''' What the agent gets to see of the game board '''
+        if self.observation == 'rays':
+            ranges, characters = self._sensor.sense(
+                self._board.symbolic_board,
+                self._game_engine.things['P'].position)
+            return {'distances': ranges, 'characters': characters}
+        if self._field_of_view is not None:
+            return self._field_of_view.crop(self._board)
+        return self._board
+
+    # The motions of the moving actions, in order (see PlayerSprite.update).
+    _ACTION_MOTIONS = np.array([(-1, 0), (1, 0), (0, -1), (0, 1)])
+
+    @property
+    def action_mask(self):
+        ''' Which actions of action_space would do anything: the moves that
+        wouldn't run into a wall, and staying put. Also in step()'s info '''
+        player = self._game_engine.things['P']
+        moves = distances.legal_motions(
+            self._game_engine.the_plot, self._board.symbolic_board,
+            player.position, player.impassable, footprint=player.img,
+            motions=self._ACTION_MOTIONS)
+        return np.append(moves, True)
+
+    @property
+    def visible(self):
+        ''' Mask of the cells the player could see in the last observation,
+        or None without field_of_view '''
+        if self._field_of_view is None: return None
+        return self._field_of_view.visible
+
+    def _target_distance(self):
+        ''' Steps from the player to its nearest next target (see
+        distance_shaping), or None if it can't get to one '''
+        the_plot = self._game_engine.the_plot
+        player = self._game_engine.things['P']
+        targets = '@' if the_plot.get('key_count', 0) > 0 else 'K'
+        field = distances.distance_field(
+            the_plot, self._board.symbolic_board, targets, impassable='#',
+            footprint=player.img)
+        distance = field[player.position]
+        return None if distance == distances.UNREACHABLE else int(distance)
 
     def render(self, mode='rgb_array'):
         if mode == 'rgb_array':
@@ -333,19 +452,31 @@ class SimpleSymbolWorldEnv(gym.Env):
 
 
 
-_color_map = {}
-def get_color(object_name):
-    ''' Generate / retrives a color for a group of entities '''
-    if object_name not in _color_map:
-        color = np.random.randint(0, 256, size=3)  # RGB
-        _color_map[object_name] = color
+def action_masks(envs):
+    ''' The action_masks of many SimpleSymbolWorldEnvs, as one array with a
+    row for each env '''
+    return np.stack([env.action_mask for env in envs])
+
+
+def make_replay_game(level, seed=None):
+    ''' Rebuild the game that SimpleSymbolWorldEnv.reset(seed) made, for
+    replaying recorded episodes (see recording.py). Without a seed, the game
+    plays the same but its colours may differ. Uses no global state, so it's
+    safe to call from several threads at once (see datasets.py). '''
+    rng = np.random.RandomState(seed)
+    # Colours are drawn right after the level is generated, so generating it
+    # again puts rng where reset() had it.
+    if seed is not None: generate_level(rng=rng)
+    return make_game(level, rng=rng)
+
 
-    return _color_map[object_name]
+# The groups of entities that get a colour each, in the order they're drawn.
+_COLOR_NAMES = ('sprite', 'patroller', 'goal', 'key')
 
-def reset_colors():
-    '''Resets color map, used for when a round resets'''
-    global _color_map
-    _color_map = {}
+def make_colors(rng):
+    ''' Draw a random RGB colour for each group of entities from rng, a
+    np.random.RandomState; returns a dict from group name to colour '''
+    return {name: rng.randint(0, 256, size=3) for name in _COLOR_NAMES}
 
 def main(argv=()):
 
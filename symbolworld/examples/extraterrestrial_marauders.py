@@ -31,6 +31,7 @@ from pycolab import ascii_art
 from pycolab import human_ui
 from pycolab import rendering
 from pycolab import things as plab_things
+from pycolab.prefab_parts import drapes as prefab_drapes
 from pycolab.prefab_parts import sprites as prefab_sprites
 
 
@@ -120,7 +121,7 @@ class BunkerDrape(plab_things.Drape):
     the_plot['bunker_hitters'] = [chr(c) for c in board[hits]]
 
 
-class MarauderDrape(plab_things.Drape):
+class MarauderDrape(prefab_drapes.TranslatingDrape):
   """A `Drape` for the marauders descending downward toward the player.
 
   The Marauders all move in lockstep, which makes them an ideal application of
@@ -131,6 +132,9 @@ class MarauderDrape(plab_things.Drape):
   As with `BunkerDrape`, if a laser bolt hits a Marauder, this Drape leaves a
   note about it in the Plot; the bolt's Sprite checks this and removes itself
   from the board if present.
+
+  Since the Marauders move in lockstep, this is a `TranslatingDrape`: moving
+  them all just changes an offset, instead of shifting the whole curtain.
   """
 
   def __init__(self, curtain, character):
@@ -140,27 +144,27 @@ class MarauderDrape(plab_things.Drape):
 
   def update(self, actions, board, layers, backdrop, things, the_plot):
     # Where are the laser bolts? Only bolts from the player kill a Marauder.
-    bolts = np.logical_or.reduce([layers[c] for c in UPWARD_BOLT_CHARS], axis=0)
-    hits = bolts & self.curtain                       # Any hits to Marauders?
-    np.logical_xor(self.curtain, hits, self.curtain)  # If so, zap the marauder...
-    the_plot.add_reward(np.sum(hits)*10)              # ...and supply a reward.
+    bolts = [c for c in UPWARD_BOLT_CHARS if things[c].visible]
+    hits = self._remove_at([things[c].position for c in bolts])  # Zap Marauders
+    the_plot.add_reward(np.sum(hits)*10)               # ...and supply a reward.
     # Save the identities of marauder-striking bolts in the Plot.
-    the_plot['marauder_hitters'] = [chr(c) for c in board[hits]]
+    the_plot['marauder_hitters'] = [c for c, hit in zip(bolts, hits) if hit]
 
     # If no Marauders are left, or if any are sitting on row 10, end the game.
-    if (not self.curtain.any()) or self.curtain[10, :].any():
+    marauders = self.drape_list
+    if (not len(marauders)) or np.any(marauders[:, 0] == 10):
       return the_plot.terminate_episode()  # i.e. return None.
 
     # We move faster if there are fewer Marauders. The odd divisor causes speed
     # jumps to align on the high sides of multiples of 8; so, speed increases as
     # the number of Marauders decreases to 32 (or 24 etc.), not 31 (or 23 etc.).
-    if the_plot.frame % max(1, np.sum(self.curtain)//8.0000001): return
+    if the_plot.frame % max(1, len(marauders)//8.0000001): return
     # If any Marauder reaches either side of the screen, reverse horizontal
     # motion and advance vertically one row.
-    if np.any(self.curtain[:, 0] | self.curtain[:, -1]):
+    if np.any((marauders[:, 1] == 0) | (marauders[:, 1] == board.shape[1] - 1)):
       self._dx = -self._dx
-      self.curtain[:] = np.roll(self.curtain, shift=1, axis=0)
-    self.curtain[:] = np.roll(self.curtain, shift=self._dx, axis=1)
+      self._translate(1, 0)
+    self._translate(0, self._dx)
 
 
 class PlayerSprite(prefab_sprites.MazeWalker):
@@ -187,11 +187,13 @@ def make_game(level, cue_after_teleport,
       MAZE_ART, CUE_ART,
       board_northwest_corner_mark='+', what_lies_beneath=' ')
 
-  walls_kwargs = scrolly_info.kwargs('#')
-  speckle_kwargs = scrolly_info.kwargs('*')
-  teleporter_kwargs = scrolly_info.kwargs('t')
-  left_kwargs = scrolly_info.kwargs('l')
-  right_kwargs = scrolly_info.kwargs('r')
+  # Nothing writes to these Scrollys' curtains, only to their patterns, so the
+  # curtains can be views of the patterns instead of copies.
+  walls_kwargs = dict(scrolly_info.kwargs('#'), curtain_view=True)
+  speckle_kwargs = dict(scrolly_info.kwargs('*'), curtain_view=True)
+  teleporter_kwargs = dict(scrolly_info.kwargs('t'), curtain_view=True)
+  left_kwargs = dict(scrolly_info.kwargs('l'), curtain_view=True)
+  right_kwargs = dict(scrolly_info.kwargs('r'), curtain_view=True)
   player_position = scrolly_info.virtual_position('P')
 
   engine = ascii_art.ascii_art_to_game(
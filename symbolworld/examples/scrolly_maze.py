@@ -217,8 +217,10 @@ def make_game(level):
       board_northwest_corner_mark='+',
       what_lies_beneath=MAZES_WHAT_LIES_BENEATH[level])
 
-  walls_kwargs = scrolly_info.kwargs('#')
-  coins_kwargs = scrolly_info.kwargs('@')
+  # Nothing writes to these Scrollys' curtains, only to their patterns, so the
+  # curtains can be views of the patterns instead of copies.
+  walls_kwargs = dict(scrolly_info.kwargs('#'), curtain_view=True)
+  coins_kwargs = dict(scrolly_info.kwargs('@'), curtain_view=True)
   player_position = scrolly_info.virtual_position('P')
   patroller_a_position = scrolly_info.virtual_position('a')
   patroller_b_position = scrolly_info.virtual_position('b')
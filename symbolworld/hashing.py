@@ -0,0 +1,150 @@
+# Copyright 2017 the pycolab Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Zobrist hashing of pycolab game boards.
+
+A Zobrist hash of a symbolic game board XORs together one 64-bit key for every
+(character, position) pair on the board. Because XOR is its own inverse, the
+hash of a board that differs from another in only a few cells can be computed
+from the other board's hash by XORing out the keys of the old characters in
+those cells and XORing in the keys of the new ones. `Engine.state_hash` uses
+this to keep a hash of the game board, looking only at the cells where the
+engine knows that something may have changed.
+
+The keys are not stored in a table, which would need 256 keys per board cell;
+instead they are computed on demand by a fixed integer mixing function. So,
+hashes are reproducible: two boards with the same shape and contents have the
+same hash, whichever `Engine` rendered them.
+
+Updates are told which cells to look at; without that, finding the changed
+cells takes one vectorised comparison of the old and new boards. Only the
+changed cells are hashed, with Python integers when there are few of them,
+since numpy's per-call overhead would dominate. Unlike `hash()` of the board's
+bytes, which Python salts differently in every process, the hash can be
+compared between processes and saved to disk.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+
+
+def zobrist_hash(symbolic_board):
+  """Compute the Zobrist hash of a symbolic game board from scratch.
+
+  Args:
+    symbolic_board: a 2-D uint8 numpy array, like `Observation.symbolic_board`.
+
+  Returns:
+    the 64-bit hash of `symbolic_board`, as a Python integer.
+  """
+  characters = symbolic_board.ravel()
+  return int(np.bitwise_xor.reduce(
+      _keys(characters, np.arange(characters.size)), dtype=np.uint64))
+
+
+def update_zobrist_hash(board_hash, old_board, new_board, positions=None):
+  """Update a Zobrist hash for changes to a game board.
+
+  Args:
+    board_hash: the hash of `old_board`.
+    old_board: a 2-D uint8 numpy array, the symbolic game board that
+        `board_hash` was computed for. Overwritten with `new_board`, so that
+        the caller can pass it to this function again next time.
+    new_board: a 2-D uint8 numpy array with the same shape as `old_board`.
+    positions: flattened board positions of all of the cells that may have
+        changed, as a sequence or 1-D array of integers; repeats are allowed.
+        If None, the whole boards are compared.
+
+  Returns:
+    the 64-bit hash of `new_board`, as a Python integer.
+
+  Raises:
+    ValueError: `old_board` and `new_board` have different shapes.
+  """
+  if old_board.shape != new_board.shape:
+    raise ValueError('update_zobrist_hash() was asked to compare boards with '
+                     'different shapes {} and {}.'.format(old_board.shape,
+                                                          new_board.shape))
+  old_characters = old_board.reshape(-1)  # A view, so the copy below sticks.
+  new_characters = new_board.ravel()
+  if positions is None:
+    changed = np.flatnonzero(old_characters != new_characters)
+  elif len(positions) <= _MAX_SCALAR_KEYS:
+    # A set drops repeated positions, whose keys would cancel out.
+    for position in set(np.asarray(positions).tolist()):
+      old = old_characters.item(position)
+      new = new_characters.item(position)
+      if old != new:
+        board_hash ^= _key(old, position) ^ _key(new, position)
+        old_characters[position] = new
+    return board_hash
+  else:
+    positions = np.unique(positions)
+    changed = positions[old_characters[positions] != new_characters[positions]]
+  if changed.size > _MAX_SCALAR_KEYS:
+    board_hash ^= int(np.bitwise_xor.reduce(
+        _keys(old_characters[changed], changed) ^
+        _keys(new_characters[changed], changed), dtype=np.uint64))
+  elif changed.size:
+    for old, new, position in zip(old_characters[changed].tolist(),
+                                  new_characters[changed].tolist(),
+                                  changed.tolist()):
+      board_hash ^= _key(old, position) ^ _key(new, position)
+  else:
+    return board_hash
+  old_characters[changed] = new_characters[changed]
+  return board_hash
+
+
+### Private helpers ###
+
+
+# Constants for the splitmix64 finaliser, which gives us our keys. They are
+# numpy scalars so that numpy doesn't promote uint64 arithmetic to float64.
+_GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+_SHIFT_1 = np.uint64(30)
+_SHIFT_2 = np.uint64(27)
+_SHIFT_3 = np.uint64(31)
+_CHARACTER_SHIFT = np.uint64(40)
+_MASK = 2**64 - 1
+
+# Updates that change (or are asked to look at) more cells than this compute
+# their keys with numpy.
+_MAX_SCALAR_KEYS = 32
+
+
+def _keys(characters, positions):
+  """Zobrist keys for characters at flattened board positions (equal shapes)."""
+  keys = characters.astype(np.uint64) << _CHARACTER_SHIFT
+  keys |= positions.astype(np.uint64)
+  keys += _GOLDEN_GAMMA
+  keys ^= keys >> _SHIFT_1
+  keys *= _MIX_1
+  keys ^= keys >> _SHIFT_2
+  keys *= _MIX_2
+  keys ^= keys >> _SHIFT_3
+  return keys
+
+
+def _key(character, position):
+  """Like `_keys`, but for one character and position, as Python integers."""
+  key = ((character << 40 | position) + 0x9E3779B97F4A7C15) & _MASK
+  key = ((key ^ key >> 30) * 0xBF58476D1CE4E5B9) & _MASK
+  key = ((key ^ key >> 27) * 0x94D049BB133111EB) & _MASK
+  return key ^ key >> 31
@@ -22,7 +22,11 @@ import collections
 import copy
 import curses
 import datetime
+import math
 import textwrap
+import timeit
+
+import numpy as np
 
 from pycolab import cropping
 from pycolab.protocols import logging as plab_logging
@@ -37,7 +41,7 @@ class CursesUi(object):
   def __init__(self,
                keys_to_actions, delay=None,
                repainter=None, colour_fg=None, colour_bg=None,
-               croppers=None):
+               croppers=None, max_redraws_per_second=None):
     """Construct and configure a `CursesUi` for pycolab games.
 
     A `CursesUi` object can be used over and over again to play any number of
@@ -66,6 +70,10 @@ class CursesUi(object):
     respectively. Log strings accumulated in the `Plot` object via its `log`
     method are shown in the console.
 
+    To stay quick on large boards, `CursesUi` only redraws the board cells
+    that changed since the last frame, and can limit how often it redraws at
+    all (see `max_redraws_per_second`).
+
     [1]: https://sanctum.geek.nz/arabesque/256-colour-terminals/
 
     Args:
@@ -113,6 +121,10 @@ class CursesUi(object):
           means observations returned by the pycolab game supplied to the `play`
           method should be shown directly instead of cropped. A single None
           value for this argument is a shorthand for `[None]`.
+      max_redraws_per_second: if not None, the game display is redrawn at most
+          this many times a second, no matter how quickly the game steps. A
+          frame whose redraw is put off is drawn once the limit allows, if no
+          newer frame has replaced it by then.
 
     Raises:
       TypeError: if any key in the `keys_to_actions` dict is neither a numerical
@@ -158,6 +170,18 @@ class CursesUi(object):
     # we'll use when we're displaying that character. None for now, since we
     # can't set it up until curses is running.
     self._colour_pair = None
+    # Like _colour_pair, but as an array indexed by codepoint, for looking up
+    # the colour pairs of a whole board at once.
+    self._colour_pair_lut = None
+
+    # The character arrays of the observations now drawn on the screen, and
+    # the leftmost screen columns they start at, so that _display can redraw
+    # just the cells that change. None if nothing is drawn yet.
+    self._drawn = None
+
+    # The shortest time in seconds between two redraws of the game display.
+    self._redraw_interval = (None if max_redraws_per_second is None else
+                             1.0 / max_redraws_per_second)
 
     # If the user specified no croppers or any None croppers, replace them with
     # pass-through croppers that don't do any cropping.
@@ -270,8 +294,16 @@ class CursesUi(object):
     observation, reward, _ = self._game.its_showtime()
     observations = crop_and_repaint(observation)
     self._total_return = reward
+    self._drawn = None
     self._display(
         screen, observations, self._total_return, elapsed=datetime.timedelta())
+    last_redraw = timeit.default_timer()
+    redraw_pending = False  # Is there a frame whose redraw we've put off?
+
+    # When the wait for a keypress times out, giving the game the timeout
+    # "keycode" -1. We keep this deadline ourselves, since we may also stop
+    # waiting early to draw a frame we put off.
+    timeout_at = None if self._delay is None else last_redraw + self._delay / 1e3
 
     # Oh boy, play the game!
     while not self._game.game_over:
@@ -281,10 +313,24 @@ class CursesUi(object):
       # message display) but don't trigger a call to the game engine's play()
       # method. Note that the timeout "keycode" -1 is treated the same as any
       # other keycode here.
+      redraw_at = (last_redraw + self._redraw_interval if redraw_pending
+                   else None)
+      screen.timeout(_wait_ms(timeit.default_timer(), timeout_at, redraw_at))
+
       keycode = screen.getch()
+
+      # If we only woke up to draw a frame we put off, there's no keycode.
+      now = timeit.default_timer()
+      keycode = _woken_keycode(keycode, now, timeout_at)
+      if keycode is not None and self._delay is not None:
+        timeout_at = now + self._delay / 1e3
+
       if keycode == curses.KEY_PPAGE:    # Page Up? Show the game console.
         paint_console = True
       elif keycode == curses.KEY_NPAGE:  # Page Down? Hide the game console.
+        # The console was drawn over the game display, which we only redraw
+        # where it changes, so have curses copy all of the display over again.
+        if paint_console: screen.touchwin()
         paint_console = False
       elif keycode in self._keycodes_to_actions:
         # Convert the keycode to a game action and send that to the engine.
@@ -299,16 +345,23 @@ class CursesUi(object):
           self._total_return += reward
 
       # Update the game display, regardless of whether we've called the game's
-      # play() method.
-      elapsed = datetime.datetime.now() - self._start_time
-      self._display(screen, observations, self._total_return, elapsed)
+      # play() method---unless we've redrawn it too recently, in which case we
+      # put the redraw off.
+      redraw = (self._redraw_interval is None or
+                now - last_redraw >= self._redraw_interval)
+      if redraw:
+        elapsed = datetime.datetime.now() - self._start_time
+        self._display(screen, observations, self._total_return, elapsed)
+        last_redraw = now
+      redraw_pending = not redraw
 
       # Update game console message buffer with new messages from the game.
       self._update_game_console(
-          plab_logging.consume(self._game.the_plot), console, paint_console)
+          plab_logging.consume(self._game.the_plot), console,
+          paint_console and redraw)
 
       # Show the screen to the user.
-      curses.doupdate()
+      if redraw: curses.doupdate()
 
   def _display(self, screen, observations, score, elapsed): # FIXME Game play component, non render related
     """Redraw the game board onto the screen, with elapsed time and score.
@@ -321,26 +374,42 @@ class CursesUi(object):
       elapsed: a `datetime.timedelta` with the total time the player has spent
           playing this game.
     """
-    screen.erase()  # Clear the screen
+    # The characters of each observation, and where on the screen they go.
+    boards = [_characters(observation) for observation in observations]
+    leftmost_columns = np.cumsum(
+        [0] + [board.shape[1] + 3 for board in boards[:-1]])
+
+    # If the layout of the observations has changed since the last frame, or
+    # there wasn't one, clear the screen and draw all of the cells.
+    if (self._drawn is None or len(self._drawn) != len(boards) or
+        any(drawn.shape != board.shape
+            for drawn, board in zip(self._drawn, boards))):
+      screen.erase()
+      self._drawn = [None] * len(boards)
 
     # Display the game clock and the current score.
+    screen.move(0, 0)
+    screen.clrtoeol()
     screen.addstr(0, 2, _format_timedelta(elapsed), curses.color_pair(0))
     screen.addstr(0, 20, 'Score: {}'.format(score), curses.color_pair(0))
 
-    # Display cropped observations side-by-side.
-    leftmost_column = 0
-    for observation in observations:
-      # Display game board rows one-by-one.
-      for row, board_line in enumerate(observation.board, start=1):
-        screen.move(row, leftmost_column)  # Move to start of this board row.
-        # Display game board characters one-by-one. We iterate over them as
-        # integer ASCII codepoints for easiest compatibility with python2/3.
-        for codepoint in six.iterbytes(board_line.tostring()):
-          screen.addch(
-              codepoint, curses.color_pair(self._colour_pair[codepoint]))
-
-      # Advance the leftmost column for the next observation.
-      leftmost_column += observation.board.shape[1] + 3
+    # Display cropped observations side-by-side, redrawing only the cells that
+    # differ from what's on the screen, in runs of cells of the same colour.
+    for i, (board, leftmost_column) in enumerate(zip(boards,
+                                                     leftmost_columns)):
+      colour_pairs = self._colour_pair_lut[board]
+      for row, start, stop in _changed_runs(board, self._drawn[i],
+                                            colour_pairs):
+        try:
+          screen.addstr(row + 1, int(leftmost_column) + start,
+                        board[row, start:stop].tobytes(),
+                        curses.color_pair(int(colour_pairs[row, start])))
+        except curses.error:
+          # Curses complains about writing to the last cell of the screen
+          # (since there's nowhere to put the cursor afterward), but the
+          # character is written anyway.
+          pass
+      self._drawn[i] = board.copy()
 
     # Redraw the game screen (but in the curses memory buffer only).
     screen.noutrefresh()
@@ -400,6 +469,7 @@ class CursesUi(object):
     # The default colour for all characters without colours listed is boring
     # white on black, or "system default", or somesuch.
     self._colour_pair = collections.defaultdict(lambda: 0)
+    self._colour_pair_lut = np.zeros(256, dtype=np.int32)
     # And if the terminal doesn't support true color, that's all you get.
     if not curses.can_change_color(): return
 
@@ -443,6 +513,8 @@ class CursesUi(object):
     # defaultdict.
     self._colour_pair.update(
         {character: pid for pid, character in enumerate(characters, start=1)})
+    for character, pid in six.iteritems(self._colour_pair):
+      self._colour_pair_lut[character] = pid
 
     # Program these color pairs into curses, and that's all there is to do.
     for character, pid in six.iteritems(self._colour_pair):
@@ -463,9 +535,11 @@ class SymbolicCursesUI(CursesUi):
                objects,
                keys_to_actions, delay=None,
                repainter=None,
-               croppers=None):
+               croppers=None,
+               max_redraws_per_second=None):
     colors = self._extract_colors(objects)
-    super().__init__(keys_to_actions, delay, repainter, colour_fg = colors, colour_bg =None, croppers = croppers)
+    super().__init__(keys_to_actions, delay, repainter, colour_fg = colors, colour_bg =None, croppers = croppers,
+                     max_redraws_per_second=max_redraws_per_second)
 
 
   def _extract_colors(self, objects) -> list:
@@ -483,6 +557,76 @@ class SymbolicCursesUI(CursesUi):
 
 
 
+def _characters(observation):
+  """The 2-D array of character codepoints shown for `observation`."""
+  # The board may be a character array or an RGB image; in the latter case,
+  # the characters are in the symbolic board.
+  if observation.board.ndim == 2: return observation.board
+  return observation.symbolic_board
+
+
+def _changed_runs(board, drawn, colour_pairs):
+  """Find runs of changed cells of the same colour in a character array.
+
+  Args:
+    board: 2-D array of character codepoints to draw.
+    drawn: 2-D array of character codepoints already drawn, the same shape as
+        `board`, or None if nothing is drawn yet.
+    colour_pairs: 2-D array of the colour pairs of the cells in `board`.
+
+  Returns:
+    a list of `(row, start, stop)` tuples, one for each run of adjacent cells
+    in a row that have changed and that share a colour pair, covering columns
+    `start` up to but not including `stop`.
+  """
+  changed = (np.ones(board.shape, dtype=np.bool_) if drawn is None else
+             board != drawn)
+  runs = []
+  for row in np.flatnonzero(changed.any(axis=1)):
+    cols = np.flatnonzero(changed[row])
+    pairs = colour_pairs[row, cols]
+    # A run ends at a gap in the changed columns or at a change of colour.
+    breaks = np.flatnonzero((np.diff(cols) != 1) | (pairs[1:] != pairs[:-1]))
+    starts = np.concatenate([[0], breaks + 1])
+    stops = np.concatenate([breaks, [len(cols) - 1]])
+    runs.extend((int(row), int(cols[start]), int(cols[stop]) + 1)
+                for start, stop in zip(starts, stops))
+  return runs
+
+
+def _wait_ms(now, timeout_at, redraw_at):
+  """How long `getch` should wait for a keypress, for `screen.timeout`.
+
+  Args:
+    now: the current time, from `timeit.default_timer`.
+    timeout_at: when the wait should time out with the "keycode" -1, or None
+        if it shouldn't.
+    redraw_at: when to stop waiting to draw a frame that was put off, or None
+        if there isn't one.
+
+  Returns:
+    milliseconds to wait until the earlier of `timeout_at` and `redraw_at`, or
+    -1 to wait for a keypress for as long as it takes.
+  """
+  wake_times = [time for time in (timeout_at, redraw_at) if time is not None]
+  if not wake_times: return -1
+  return max(0, int(math.ceil((min(wake_times) - now) * 1e3)))
+
+
+def _woken_keycode(keycode, now, timeout_at):
+  """The keycode to act on after `getch` returned `keycode` at time `now`.
+
+  `getch` returns -1 when its wait runs out. That's only the timeout "keycode"
+  if the wait ran until `timeout_at`; before then, or if there is no timeout,
+  we stopped waiting to draw a frame that was put off, and there is no keycode.
+
+  Returns:
+    `keycode`, or None if the wait ended early without a keypress.
+  """
+  if keycode == -1 and (timeout_at is None or now < timeout_at): return None
+  return keycode
+
+
 def _format_timedelta(timedelta):
   """Convert timedelta to string, lopping off microseconds."""
   # This approach probably looks awful to all you time nerds, but it will work
@@ -6,7 +6,7 @@ import copy
 import time
 
 import numpy as np
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QImage, QPixmap, QPainter, QColor, QPolygon
 from PyQt5.QtCore import QPoint, QSize, QRect
 from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QTextEdit
@@ -213,11 +213,34 @@ class HumanUIRenderer:
 
 class HumanUI:
 
+    # Without a scale from the user, cells are drawn as large as possible in a
+    # display of about this many pixels along its longest side.
+    DEFAULT_DISPLAY_SIZE = 300
+    # Pixels of black between the observations shown side-by-side.
+    TILE_GAP = 4
+    # Repaints per second when the screen doesn't report its refresh rate, as
+    # on headless and offscreen platforms.
+    DEFAULT_MAX_FPS = 60
+
     def __init__(self, rows, cols,
                  delay,
                  croppers = None,
                  repainter = None,
-                 keys_to_actions = None, ):
+                 keys_to_actions = None,
+                 scale = None,
+                 max_fps = None, ):
+        '''
+        :param scale: width and height in pixels of each board cell on screen;
+            by default, as large as fits the board into DEFAULT_DISPLAY_SIZE
+        :param max_fps: the most times per second the display is repainted;
+            by default, the refresh rate of the screen, or DEFAULT_MAX_FPS if
+            the screen doesn't say. Calls to display that come sooner only
+            update the image in memory, so showing a fast agent doesn't slow
+            it down
+        :raises ValueError: max_fps is not positive
+        '''
+        if max_fps is not None and max_fps <= 0:
+            raise ValueError('max_fps must be positive, not {}'.format(max_fps))
 
         self.rows = rows
         self.cols = cols
@@ -233,6 +256,21 @@ class HumanUI:
         else:
             self._croppers = croppers
 
+        self._scale = (scale if scale is not None else
+                       max(1, self.DEFAULT_DISPLAY_SIZE // max(rows, cols)))
+        self._max_fps = max_fps
+        # Time of the last repaint, for limiting the repaint rate, and whether
+        # a repaint of a frame that came too soon has been scheduled
+        self._last_paint = None
+        self._repaint_pending = False
+
+        # The frame the observations are tiled into, and the QImage and
+        # QPixmap over it; reused from frame to frame while the shapes of the
+        # observations stay the same
+        self._frame = None
+        self._frame_shapes = None
+        self._qimage = None
+        self._pixmap = None
 
     def play(self, game_engine):
         """Play a pycolab game.
@@ -387,86 +425,82 @@ class HumanUI:
           elapsed: a `datetime.timedelta` with the total time the player has spent
               playing this game.
         """
-        #screen.erase()  # Clear the screen
-
-        # Display the game clock and the current score.
-
         # TODO add score information
         ##screen.addstr(0, 2, _format_timedelta(elapsed), curses.color_pair(0))
         ##screen.addstr(0, 20, 'Score: {}'.format(score), curses.color_pair(0))
 
-        # Display cropped observations side-by-side.
-        for observation in observations:
-            # TODO Add "God View" for observations
-            board = observation.board
-            assert board.shape[0] == self.rows
-            assert board.shape[1] == self.cols
-
-            if self.qt_renderer is None:
-                self.qt_renderer = HumanUIRenderer(
-                    width=self.cols * CELL_PIXELS,
-                    height=self.rows * CELL_PIXELS,
-                    ownWindow=True,
-                )
-            r = self.qt_renderer
-
-            # if r.window:
-            #     r.window.setText("Hi I am Yonk")
-            #board = np.transpose(board, (1, 0, 2)).copy()
-            # board = np.ones([50, 50, 3], dtype='uint8')
-            # board[25, 25, 0] = 255
-            qimg = QImage(board, board.shape[1], board.shape[0], board.shape[1] * 3,  QImage.Format_RGB888)
-            pixmap = QPixmap(qimg)
-            pixmap = pixmap.scaled(300, 300, Qt.KeepAspectRatio)
-            r.paintPixmap(pixmap)
-            r.app.processEvents()
-            # r.beginFrame()
-            #
-            # # Render grid
-            # # Total grid size at native scale
-            #
-            # widthPx = self.cols * CELL_PIXELS
-            # heightPx = self.rows * CELL_PIXELS
-            #
-            # r.push()
-            #
-            # r.fillRect(
-            #     0,
-            #     0,
-            #     widthPx,
-            #     heightPx,
-            #     (0,0,0), #black color
-            # )
-            # # Draw grid lines
-            # r.setLineColor(33, 33, 33)
-            # for rowIdx in range(0, self.rows):
-            #     y = CELL_PIXELS * rowIdx
-            #     r.drawLine(0, y, widthPx, y)
-            # for colIdx in range(0, self.cols):
-            #     x = CELL_PIXELS * colIdx
-            #     r.drawLine(x, 0, x, heightPx)
-            #
-            # r.pop()
-            #
-            # # Render each cell
-            # # TODO More efficient rendering, render as bitmap frames
-            # for row, row_data in enumerate(board):
-            #     for cell, color in enumerate(row_data):
-            #         # Highlight the cell
-            #         r.fillRect(
-            #             cell * CELL_PIXELS,
-            #             row * CELL_PIXELS,
-            #             CELL_PIXELS,
-            #             CELL_PIXELS,
-            #             color
-            #         )
-            #
-            # r.endFrame()
-
-            # self._update_console(
-            #     plab_logging.consume(self._game.the_plot))
-
-            return r
+        if self.qt_renderer is None:
+            self.qt_renderer = HumanUIRenderer(
+                width=self.cols * CELL_PIXELS,
+                height=self.rows * CELL_PIXELS,
+                ownWindow=True,
+            )
+            if self._max_fps is None:
+                refresh_rate = self.qt_renderer.app.primaryScreen().refreshRate()
+                self._max_fps = (refresh_rate if refresh_rate > 0
+                                 else self.DEFAULT_MAX_FPS)
+        r = self.qt_renderer
+
+        # Display cropped observations side-by-side, upscaled into one frame.
+        # TODO Add "God View" for observations
+        self._tile(observations)
+
+        # Only repaint the window as often as it can be shown. A frame that
+        # comes too soon is painted when the interval is up, unless a newer
+        # one has been painted by then, so the last frame always gets shown
+        now = time.monotonic()
+        wait = (0. if self._last_paint is None else
+                self._last_paint + 1.0 / self._max_fps - now)
+        if wait <= 0:
+            self._paint()
+        elif not self._repaint_pending:
+            self._repaint_pending = True
+            QTimer.singleShot(int(np.ceil(wait * 1000)), self._paint)
+        r.app.processEvents()
+
+        # self._update_console(
+        #     plab_logging.consume(self._game.the_plot))
+
+        return r
+
+    def _paint(self):
+        '''
+        Copies the frame into the window, if the window is still open
+        '''
+        self._repaint_pending = False
+        self._last_paint = time.monotonic()
+        if self.qt_renderer is None or self.qt_renderer.window is None:
+            return
+        self._pixmap.convertFromImage(self._qimage)
+        self.qt_renderer.window.setPixmap(self._pixmap)
+
+    def _tile(self, observations):
+        '''
+        Upscales the RGB boards of observations by nearest neighbour into the
+        frame behind self._qimage, side-by-side, reallocating the frame only
+        when the shapes of the boards have changed
+        :param observations: list of rendering.Observation
+        '''
+        shapes = [observation.board.shape[:2] for observation in observations]
+        if shapes != self._frame_shapes:
+            height = max(rows for rows, _ in shapes) * self._scale
+            width = (sum(cols for _, cols in shapes) * self._scale +
+                     (len(shapes) - 1) * self.TILE_GAP)
+            self._frame = np.zeros((height, width, 3), dtype=np.uint8)
+            self._frame_shapes = shapes
+            # The QImage reads self._frame directly, so must not outlive it
+            self._qimage = QImage(self._frame.data, width, height, width * 3,
+                                  QImage.Format_RGB888)
+            self._pixmap = QPixmap(width, height)
+
+        left = 0
+        for observation, (rows, cols) in zip(observations, shapes):
+            tile = self._frame[:rows * self._scale,
+                               left:left + cols * self._scale]
+            # Each board cell fills a scale x scale block of the tile
+            blocks = tile.reshape(rows, self._scale, cols, self._scale, 3)
+            np.copyto(blocks, observation.board[:, np.newaxis, :, np.newaxis, :])
+            left += cols * self._scale + self.TILE_GAP
 
     def _update_console(self, messagees):
         '''
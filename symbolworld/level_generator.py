@@ -10,14 +10,22 @@ _C_ADVERSARY = ord('a')
 _C_GOAL = ord('@')
 _C_KEY = ord('K')
 
-def generate_level(seed=None):
-    np.random.seed(seed)
-    gridsize = sample(GRID_SIZE, GRID_SIZE_VAR)
+def generate_level(seed=None, grid_size=None, num_adversaries=None,
+                   rng=None):
+    ''' Generate a random level; grid_size and num_adversaries override
+    config.GRID_SIZE and config.NUM_ADVERSARIES. Randomness comes from rng,
+    a np.random.RandomState, if given, or else from a new one made with seed;
+    the global np.random is left alone, so levels can be made in parallel '''
+    if rng is None: rng = np.random.RandomState(seed)
+    gridsize = sample(GRID_SIZE if grid_size is None else grid_size,
+                      GRID_SIZE_VAR, rng)
     grid = np.ones((gridsize, gridsize), dtype='int8')
     grid *= _C_BACKGROUND
 
-    numgoals = sample(NUM_GOALS, NUM_GOALS_VAR)
-    numadversaries = sample(NUM_ADVERSARIES, NUM_ADVERSARIES_VAR)
+    numgoals = sample(NUM_GOALS, NUM_GOALS_VAR, rng)
+    numadversaries = sample(
+        NUM_ADVERSARIES if num_adversaries is None else num_adversaries,
+        NUM_ADVERSARIES_VAR, rng)
 
     # Generate bounding wall
     grid[0, :] = _C_WALLS
@@ -30,7 +38,7 @@ def generate_level(seed=None):
         ''' Try and place and object on to the board '''
 
         # Sample 100 coordinates to try
-        potential_coords = np.random.randint(0, gridsize+1, size=(100, 2))
+        potential_coords = rng.randint(0, gridsize+1, size=(100, 2))
         for row , col in potential_coords: # Try to place object 100 times
             if is_safe_to_place(grid, row, col):
                 return row, col
@@ -84,18 +92,19 @@ def is_safe_to_place(grid, row, col):
 
 def np2str(grid):
 
-    return [ "".join([chr(char) for char in row]) for row in grid]
+    return [row.tobytes().decode('ascii') for row in grid.astype(np.uint8)]
 
 
-def sample(mean, var):
+def sample(mean, var, rng=np.random):
     '''
     Uniformly samples from (mean - var) to (mean + var)
     :param mean: mean
     :param var: var
+    :param rng: the np.random.RandomState to sample with
     :return:
     '''
     assert mean - var >= 0, 'Variance cannot be greater than mean'
-    return np.random.randint(mean-var, mean+var + 1)
+    return rng.randint(mean-var, mean+var + 1)
 
 
 if __name__ == '__main__':
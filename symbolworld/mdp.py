@@ -0,0 +1,149 @@
+# Copyright 2017 the pycolab Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Export small deterministic pycolab games as tabular MDPs.
+
+For games with few enough states, planning algorithms like value iteration are
+much faster when they work on arrays rather than on a game engine. This module
+explores every state of a game that can be reached from its first frame, using
+`Engine.snapshot` and `Engine.restore` to branch on every action, and returns
+the resulting transition table as dense numpy arrays:
+
+    engine = make_my_game()
+    table = mdp.transition_table(engine, actions=[0, 1, 2, 3])
+    values = np.zeros(len(table.terminal))
+    for _ in range(100):  # Value iteration, entirely in numpy.
+      q = table.rewards + 0.9 * values[table.transitions] * ~table.terminal[
+          table.transitions]
+      values = np.where(table.terminal, 0.0, q.max(axis=1))
+
+The game must be deterministic: playing an action in a state must always lead
+to the same next state with the same reward.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+
+import numpy as np
+
+
+class TransitionTable(
+    collections.namedtuple('TransitionTable',
+                           ['transitions', 'rewards', 'terminal', 'keys'])):
+  """The transition table of a deterministic game with `S` states, `A` actions.
+
+  States are numbered in the order in which they were first reached by a
+  breadth-first search; state 0 is the game's first frame. There are four
+  members:
+
+  * `transitions`: an `(S, A)` integer array; `transitions[s, a]` is the state
+    reached by playing the `a`th action in state `s`. Terminal states lead to
+    themselves.
+  * `rewards`: an `(S, A)` float array; `rewards[s, a]` is the reward for
+    playing the `a`th action in state `s`. Rewards of None count as 0.0, as
+    do all rewards in terminal states.
+  * `terminal`: an `(S,)` bool array; True for states where the game is over.
+  * `keys`: a list of the `S` state keys computed by `state_key`.
+  """
+  __slots__ = ()
+
+
+def default_state_key(engine):
+  """Identify a game state by its board, sprite positions, and `game_over`.
+
+  This key captures everything that is visible on the game board, but nothing
+  that is hidden inside game entities or the `Plot` (like the frame number, or
+  the direction that a patrolling sprite is going). If that hidden state
+  matters to your game, supply a `state_key` of your own to `transition_table`.
+
+  Args:
+    engine: a pycolab `Engine` in play.
+
+  Returns:
+    a hashable key for the current state of `engine`.
+  """
+  positions = tuple(
+      (character, tuple(getattr(thing, 'virtual_position', thing.position)))
+      for character, thing in sorted(engine.things.items())
+      if hasattr(thing, 'position'))
+  return (engine.board.symbolic_board.tobytes(), positions, engine.game_over)
+
+
+def transition_table(engine, actions, state_key=default_state_key,
+                     max_states=100000):
+  """Compute the transition table of a small deterministic game.
+
+  Args:
+    engine: a pycolab `Engine` in play, i.e. whose `its_showtime` method has
+        been called. Its current state is the first state of the table. The
+        engine is left in an arbitrary state.
+    actions: a sequence of the `A` actions to try in every state.
+    state_key: a callable that takes `engine` and returns a hashable key that
+        identifies its current state; two states are the same state if and only
+        if they have equal keys. See `default_state_key`.
+    max_states: the exploration gives up if it finds more states than this.
+
+  Returns:
+    a `TransitionTable`.
+
+  Raises:
+    RuntimeError: the game has more than `max_states` reachable states.
+  """
+  keys = [state_key(engine)]
+  index_of = {keys[0]: 0}
+  snapshots = [engine.snapshot()]
+  terminal = [engine.game_over]
+  transitions = []
+  rewards = []
+
+  # Breadth-first search: the list of snapshots is the queue.
+  state = 0
+  while state < len(snapshots):
+    if terminal[state]:
+      transitions.append([state] * len(actions))
+      rewards.append([0.0] * len(actions))
+      state += 1
+      continue
+
+    next_states = []
+    next_rewards = []
+    for action in actions:
+      engine.restore(snapshots[state])
+      _, reward, _ = engine.play(action)
+      key = state_key(engine)
+      if key not in index_of:
+        if len(keys) >= max_states:
+          raise RuntimeError(
+              'transition_table found more than the maximum of {} states in '
+              'this game.'.format(max_states))
+        index_of[key] = len(keys)
+        keys.append(key)
+        snapshots.append(engine.snapshot())
+        terminal.append(engine.game_over)
+      next_states.append(index_of[key])
+      next_rewards.append(0.0 if reward is None else float(reward))
+
+    transitions.append(next_states)
+    rewards.append(next_rewards)
+    state += 1
+
+  num_actions = len(actions)
+  return TransitionTable(
+      transitions=np.array(transitions, dtype=np.int64).reshape(-1, num_actions),
+      rewards=np.array(rewards, dtype=np.float64).reshape(-1, num_actions),
+      terminal=np.array(terminal, dtype=bool),
+      keys=keys)
@@ -225,7 +225,7 @@ class Plot(dict):
     else:
       self._engine_directives.summed_reward += reward
 
-  def log(self, message):
+  def log(self, message, *args, **kwargs):
     """Log a message for eventual disposal by the game engine user.
 
     Here, "game engine user" means a user interface or an environment interface,
@@ -240,9 +240,13 @@ class Plot(dict):
     `log` function in that module.)
 
     Args:
-      message: A string message to convey to the game engine user.
+      message: A string message to convey to the game engine user, or a format
+          string for `args`, which is formatted only if the message is consumed.
+      *args: Arguments for formatting `message`.
+      **kwargs: Only `level`, the importance of the message, e.g.
+          `plab_logging.DEBUG`; by default, `plab_logging.INFO`.
     """
-    plab_logging.log(self, message)
+    plab_logging.log(self, message, *args, **kwargs)
 
   def change_default_discount(self, discount):
     """Change the discount reported by the `Engine` for non-terminal steps.
@@ -147,6 +147,18 @@ class Scrolly(things.Drape):
   occur. (If scrolling is still desired, it could be that the behaviour evinced
   by specifying `None` for the constructor's `scroll_margins` parameter will
   produce the intended behavior; refer to the constructor docstring.)
+
+  ## Curtains that are views of the pattern
+
+  By default, a `Scrolly` copies the visible part of its pattern into its
+  curtain whenever it considers scrolling, i.e. at every game iteration. With
+  `curtain_view=True`, the curtain is instead a read-only view of the visible
+  part of the pattern, so nothing is copied at all, and changes to the
+  pattern (like a coin being taken) show up in the curtain right away. The
+  catch is that the curtain can't be changed on its own: changes must be made
+  to `whole_pattern`, and writing to the curtain raises a `ValueError`. Code
+  that keeps a reference to the curtain between game iterations should get it
+  anew from the `curtain` attribute instead, since scrolling replaces it.
   """
 
   # Predefined single-step motions, for internal use only. Positive values in
@@ -292,7 +304,7 @@ class Scrolly(things.Drape):
 
   def __init__(self, curtain, character, board_shape,
                whole_pattern, board_northwest_corner,
-               scroll_margins=(2, 3), scrolling_group=''):
+               scroll_margins=(2, 3), scrolling_group='', curtain_view=False):
     """Superclass constructor for `Scrolly`-derived classes.
 
     `Scrolly` does not define `Drape.update`, so this constructor will fail
@@ -322,6 +334,8 @@ class Scrolly(things.Drape):
           scrolling will ever occur!
       scrolling_group: the scrolling group that this `Scrolly` should
           participate in, if not the default (`''`).
+      curtain_view: if True, the curtain is a read-only view of the visible
+          part of `whole_pattern` instead of a copy; see the class docstring.
 
     Raises:
       ValueError: any dimension of `board_shape` is larger than the
@@ -335,6 +349,7 @@ class Scrolly(things.Drape):
     self._board_shape = board_shape
     self._northwest_corner = board_northwest_corner
     self._scrolling_group = scrolling_group
+    self._curtain_view = curtain_view
     # We own this pattern now, and nobody should change our reference to it.
     self._w_h_o_l_e_p_a_t_t_e_r_n = whole_pattern
 
@@ -444,6 +459,13 @@ class Scrolly(things.Drape):
     """Retrieve the scrolling game world pattern managed by this `Scrolly`."""
     return self._w_h_o_l_e_p_a_t_t_e_r_n
 
+  def __setstate__(self, state):
+    """Restore this `Scrolly` after copying or unpickling."""
+    self.__dict__.update(state)
+    # Copying a view copies its data, too, so the copied curtain isn't a view
+    # of the copied pattern anymore. Make a new one that is.
+    if self._curtain_view: self._update_curtain()
+
   ### Protected helpers (final, do not override) ###
 
   def _northwest(self, the_plot):
@@ -687,9 +709,361 @@ class Scrolly(things.Drape):
          (sprite_new_col >= self._margin_east)))
 
   def _update_curtain(self):
-    """Update this `Scrolly`'s curtain by copying data from the pattern."""
+    """Update this `Scrolly`'s curtain from the visible part of the pattern."""
     rows = slice(self._northwest_corner[0],
                  self._northwest_corner[0] + self._board_shape[0])
     cols = slice(self._northwest_corner[1],
                  self._northwest_corner[1] + self._board_shape[1])
-    np.copyto(self.curtain, self.whole_pattern[rows, cols])
+    if self._curtain_view:
+      curtain = self.whole_pattern[rows, cols]
+      curtain.flags.writeable = False
+      self._c_u_r_t_a_i_n = curtain
+    else:
+      np.copyto(self.curtain, self.whole_pattern[rows, cols])
+
+
+class _ListedInstances(object):
+  """Mixin for `Drape`s that keep their instances in a list, not the curtain.
+
+  The `drape_list` of instance locations on the board is computed by
+  `_locate_instances` and cached, and the curtain is only repainted from it
+  when someone accesses `curtain` after a change. Repainting only visits the
+  cells of the old and new `drape_list`s, not the whole curtain. Subclasses
+  call `_changed` whenever their instances change, so that both are brought up
+  to date and `curtain_version` changes.
+  """
+
+  NOTES_CURTAIN_CHANGES = True
+
+  # Cached drape_list, whether the curtain needs repainting, and the locations
+  # that are True on the curtain (None if they're just the starting ones).
+  _drape_list = None
+  _curtain_is_stale = False
+  _painted_list = None
+
+  @property
+  def curtain(self):
+    """The curtain, repainted first if it's out of date."""
+    if self._curtain_is_stale:
+      curtain = self._c_u_r_t_a_i_n
+      if self._painted_list is None:
+        curtain.fill(False)
+      else:
+        curtain[self._painted_list[:, 0], self._painted_list[:, 1]] = False
+      drape_list = self.drape_list
+      curtain[drape_list[:, 0], drape_list[:, 1]] = True
+      self._painted_list = drape_list
+      self._curtain_is_stale = False
+    return self._c_u_r_t_a_i_n
+
+  @property
+  def drape_list(self):
+    """Board locations of the instances on the board, as a read-only array."""
+    if self._drape_list is None:
+      self._drape_list = self._locate_instances()
+      self._drape_list.setflags(write=False)
+    return self._drape_list
+
+  def _locate_instances(self):
+    """Compute the board locations of the instances, as a (N, 2) array."""
+    raise NotImplementedError()
+
+  def _changed(self):
+    """Note that the instances have changed, so the caches are out of date."""
+    self._drape_list = None
+    self._curtain_is_stale = True
+    self._curtain_changed()
+
+
+class TranslatingDrape(_ListedInstances, things.Drape):
+  """A base class for `Drape`s whose instances all move together.
+
+  Some `Drape`s are a group of identical instances that move in lockstep, like
+  the descending rows of aliens in a certain classic arcade game. Moving such a
+  `Drape` by shifting its whole curtain costs time proportional to the size of
+  the board on every move. A `TranslatingDrape` instead keeps its instances in
+  a fixed pattern---initially, the curtain supplied to the constructor---and
+  an offset from that pattern to the board. Moving all of the instances with
+  `_translate` just changes the offset.
+
+  The curtain is only brought up to date when it's needed, i.e. when someone
+  accesses `curtain` after a change. The `drape_list` of instance locations on
+  the board is likewise cached. Instances moved off the edge of the board are
+  not shown (there's no wrapping around), but still exist, and appear again if
+  they are moved back onto the board.
+
+  Subclasses should not write to the curtain, since any changes would be
+  overwritten. To remove instances, use `_remove_at` or `_remove_masked`,
+  which update the pattern and the instance list together.
+
+  `TranslatingDrape` does not define `Drape.update`, so you'll need to make a
+  subclass.
+  """
+
+  def __init__(self, curtain, character):
+    """Superclass constructor for `TranslatingDrape`-derived classes.
+
+    Args:
+      curtain: required by `Drape`. The instances of this `Drape` are at the
+          `True` locations of this curtain, to begin with.
+      character: required by `Drape`.
+    """
+    super(TranslatingDrape, self).__init__(curtain, character)
+    # Locations of all instances relative to the pattern, as a (N, 2) array.
+    # The pattern is only kept in this form.
+    self._instances = np.argwhere(curtain)
+    # Offset from pattern locations to board locations.
+    self._offset = (0, 0)
+
+  @property
+  def offset(self):
+    """Row, column offset of the instances from where they started."""
+    return self._offset
+
+  @property
+  def num_instances(self):
+    """The number of instances, including any that are off of the board."""
+    return len(self._instances)
+
+  ### Protected helpers (final, do not override) ###
+
+  def _translate(self, rows, cols):
+    """Move all instances by `rows` rows and `cols` columns."""
+    self._offset = (self._offset[0] + rows, self._offset[1] + cols)
+    self._changed()
+
+  def _remove_at(self, positions):
+    """Remove the instances at some board locations, if there are any.
+
+    Args:
+      positions: a sequence of row, column locations on the board, like the
+          `position`s of `Sprite`s. Locations off the board are allowed.
+
+    Returns:
+      a 1-D boolean array that is True for each location in `positions` where
+      there was an instance.
+    """
+    positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+    hits = np.zeros(len(positions), dtype=np.bool_)
+    if not len(positions) or not len(self._instances): return hits
+    # Compare flat indices of pattern locations; the cols of the flattening
+    # just have to be wider than the spread of all the locations involved.
+    pattern_positions = positions - self._offset
+    both = np.concatenate([self._instances, pattern_positions])
+    low = both.min(axis=0)
+    width = both[:, 1].max() - low[1] + 1
+    flatten = lambda locations: ((locations[:, 0] - low[0]) * width +
+                                 locations[:, 1] - low[1])
+    instances_flat = flatten(self._instances)
+    positions_flat = flatten(pattern_positions)
+    hits = np.isin(positions_flat, instances_flat)
+    if hits.any():
+      self._instances = self._instances[
+          ~np.isin(instances_flat, positions_flat[hits])]
+      self._changed()
+    return hits
+
+  def _remove_masked(self, mask):
+    """Remove the instances at the `True` locations of a board-shaped mask.
+
+    Args:
+      mask: a 2-D `np.bool_` array the same shape as the board.
+
+    Returns:
+      the number of instances removed.
+    """
+    return int(self._remove_at(np.argwhere(mask)).sum())
+
+  ### Private helpers (do not call; final, do not override) ###
+
+  def _locate_instances(self):
+    """Board locations of the instances that are on the board."""
+    rows, cols = self._c_u_r_t_a_i_n.shape
+    locations = self._instances + self._offset
+    on_board = ((locations[:, 0] >= 0) & (locations[:, 0] < rows) &
+                (locations[:, 1] >= 0) & (locations[:, 1] < cols))
+    return locations[on_board]
+
+
+class SpriteSwarm(_ListedInstances, things.LargeDrape):
+  """A base class for many identical actors that share one character.
+
+  Games with many adversaries that all look and behave alike could make one
+  `Sprite` for each, but each `Sprite` needs its own character and its own
+  Python `update`, and checking the motion of each one pixel by pixel is slow.
+  A `SpriteSwarm` is instead a single `Drape` whose members share a character
+  and an image (a "footprint", like that of a `LargerObject`), and whose
+  positions, velocities and alive flags are kept in numpy arrays. Moving the
+  whole swarm, checking for walls, and checking for contact with other
+  entities are each one vectorised operation, however many members there are.
+
+  The members of a `SpriteSwarm` start out at the `True` locations of the
+  curtain supplied to the constructor, i.e. wherever the swarm's character
+  appears in the game's ASCII art. They are painted by stamping the image at
+  the position of each live member on the board (see `drape_list`), and the
+  curtain is brought up to date only when it's accessed after a change.
+  Subclasses should not write to the curtain, since any changes would be
+  overwritten; use the protected helpers below instead.
+
+  Motion works like that of a `MazeWalker` whose `confined_to_board` argument
+  is True: a member can't move if its footprint at its new position would
+  cover an impassable character or leave the board. Unlike a `MazeWalker`,
+  diagonal motions are only checked at the destination, and members don't
+  take part in the scrolling protocol.
+
+  `SpriteSwarm` does not define `Drape.update`, so you'll need to make a
+  subclass.
+  """
+
+  def __init__(self, img, curtain, character, impassable):
+    """Superclass constructor for `SpriteSwarm`-derived classes.
+
+    Args:
+      img: the image of each member, as for `LargeDrape`: a dict mapping
+          row, column offsets from a member's position to RGB colours.
+      curtain: required by `Drape`. The swarm has a member at each `True`
+          location of this curtain, to begin with.
+      character: required by `Drape`.
+      impassable: an indexable of ASCII characters that members cannot
+          traverse. A string value containing these characters works.
+
+    Raises:
+      ValueError: `impassable` contains the character that represents this
+          `SpriteSwarm` on the game board.
+    """
+    super(SpriteSwarm, self).__init__(img, curtain, character)
+    if character in impassable:
+      raise ValueError('A SpriteSwarm must not designate its own character {} '
+                       'as impassable.'.format(repr(character)))
+    self._impassable = np.array([ord(c) for c in impassable], dtype=np.uint8)
+
+    # Offsets of the cells of each member's footprint from its position, and
+    # the offsets to check for obstructions: those plus the position itself.
+    self._footprint = np.array(sorted(img), dtype=np.int64).reshape(-1, 2)
+    self._obstruction_offsets = np.unique(
+        np.concatenate([self._footprint, [[0, 0]]]), axis=0)
+
+    self._positions = np.argwhere(curtain)
+    self._velocities = np.zeros_like(self._positions)
+    self._alive = np.ones(len(self._positions), dtype=np.bool_)
+
+  @property
+  def positions(self):
+    """Positions of all members, dead or alive, as a read-only (N, 2) array."""
+    return _read_only(self._positions)
+
+  @property
+  def velocities(self):
+    """Velocities of all members as a read-only (N, 2) array; see `_move`."""
+    return _read_only(self._velocities)
+
+  @property
+  def alive(self):
+    """Which members are alive, as a read-only (N,) boolean array."""
+    return _read_only(self._alive)
+
+  ### Protected helpers (final, do not override) ###
+
+  def _set_velocities(self, velocities, members=slice(None)):
+    """Set the velocities of some or all members.
+
+    Args:
+      velocities: a row, column motion for all of the chosen members, or an
+          array of motions, one for each of them.
+      members: an index selecting members, e.g. a boolean array of the
+          swarm's length; by default, all members.
+    """
+    self._velocities[members] = velocities
+
+  def _move(self, board, motions=None):
+    """Move the live members, except those whose way is obstructed.
+
+    Args:
+      board: a 2-D numpy array with dtype `uint8` containing the completely
+          rendered game board from the last board repaint.
+      motions: an array of row, column motions, one for each member, or a
+          single motion for all of them; by default, `velocities`.
+
+    Returns:
+      a 1-D boolean array that is True for each live member that tried to move
+      but was obstructed.
+    """
+    if motions is None:
+      motions = self._velocities
+    else:
+      motions = np.broadcast_to(np.asarray(motions, dtype=np.int64),
+                                self._positions.shape)
+    movers = self._alive & motions.any(axis=1)
+    blocked = np.zeros(len(self._positions), dtype=np.bool_)
+    if not movers.any(): return blocked
+
+    blocked[movers] = self._obstructed(board,
+                                       self._positions[movers] + motions[movers])
+    moved = movers & ~blocked
+    if moved.any():
+      self._positions[moved] += motions[moved]
+      self._changed()
+    return blocked
+
+  def _kill(self, members):
+    """Remove members from the game board for good.
+
+    Args:
+      members: an index selecting members, e.g. a boolean array of the
+          swarm's length.
+    """
+    self._alive[members] = False
+    self._changed()
+
+  def _touching(self, entity):
+    """Find the live members whose footprints overlap an `ILarge` entity's.
+
+    Args:
+      entity: an `ILarge` game entity with a single location, like a
+          `LargerObject`.
+
+    Returns:
+      a 1-D boolean array that is True for each live member touching `entity`.
+    """
+    # Compare flat board indices of the footprint cells; cells off the board
+    # get an index that matches nothing.
+    rows, cols = self._c_u_r_t_a_i_n.shape
+    covered = [row * cols + col for row, col in entity.absimg()
+               if 0 <= row < rows and 0 <= col < cols]
+    cells, on_board = self._cells(self._positions, self._footprint)
+    cells_flat = np.where(on_board, cells[:, :, 0] * cols + cells[:, :, 1], -1)
+    return np.isin(cells_flat, covered).any(axis=1) & self._alive
+
+  ### Private helpers (do not call; final, do not override) ###
+
+  def _obstructed(self, board, positions):
+    """Which of the members at `positions` would be obstructed there."""
+    cells, on_board = self._cells(positions, self._obstruction_offsets)
+    obstructed = ~on_board
+    obstructed[on_board] = np.isin(
+        board[cells[on_board][:, 0], cells[on_board][:, 1]], self._impassable)
+    return obstructed.any(axis=1)
+
+  def _cells(self, positions, offsets):
+    """Board cells at `offsets` from each of `positions`, and which are on it.
+
+    Returns:
+      a 2-tuple: a (N, K, 2) array of the cells at the K `offsets` from each
+      of the N `positions`, and a (N, K) boolean array that is True for those
+      cells that are on the game board.
+    """
+    cells = positions[:, np.newaxis, :] + offsets[np.newaxis, :, :]
+    on_board = np.all((cells >= 0) & (cells < self._c_u_r_t_a_i_n.shape),
+                      axis=2)
+    return cells, on_board
+
+  def _locate_instances(self):
+    """Positions of the live members."""
+    return self._positions[self._alive]
+
+
+def _read_only(array):
+  """A read-only view of `array`."""
+  view = array.view()
+  view.setflags(write=False)
+  return view
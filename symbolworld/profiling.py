@@ -0,0 +1,210 @@
+# Copyright 2017 the pycolab Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Timing the insides of a pycolab game, frame by frame.
+
+When a game runs slowly, a `Profiler` can tell you which part of it is to
+blame. Give one to the `Engine` before (or during) play:
+
+    profiler = profiling.Profiler()
+    engine.set_profiler(profiler)
+    ...  # Play the game for a while.
+    print(profiler.format_report(frames=100))
+
+For each frame, the `Engine` records how long these things took:
+
+* `'frame'`: the entire game iteration.
+* `'backdrop'`: the `Backdrop`'s `update` method.
+* `'update/X'`: the `update` method of the `Sprite` or `Drape` with character
+  `X`.
+* `'group/G'`: the update group `G`, including the `update` methods of all of
+  its members and the rendering that follows them.
+* `'render'`: all renderings of the game board.
+* `'apply_and_clear_plot'`: applying the directives in the `Plot` object.
+
+The `Profiler` keeps these times for the last `window` frames only, so a long
+game will not use more and more memory. Engines with no `Profiler` do no
+timing at all.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import timeit
+
+import numpy as np
+import six
+
+
+class FrameTimeStats(
+    collections.namedtuple('FrameTimeStats',
+                           ['mean', 'p50', 'p99', 'max', 'share'])):
+  """Statistics for the time that one part of a game took each frame.
+
+  All times are in seconds. `share` is the fraction of the mean frame time
+  that this part accounts for (so, 1.0 for `'frame'`). Note that the shares of
+  the entries in a report add up to more than 1.0, since some parts contain
+  others: update groups contain `update`s and renderings, for example.
+  """
+  __slots__ = ()
+
+
+class Profiler(object):
+  """Collects per-frame timings of the parts of a pycolab game.
+
+  See the module docstring for what the `Engine` records, and under what
+  names. Game code is welcome to time its own parts with `add`, too.
+  """
+
+  def __init__(self, window=1000, timer=timeit.default_timer):
+    """Construct a `Profiler`.
+
+    Args:
+      window: number of most recent frames whose timings are kept.
+      timer: a callable returning the current time in seconds.
+
+    Raises:
+      ValueError: `window` is less than 1.
+    """
+    if window < 1:
+      raise ValueError('A Profiler window must be at least one frame long, not '
+                       '{}.'.format(window))
+    self._window = window
+    self._timer = timer
+    # Time accumulated under each name during the current frame.
+    self._current = collections.defaultdict(float)
+    # A ring buffer of per-frame times for each name, in order of first use.
+    self._rings = collections.OrderedDict()
+    # Number of frames ended so far.
+    self._frames = 0
+
+  @property
+  def timer(self):
+    """The callable that this `Profiler` (and the `Engine`) uses to tell time."""
+    return self._timer
+
+  @property
+  def frames(self):
+    """The number of frames whose timings are available, at most `window`."""
+    return min(self._frames, self._window)
+
+  def add(self, name, seconds):
+    """Add `seconds` to the time spent on `name` during the current frame."""
+    self._current[name] += seconds
+
+  def end_frame(self):
+    """Store the current frame's timings and begin a new frame."""
+    for name in self._current:
+      if name not in self._rings:
+        self._rings[name] = np.zeros(self._window)
+    index = self._frames % self._window
+    for name, ring in six.iteritems(self._rings):
+      ring[index] = self._current.get(name, 0.0)
+    self._current.clear()
+    self._frames += 1
+
+  def reset(self):
+    """Forget all timings."""
+    self._current.clear()
+    self._rings.clear()
+    self._frames = 0
+
+  def frame_times(self, name, frames=None):
+    """Time spent on `name` in each of the last `frames` frames.
+
+    Args:
+      name: a name as described in the module docstring.
+      frames: how many of the most recent frames to return times for; by
+          default, all available frames.
+
+    Returns:
+      a 1-D float array of times in seconds, oldest first, with one entry per
+      frame. Frames before `name` was first timed count as zero time.
+
+    Raises:
+      KeyError: nothing has ever been timed under `name`.
+    """
+    ring = self._rings[name]
+    frames = self._clip_frames(frames)
+    indices = np.arange(self._frames - frames, self._frames) % self._window
+    return ring[indices]
+
+  def histogram(self, name, frames=None, bins=None):
+    """A histogram of the time spent on `name` in each of the last frames.
+
+    Args:
+      name: a name as described in the module docstring.
+      frames: how many of the most recent frames to include; by default, all
+          available frames.
+      bins: histogram bin edges in seconds. The default bins are logarithmic,
+          with four bins per decade from one microsecond to ten seconds.
+          Frame times outside of the bins are not counted.
+
+    Returns:
+      a 2-tuple: the count of frames in each bin, and the bin edges, as from
+      `np.histogram`.
+
+    Raises:
+      KeyError: nothing has ever been timed under `name`.
+    """
+    if bins is None: bins = _DEFAULT_BINS
+    return np.histogram(self.frame_times(name, frames), bins=bins)
+
+  def report(self, frames=None):
+    """Statistics for everything timed over the last `frames` frames.
+
+    Args:
+      frames: how many of the most recent frames to summarise; by default, all
+          available frames.
+
+    Returns:
+      an `OrderedDict` mapping names (see the module docstring) to
+      `FrameTimeStats`, starting with `'frame'` and then in order of first use.
+      Empty if no frames have been timed, or if `frames` is 0.
+    """
+    report = collections.OrderedDict()
+    if not self._clip_frames(frames): return report
+    frame_mean = (self.frame_times('frame', frames).mean()
+                  if 'frame' in self._rings else 0.0)
+    names = sorted(self._rings, key=lambda name: name != 'frame')  # Stable.
+    for name in names:
+      times = self.frame_times(name, frames)
+      p50, p99 = np.percentile(times, [50, 99])
+      report[name] = FrameTimeStats(
+          mean=times.mean(), p50=p50, p99=p99, max=times.max(),
+          share=times.mean() / frame_mean if frame_mean else 0.0)
+    return report
+
+  def format_report(self, frames=None):
+    """Like `report`, but as a table in a string, with times in milliseconds."""
+    report = self.report(frames)
+    width = max([len(name) for name in report] + [4])
+    lines = ['{}  {:>9} {:>9} {:>9} {:>9} {:>6}'.format(
+        'name'.ljust(width), 'mean ms', 'p50 ms', 'p99 ms', 'max ms', 'share')]
+    for name, stats in six.iteritems(report):
+      lines.append('{}  {:9.3f} {:9.3f} {:9.3f} {:9.3f} {:6.1%}'.format(
+          name.ljust(width), 1e3 * stats.mean, 1e3 * stats.p50,
+          1e3 * stats.p99, 1e3 * stats.max, stats.share))
+    lines.append('({} frames)'.format(self._clip_frames(frames)))
+    return '\n'.join(lines)
+
+  def _clip_frames(self, frames):
+    """Helper: the number of frames to use, given a user's `frames` argument."""
+    return self.frames if frames is None else max(0, min(frames, self.frames))
+
+
+# Default histogram bins: four per decade from 1 microsecond to 10 seconds.
+_DEFAULT_BINS = np.logspace(-6, 1, 29)
@@ -0,0 +1,356 @@
+# Copyright 2017 the pycolab Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Shortest-path distances over the game board, shared through the Plot.
+
+Adversaries that chase the player and rewards that encourage an agent to head
+towards a goal both need to know how far apart places are when walls are in the
+way. Working this out separately for each entity at each game iteration is
+slow; this protocol keeps a "distance field" for each target in the Plot, so
+that everyone who wants one can share it, and so that it only needs to be
+recomputed when the target or the walls move.
+
+A distance field is a 2-D array the size of the game board whose entries are
+the number of single-cell steps north, south, east or west that it takes to get
+from each position to the nearest target position, or `UNREACHABLE` if the
+target can't be reached from there. An entity can use `distance_field` to get
+the field for its target, then `downhill` to find which way to go:
+
+    field = distances.distance_field(the_plot, board, 'P', impassable='#')
+    self._move(board, distances.downhill(field, self.positions))
+
+Positions are places where an entity with a given "footprint" (the offsets of
+the cells it covers from its position, like the keys of a `LargerObject`'s
+image) can be: those where neither the position itself nor any cell of the
+footprint is off the board or covered by an impassable character. This is the
+same rule that `LargerObject` and `SpriteSwarm` use for cardinal motions.
+
+Fields are cached per target, impassable characters and footprint. When the
+target positions change, the field is recomputed from scratch, but when only
+the walls change, only the distances that could have changed are recomputed:
+those at least as large as the smallest distance to a cell that was opened or
+closed. Recomputation is a breadth-first search that handles each "ring" of
+positions at the same distance from the target all at once.
+
+The positions where an entity's footprint fits, which distance fields are
+computed from, are cached too, and are available from `passable`. The same data
+gives `legal_motions`, the motions that entities could make without running
+into walls, e.g. for masking out an agent's useless actions.
+
+This protocol keeps its state in the Plot under keys starting with
+`'distances_'`.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+import six
+
+
+# The distance to a target that can't be reached.
+UNREACHABLE = np.iinfo(np.int32).max
+
+# The motions that `downhill` considers, in order of preference among equals.
+MOTIONS = np.array([(-1, 0), (1, 0), (0, -1), (0, 1)])
+
+
+def distance_field(the_plot, board, targets, impassable, footprint=None,
+                   name=None):
+  """Get the distance field for a target, computing it if necessary.
+
+  Args:
+    the_plot: the pycolab game engine's `Plot` object.
+    board: a 2-D numpy array with dtype `uint8` containing the completely
+        rendered game board from the last board repaint, or any other
+        character array of the same size.
+    targets: the target positions: either a string of characters, in which
+        case the targets are wherever these characters appear on `board`, or
+        a boolean array the size of `board` that is True at the targets, or a
+        sequence of row, column positions.
+    impassable: an indexable of ASCII characters that can't be traversed. A
+        string value containing these characters works.
+    footprint: the row, column offsets of the cells that an entity covers from
+        its position, e.g. the keys of a `LargerObject`'s image. By default,
+        just the position itself. The position itself is always checked.
+    name: the name under which to cache the field. May be omitted if
+        `targets` is a string, in which case the string is the name.
+
+  Returns:
+    a read-only 2-D int32 array the size of `board` with the distance from each
+    position to the nearest target, or `UNREACHABLE`. The array is a view of a
+    field that later calls for the same target may update in place, so copy it
+    if you need to keep it.
+
+  Raises:
+    ValueError: `targets` is not a string and no `name` was given.
+  """
+  if name is None:
+    if not isinstance(targets, six.string_types):
+      raise ValueError('distance_field needs a name for targets that are not '
+                       'a string of characters, like {}.'.format(repr(targets)))
+    name = targets
+
+  passability = _passability(the_plot, board, impassable, footprint)
+  fields = the_plot.setdefault('distances_fields', {})
+  key = (name, passability.key)
+  field = fields.get(key)
+  if field is None or field.shape != board.shape:
+    field = fields[key] = _DistanceField(board.shape)
+  return field.update(board, targets, passability.fits)
+
+
+def passable(the_plot, board, impassable, footprint=None):
+  """Get the positions where an entity's footprint fits on the board.
+
+  This is the passability data that distance fields are computed from; it's
+  cached in the same way, and recomputed only when the walls change.
+
+  Args:
+    the_plot: the pycolab game engine's `Plot` object.
+    board: a 2-D numpy array with dtype `uint8` containing the completely
+        rendered game board from the last board repaint.
+    impassable: an indexable of ASCII characters that can't be traversed.
+    footprint: the row, column offsets of the cells that an entity covers from
+        its position; see `distance_field`.
+
+  Returns:
+    a read-only 2-D boolean array the size of `board` that is True wherever
+    the entity could be. Like distance fields, it may be updated in place.
+  """
+  return _passability(the_plot, board, impassable, footprint).view
+
+
+def legal_motions(the_plot, board, positions, impassable, footprint=None,
+                  motions=MOTIONS):
+  """Find which single-cell motions entities could make.
+
+  A motion is legal if the entity's footprint fits at its destination (see
+  `passable`). Diagonal motions must also not squeeze between two impassable
+  cells, one beside the entity and one above or below it. These are the rules
+  that `LargerObject` follows for a `MazeWalker` confined to the board.
+
+  Args:
+    the_plot: the pycolab game engine's `Plot` object.
+    board: a 2-D numpy array with dtype `uint8` containing the completely
+        rendered game board from the last board repaint.
+    positions: a single row, column position, or an (N, 2) array of them.
+    impassable: an indexable of ASCII characters that can't be traversed.
+    footprint: the row, column offsets of the cells that an entity covers from
+        its position; see `distance_field`.
+    motions: an (M, 2) array of the row, column motions to check; by default,
+        `MOTIONS`.
+
+  Returns:
+    for a single position, a boolean array with one entry for each of
+    `motions`, True if it's legal. For an array of positions, an (N, M) array
+    of these.
+  """
+  passability = _passability(the_plot, board, impassable, footprint)
+  positions = np.asarray(positions, dtype=np.int64)
+  single = positions.ndim == 1
+  positions = positions.reshape(-1, 1, 2) + 1  # In padded coordinates.
+  motions = np.asarray(motions, dtype=np.int64).reshape(-1, 2)
+
+  # Both the destination and the cells beside a diagonal motion are at most
+  # one cell away, so they are inside the padded arrays.
+  width = passability.blocked.shape[1]
+  def flat(cells):
+    """Flat indices of padded row, column `cells`."""
+    return cells[..., 0] * width + cells[..., 1]
+  blocked = passability.blocked.ravel()
+  legal = passability.fits[flat(positions + motions)]
+  squeezed = (blocked[flat(positions + motions * (1, 0))] &
+              blocked[flat(positions + motions * (0, 1))])
+  legal &= ~(squeezed & np.all(motions != 0, axis=1))
+  return legal[0] if single else legal
+
+
+def downhill(field, positions):
+  """Motions that take entities one step closer to their target.
+
+  Args:
+    field: a distance field from `distance_field`.
+    positions: a single row, column position, or an (N, 2) array of them.
+
+  Returns:
+    for a single position, a row, column motion: the one among `MOTIONS` that
+    leads to the smallest distance in `field`, or (0, 0) if none is smaller
+    than the distance at the position itself. For an array of positions, an
+    (N, 2) array of such motions.
+  """
+  positions = np.asarray(positions)
+  single = positions.ndim == 1
+  positions = positions.reshape(-1, 2)
+
+  # Distances at each position and at its neighbours, with the board's edges
+  # counting as unreachable.
+  padded = np.pad(field, 1, 'constant', constant_values=UNREACHABLE)
+  here = padded[positions[:, 0] + 1, positions[:, 1] + 1]
+  neighbours = positions[:, np.newaxis, :] + MOTIONS + 1
+  there = padded[neighbours[..., 0], neighbours[..., 1]]
+
+  best = np.argmin(there, axis=1)
+  motions = MOTIONS[best]
+  motions[there[np.arange(len(best)), best] >= here] = 0
+  return tuple(int(m) for m in motions[0]) if single else motions
+
+
+def _passability(the_plot, board, impassable, footprint):
+  """Get the up-to-date `_Passability` for an entity, creating it if needed."""
+  impassable = ''.join(sorted(set(impassable)))
+  footprint = ((0, 0),) if footprint is None else tuple(sorted(footprint))
+  key = (impassable, footprint)
+  everyone = the_plot.setdefault('distances_passability', {})
+  passability = everyone.get(key)
+  if passability is None or passability.view.shape != board.shape:
+    passability = everyone[key] = _Passability(key, board.shape)
+  passability.update(board)
+  return passability
+
+
+class _Passability(object):
+  """Where an entity's footprint fits on the board, and what's impassable.
+
+  Arrays are padded with a border of impassable cells one cell wide, so that
+  the neighbours of a position are never off the arrays. When the walls
+  change, the arrays are replaced, not changed, so that users can tell whether
+  they have changed by checking their identity.
+  """
+
+  def __init__(self, key, shape):
+    self.key = key
+    impassable, footprint = key
+    self._impassable = np.zeros(256, dtype=np.bool_)  # Lookup table.
+    self._impassable[[ord(c) for c in impassable]] = True
+    self._footprint = np.unique(
+        np.concatenate([np.array(footprint, dtype=np.int64).reshape(-1, 2),
+                        [[0, 0]]]), axis=0)
+    self._walls = None  # The impassable cells on the last board.
+    self.blocked = None  # Padded impassable cells.
+    self.fits = None  # Flat, padded positions where the footprint fits.
+    self.view = np.zeros(shape, dtype=np.bool_)  # Read-only view of `fits`.
+
+  def update(self, board):
+    """Bring everything up to date with `board`."""
+    walls = self._impassable[board]
+    if self._walls is not None and np.array_equal(walls, self._walls): return
+    self._walls = walls
+    self.blocked = np.pad(walls, 1, 'constant', constant_values=True)
+
+    rows, cols = walls.shape
+    margin = max(1, np.abs(self._footprint).max())
+    unblocked = np.pad(~walls, margin, 'constant', constant_values=False)
+    fits = np.zeros((rows + 2, cols + 2), dtype=np.bool_)
+    inside = fits[1:-1, 1:-1]
+    inside.fill(True)
+    for drow, dcol in self._footprint:
+      inside &= unblocked[margin + drow:margin + drow + rows,
+                          margin + dcol:margin + dcol + cols]
+    inside.setflags(write=False)
+    self.fits, self.view = fits.ravel(), inside
+
+
+class _DistanceField(object):
+  """A distance field, and what's needed to bring it up to date.
+
+  All arrays are kept flattened, and padded with a border of impassable cells
+  one cell wide, so that the neighbours of a position are always at the same
+  offsets from it in the flattened arrays and never wrap around.
+  """
+
+  def __init__(self, shape):
+    self.shape = shape
+    rows, cols = shape
+    self._padded_shape = (rows + 2, cols + 2)
+    self._offsets = np.array([-(cols + 2), cols + 2, -1, 1])
+
+    self._passable = None     # Positions where the footprint fits.
+    self._targets = None      # Flat indices of the reachable targets.
+    self._distances = np.full(self._padded_shape, UNREACHABLE, dtype=np.int32)
+    self._view = self._distances[1:-1, 1:-1]
+    self._view.setflags(write=False)
+    self._distances = self._distances.ravel()
+
+  def update(self, board, targets, passable):
+    """Bring the field up to date with `board`, `targets` and `passable`, the
+    flat, padded positions where the footprint fits; return it."""
+    targets = self._target_indices(board, targets)
+    targets = targets[passable[targets]]
+
+    if self._targets is None or not np.array_equal(targets, self._targets):
+      self._passable, self._targets = passable, targets
+      self._recompute(0)
+    elif passable is not self._passable:
+      first = self._first_changed(passable)
+      self._passable = passable
+      self._recompute(first)
+    return self._view
+
+  def _target_indices(self, board, targets):
+    """Sorted flat, padded indices of the target positions."""
+    if isinstance(targets, six.string_types):
+      mask = np.isin(board, np.array([ord(c) for c in targets], dtype=np.uint8))
+    else:
+      targets = np.asarray(targets)
+      if targets.dtype == np.bool_ and targets.shape == self.shape:
+        mask = targets
+      else:
+        mask = np.zeros(self.shape, dtype=np.bool_)
+        positions = targets.reshape(-1, 2)
+        on_board = np.all((positions >= 0) & (positions < self.shape), axis=1)
+        mask[positions[on_board, 0], positions[on_board, 1]] = True
+    return np.flatnonzero(np.pad(mask, 1, 'constant', constant_values=False))
+
+  def _first_changed(self, passable):
+    """Smallest distance that could change now that walls have moved.
+
+    Distances smaller than this are the same as they were: paths that go
+    through a newly closed cell are at least as long as the old distance to
+    it, and paths that go through a newly opened cell are longer than the old
+    distance to one of its neighbours.
+    """
+    distances = self._distances.astype(np.int64)
+    first = UNREACHABLE
+    closed = np.flatnonzero(self._passable & ~passable)
+    if closed.size:
+      first = min(first, distances[closed].min())
+    opened = np.flatnonzero(passable & ~self._passable)
+    if opened.size:
+      neighbours = (opened[:, np.newaxis] + self._offsets).ravel()
+      first = min(first, distances[neighbours].min() + 1)
+    return first
+
+  def _recompute(self, first):
+    """Recompute all distances that are at least `first`."""
+    distances = self._distances
+    if first >= UNREACHABLE: return
+    distances[distances >= first] = UNREACHABLE
+    if first == 0:
+      frontier = self._targets
+      distances[frontier] = 0
+    else:
+      frontier = np.flatnonzero(distances == first - 1)
+
+    # Breadth-first search, one ring of equally distant positions at a time.
+    distance = max(first, 1)
+    passable = self._passable
+    while frontier.size:
+      neighbours = (frontier[:, np.newaxis] + self._offsets).ravel()
+      neighbours = neighbours[passable[neighbours] &
+                              (distances[neighbours] == UNREACHABLE)]
+      frontier = np.unique(neighbours)
+      distances[frontier] = distance
+      distance += 1
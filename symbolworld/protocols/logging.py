@@ -23,14 +23,38 @@ accumulated messages to the user in whatever way is best.
 Most game implementations will not need to import this protocol directly---
 logging is so fundamental that the Plot object expresses a `log` method that's
 syntactic sugar for the log function in this file.
+
+Logging is meant to be cheap enough to leave in games that are run millions of
+times for training. Messages are kept as a format string and its arguments and
+only formatted when `consume`d; they are kept in a ring buffer of fixed size, so
+that the oldest messages are dropped if no one consumes them; and messages less
+important than a threshold level are dropped right away. To turn logging off
+entirely, set the threshold level to `OFF`:
+
+    plab_logging.set_level(engine.the_plot, plab_logging.OFF)
 """
 
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
+
+
+# Message levels, as in Python's `logging` module. Messages are logged at level
+# INFO unless otherwise specified.
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+# A threshold level above all of the others, for logging nothing at all.
+OFF = 100
 
-def log(the_plot, message):
+# The number of messages kept until they are consumed, by default.
+DEFAULT_CAPACITY = 1000
+
+
+def log(the_plot, message, *args, **kwargs):
   """Log a message for eventual disposal by the game engine user.
 
   Here, "game engine user" means a user interface or an environment interface,
@@ -41,11 +65,29 @@ def log(the_plot, message):
   logging is so fundamental that the Plot object expresses a `log` method that's
   syntactic sugar for this function.
 
+  If there are `args`, the message is formatted with `message.format(*args)`,
+  but not until the message is consumed---so `args` should not be objects
+  that will be changed in the meantime, like `numpy` arrays that are updated
+  in place. If there are no `args`, the message is used as it is.
+
   Args:
     the_plot: the pycolab game's `Plot` object.
-    message: A string message to convey to the game engine user.
+    message: A string message to convey to the game engine user, or a format
+        string for `args`.
+    *args: Arguments for formatting `message`.
+    **kwargs: Only `level`, the importance of the message: by default, `INFO`.
+        Messages less important than the threshold set by `set_level` are
+        dropped.
+
+  Raises:
+    TypeError: a keyword argument other than `level` was supplied.
   """
-  the_plot.setdefault('log_messages', []).append(message)
+  level = kwargs.pop('level', INFO)
+  if kwargs:
+    raise TypeError('log() got unexpected keyword arguments: {}'.format(
+        ', '.join(sorted(kwargs))))
+  messages = _messages(the_plot)
+  if level >= messages.level: messages.append((message, args))
 
 
 def consume(the_plot):
@@ -61,10 +103,52 @@ def consume(the_plot):
 
   Returns:
     The list of all log messages supplied by the `log` method since the last
-    time `consume` was called (or ever, if `consume` has never been called).
+    time `consume` was called (or ever, if `consume` has never been called),
+    except those dropped for being below the threshold level or for being
+    among the oldest of more messages than the buffer holds.
   """
-  messages = the_plot.setdefault('log_messages', [])
-  # Hand off the current messages to a new list that we return.
-  our_messages = messages[:]
-  del messages[:]
+  messages = _messages(the_plot)
+  our_messages = [message.format(*args) if args else message
+                  for message, args in messages]
+  messages.clear()
   return our_messages
+
+
+def set_level(the_plot, level):
+  """Set the threshold level below which messages are dropped.
+
+  Args:
+    the_plot: the pycolab game's `Plot` object.
+    level: the least important level of message to keep, e.g. `DEBUG` to keep
+        all messages, or `OFF` to keep none. Messages already logged are kept.
+  """
+  _messages(the_plot).level = level
+
+
+def set_capacity(the_plot, capacity):
+  """Set the number of messages kept until they are consumed.
+
+  Args:
+    the_plot: the pycolab game's `Plot` object.
+    capacity: the number of messages to keep; when more are logged, the oldest
+        ones are dropped. If messages already logged exceed the new capacity,
+        the oldest ones are dropped now.
+  """
+  messages = _messages(the_plot)
+  the_plot['log_messages'] = _MessageBuffer(messages, capacity, messages.level)
+
+
+class _MessageBuffer(collections.deque):
+  """A ring buffer of unformatted messages, with a threshold level."""
+
+  def __init__(self, iterable=(), maxlen=DEFAULT_CAPACITY, level=DEBUG):
+    super(_MessageBuffer, self).__init__(iterable, maxlen)
+    self.level = level
+
+
+def _messages(the_plot):
+  """Get the `_MessageBuffer` in `the_plot`, adding it if it isn't there."""
+  messages = the_plot.get('log_messages')
+  if messages is None:
+    messages = the_plot['log_messages'] = _MessageBuffer()
+  return messages
@@ -0,0 +1,480 @@
+# Copyright 2017 the pycolab Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compact recordings of pycolab episodes, and replaying them.
+
+pycolab games are deterministic, so an episode can be reconstructed from its
+first game board and the actions that were taken in it. An `EpisodeRecorder`
+saves only that, plus the rewards and discounts for convenience: about a dozen
+bytes per step, instead of the thousands that an RGB frame would take. The
+data go into append-only arrays in files in a directory, which are mapped into
+memory rather than read, so recordings can be much bigger than RAM.
+
+    recorder = recording.EpisodeRecorder('/tmp/episodes')
+    env = recorder.recording_env(symbolic_gridworld.SimpleSymbolWorldEnv())
+    env.reset(seed=1)
+    ...  # Call env.step as usual; episodes are saved as they end.
+    recorder.close()
+
+A `Recording` reads the directory back, and recreates any observation of any
+episode on demand by replaying it. With a `keyframe_interval`, replays save
+`Engine` snapshots as they go, so jumping around inside an episode is quick.
+
+    episodes = recording.Recording(
+        '/tmp/episodes', symbolic_gridworld.make_replay_game,
+        keyframe_interval=50)
+    observation = episodes.observation(episode=0, step=123)
+
+Actions must be integers. Rewards of None are saved as NaN.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import json
+import os
+
+import numpy as np
+import six
+
+from pycolab import ascii_art
+from pycolab import rendering
+
+
+# One row of the episode table. Seeds of -1 mean that no seed was given.
+EPISODE_DTYPE = np.dtype([
+    ('seed', np.int64),
+    ('first_step', np.int64),
+    ('num_steps', np.int64),
+    ('level_offset', np.int64),
+    ('rows', np.int64),
+    ('cols', np.int64),
+])
+
+# The files in a recording directory, and the dtypes of their arrays.
+_ARRAYS = collections.OrderedDict([
+    ('episodes', EPISODE_DTYPE),
+    ('levels', np.dtype(np.uint8)),
+    ('actions', np.dtype(np.int32)),
+    ('rewards', np.dtype(np.float32)),
+    ('discounts', np.dtype(np.float32)),
+])
+_INDEX_FILE = 'index.json'
+# Array files start at least this big, to avoid many small early doublings.
+_MIN_FILE_BYTES = 4096
+
+
+class RecordedEpisode(
+    collections.namedtuple('RecordedEpisode',
+                           ['seed', 'level', 'actions', 'rewards',
+                            'discounts'])):
+  """One episode from a `Recording`.
+
+  There are five members: the `seed` given when the episode was recorded (or
+  None), the first game board as a 2-D `np.uint8` array of ASCII values
+  (`level`), and 1-D arrays of the `actions` taken and the `rewards` and
+  `discounts` that followed each one. The arrays are read-only views of the
+  recording's memory-mapped files.
+  """
+  __slots__ = ()
+
+
+class EpisodeRecorder(object):
+  """Saves episodes to a recording directory, adding to any already there.
+
+  Call `begin_episode`, `record_step` for each step, and `end_episode`; or let
+  a wrapper from `recording_engine` or `recording_env` do it for you. Episodes
+  only become part of the recording when they end, so a crash mid-episode
+  leaves the recording as it was.
+  """
+
+  def __init__(self, directory):
+    """Construct an `EpisodeRecorder`.
+
+    Args:
+      directory: the recording directory. It is created if it doesn't exist.
+    """
+    if not os.path.isdir(directory): os.makedirs(directory)
+    self._directory = directory
+    lengths = _read_index(directory)
+    self._arrays = {name: _AppendOnlyArray(os.path.join(directory, name),
+                                           dtype, lengths[name])
+                    for name, dtype in six.iteritems(_ARRAYS)}
+    # The row of the episode table for the episode in progress, or None.
+    self._episode = None
+
+  def begin_episode(self, level, seed=None):
+    """Begin recording a new episode.
+
+    Args:
+      level: the episode's first game board: an ASCII art diagram (a list of
+          strings) or a 2-D `np.uint8` array of ASCII values.
+      seed: an optional integer seed that was used to make the episode.
+
+    Raises:
+      RuntimeError: an episode is already in progress.
+    """
+    if self._episode is not None:
+      raise RuntimeError('begin_episode() was called before the episode in '
+                         'progress was ended with end_episode().')
+    level = (np.asarray(level, dtype=np.uint8) if isinstance(level, np.ndarray)
+             else ascii_art.ascii_art_to_uint8_nparray(level))
+    self._episode = np.zeros((), dtype=EPISODE_DTYPE)
+    self._episode['seed'] = -1 if seed is None else seed
+    self._episode['first_step'] = len(self._arrays['actions'])
+    self._episode['level_offset'] = len(self._arrays['levels'])
+    self._episode['rows'], self._episode['cols'] = level.shape
+    self._arrays['levels'].append(level.ravel())
+
+  def record_step(self, action, reward, discount):
+    """Record one step of the episode in progress.
+
+    Args:
+      action: the integer action taken.
+      reward: the reward that followed, or None.
+      discount: the discount that followed.
+
+    Raises:
+      RuntimeError: no episode is in progress.
+    """
+    if self._episode is None:
+      raise RuntimeError('record_step() was called with no episode in '
+                         'progress; call begin_episode() first.')
+    self._arrays['actions'].append(action)
+    self._arrays['rewards'].append(np.nan if reward is None else reward)
+    self._arrays['discounts'].append(discount)
+    self._episode['num_steps'] += 1
+
+  def end_episode(self):
+    """Finish the episode in progress, adding it to the recording.
+
+    Raises:
+      RuntimeError: no episode is in progress.
+    """
+    if self._episode is None:
+      raise RuntimeError('end_episode() was called with no episode in '
+                         'progress.')
+    self._arrays['episodes'].append(self._episode)
+    self._episode = None
+    for array in six.itervalues(self._arrays): array.flush()
+    _write_index(self._directory, {name: len(array) for name, array in
+                                   six.iteritems(self._arrays)})
+
+  def close(self):
+    """End any episode in progress and release the recording's files."""
+    if self._episode is not None: self.end_episode()
+    for array in six.itervalues(self._arrays): array.close()
+
+  def recording_engine(self, engine, level, seed=None):
+    """Wrap an `Engine` so that playing it records an episode.
+
+    The wrapper behaves like `engine`. Its `its_showtime` method begins the
+    episode, `play` records each step, and the episode ends with the game.
+    `play` only accepts `repeat=1`.
+
+    Args:
+      engine: an `Engine` that is ready for `its_showtime`.
+      level: the game board that `engine` was made from, as for
+          `begin_episode`.
+      seed: see `begin_episode`.
+
+    Returns:
+      the wrapped `Engine`.
+    """
+    return _RecordingEngine(self, engine, level, seed)
+
+  def recording_env(self, env):
+    """Wrap a `SimpleSymbolWorldEnv` so that each episode is recorded.
+
+    The wrapper behaves like `env`. Its `reset` method begins a new episode
+    (ending any unfinished one), and `step` records each step. Pass a seed to
+    `reset` for episodes that can be replayed in full colour; see
+    `symbolic_gridworld.make_replay_game`.
+
+    Args:
+      env: a `SimpleSymbolWorldEnv`.
+
+    Returns:
+      the wrapped environment.
+    """
+    return _RecordingEnv(self, env)
+
+
+class Recording(object):
+  """Read access to a recording directory, with replay.
+
+  Opening a `Recording` maps its files into memory, so it costs next to
+  nothing however big the recording is. Episodes added to the directory
+  afterwards are not seen.
+  """
+
+  def __init__(self, directory, make_game=None, keyframe_interval=None):
+    """Construct a `Recording`.
+
+    Args:
+      directory: a recording directory made by an `EpisodeRecorder`.
+      make_game: for replay, a callable taking an episode's `level` (as a 2-D
+          `np.uint8` array) and `seed` (or None) and returning a new `Engine`
+          for the episode, ready for `its_showtime`.
+      keyframe_interval: if not None, replays save a snapshot of the game
+          every this many steps, for quick random access within an episode.
+
+    Raises:
+      ValueError: `keyframe_interval` is less than 1.
+    """
+    if keyframe_interval is not None and keyframe_interval < 1:
+      raise ValueError('keyframe_interval must be at least 1, not {}.'.format(
+          keyframe_interval))
+    lengths = _read_index(directory)
+    self._arrays = {name: _read_only_array(os.path.join(directory, name),
+                                           dtype, lengths[name])
+                    for name, dtype in six.iteritems(_ARRAYS)}
+    self._make_game = make_game
+    self._keyframe_interval = keyframe_interval
+
+    # The episode being replayed, its Engine, the step the Engine is at, and
+    # its keyframes, keyed by step.
+    self._replay_episode = None
+    self._replay_engine = None
+    self._replay_step = None
+    self._keyframes = {}
+
+  def __len__(self):
+    """The number of episodes in the recording."""
+    return len(self._arrays['episodes'])
+
+  @property
+  def num_steps(self):
+    """The total number of steps in all episodes of the recording."""
+    return int(self._arrays['episodes']['num_steps'].sum())
+
+  def episode(self, index):
+    """Obtain the `RecordedEpisode` at `index`, without reading its data."""
+    row = self._arrays['episodes'][index]
+    level_start = int(row['level_offset'])
+    level_stop = level_start + int(row['rows']) * int(row['cols'])
+    steps = slice(int(row['first_step']),
+                  int(row['first_step']) + int(row['num_steps']))
+    return RecordedEpisode(
+        seed=None if row['seed'] < 0 else int(row['seed']),
+        level=self._arrays['levels'][level_start:level_stop].reshape(
+            int(row['rows']), int(row['cols'])),
+        actions=self._arrays['actions'][steps],
+        rewards=self._arrays['rewards'][steps],
+        discounts=self._arrays['discounts'][steps])
+
+  def observation(self, episode, step):
+    """Recreate an observation from a recorded episode by replaying it.
+
+    Args:
+      episode: the index of the episode.
+      step: which observation: 0 for the first one (from `its_showtime`), `t`
+          for the one after the `t`th action.
+
+    Returns:
+      a copy of the `rendering.Observation`.
+
+    Raises:
+      RuntimeError: this `Recording` was made without a `make_game`.
+      IndexError: `step` is out of range for the episode.
+    """
+    return _copy_observation(self._replay_to(episode, step).board)
+
+  def replay(self, episode):
+    """Yield copies of every observation of an episode, first to last."""
+    num_steps = int(self._arrays['episodes'][episode]['num_steps'])
+    for step in six.moves.range(num_steps + 1):
+      yield self.observation(episode, step)
+
+  def _replay_to(self, episode, step):
+    """Put the replay `Engine` at `step` of `episode` as quickly as we can."""
+    if self._make_game is None:
+      raise RuntimeError('This Recording can\'t replay episodes, since it was '
+                         'made without a make_game callable.')
+    recorded = self.episode(episode)
+    if not 0 <= step <= len(recorded.actions):
+      raise IndexError('Episode {} has observations for steps 0 to {}, not '
+                       '{}.'.format(episode, len(recorded.actions), step))
+
+    if self._replay_episode != episode:
+      self._replay_episode = episode
+      self._replay_engine = None
+      self._keyframes = {}
+
+    # Where to start from: where we are, if that's not past `step`, or else
+    # the latest keyframe before `step`, or else the beginning.
+    keyframe_steps = [s for s in self._keyframes if s <= step]
+    keyframe = max(keyframe_steps) if keyframe_steps else None
+    if (self._replay_engine is None or self._replay_step > step or
+        (keyframe is not None and keyframe > self._replay_step)):
+      if keyframe is not None:
+        self._replay_engine.restore(self._keyframes[keyframe])
+        self._replay_step = keyframe
+      else:
+        self._replay_engine = self._make_game(recorded.level, recorded.seed)
+        self._replay_engine.its_showtime()
+        self._replay_step = 0
+        self._save_keyframe()
+
+    while self._replay_step < step:
+      self._replay_engine.play(int(recorded.actions[self._replay_step]))
+      self._replay_step += 1
+      self._save_keyframe()
+    return self._replay_engine
+
+  def _save_keyframe(self):
+    """Snapshot the replay `Engine` if it's at a keyframe we don't have."""
+    interval = self._keyframe_interval
+    if (interval is not None and self._replay_step % interval == 0 and
+        self._replay_step not in self._keyframes and
+        not self._replay_engine.game_over):
+      self._keyframes[self._replay_step] = self._replay_engine.snapshot()
+
+
+### Private helpers ###
+
+
+class _RecordingEngine(object):
+  """An `Engine` wrapper that records; see `EpisodeRecorder.recording_engine`."""
+
+  def __init__(self, recorder, engine, level, seed):
+    self._recorder = recorder
+    self._engine = engine
+    self._level = level
+    self._seed = seed
+
+  def its_showtime(self):
+    self._recorder.begin_episode(self._level, self._seed)
+    result = self._engine.its_showtime()
+    if self._engine.game_over: self._recorder.end_episode()
+    return result
+
+  def play(self, actions, repeat=1):
+    if repeat != 1:
+      raise ValueError('A recording Engine can only play() with repeat=1.')
+    observation, reward, discount = self._engine.play(actions)
+    self._recorder.record_step(actions, reward, discount)
+    if self._engine.game_over: self._recorder.end_episode()
+    return observation, reward, discount
+
+  def __getattr__(self, name):
+    return getattr(self._engine, name)
+
+
+class _RecordingEnv(object):
+  """An environment wrapper that records; see `EpisodeRecorder.recording_env`."""
+
+  def __init__(self, recorder, env):
+    self._recorder = recorder
+    self._env = env
+    self._in_episode = False
+
+  def reset(self, seed=None):
+    if self._in_episode: self._recorder.end_episode()
+    result = self._env.reset(seed=seed)
+    self._recorder.begin_episode(self._env.level, seed)
+    self._in_episode = True
+    return result
+
+  def step(self, action):
+    result = self._env.step(action)
+    _, reward, done, _ = result
+    # The environment doesn't report discounts, so we save pycolab's defaults.
+    self._recorder.record_step(action, reward, 0.0 if done else 1.0)
+    if done:
+      self._recorder.end_episode()
+      self._in_episode = False
+    return result
+
+  def __getattr__(self, name):
+    return getattr(self._env, name)
+
+
+class _AppendOnlyArray(object):
+  """A 1-D array in a file, mapped into memory, that grows as it's appended to.
+
+  The file grows in doublings, so it's usually bigger than the array; the true
+  length is kept in the recording's index.
+  """
+
+  def __init__(self, path, dtype, length):
+    self._path = path
+    self._dtype = dtype
+    self._length = length
+    if not os.path.exists(path): open(path, 'wb').close()
+    self._capacity = os.path.getsize(path) // dtype.itemsize
+    self._map = None
+    self._remap()
+
+  def __len__(self):
+    return self._length
+
+  def append(self, values):
+    values = np.asarray(values, dtype=self._dtype).reshape(-1)
+    new_length = self._length + len(values)
+    if new_length > self._capacity:
+      self._grow(max(new_length, 2 * self._capacity,
+                     _MIN_FILE_BYTES // self._dtype.itemsize))
+    self._map[self._length:new_length] = values
+    self._length = new_length
+
+  def flush(self):
+    if self._map is not None: self._map.flush()
+
+  def close(self):
+    self.flush()
+    self._map = None
+
+  def _grow(self, capacity):
+    self.close()
+    with open(self._path, 'r+b') as f: f.truncate(capacity * self._dtype.itemsize)
+    self._capacity = capacity
+    self._remap()
+
+  def _remap(self):
+    self._map = (np.memmap(self._path, dtype=self._dtype, mode='r+',
+                           shape=(self._capacity,))
+                 if self._capacity else None)
+
+
+def _read_only_array(path, dtype, length):
+  """Map the first `length` elements of an array file into memory, read-only."""
+  if not length: return np.zeros(0, dtype=dtype)
+  return np.memmap(path, dtype=dtype, mode='r', shape=(length,))
+
+
+def _read_index(directory):
+  """Read the array lengths in a recording's index; all zero if there's none."""
+  path = os.path.join(directory, _INDEX_FILE)
+  if not os.path.exists(path): return {name: 0 for name in _ARRAYS}
+  with open(path) as f: return json.load(f)['lengths']
+
+
+def _write_index(directory, lengths):
+  """Replace a recording's index atomically, so readers never see half of it."""
+  path = os.path.join(directory, _INDEX_FILE)
+  with open(path + '.tmp', 'w') as f:
+    json.dump({'version': 1, 'lengths': lengths}, f)
+  (os.replace if six.PY3 else os.rename)(path + '.tmp', path)
+
+
+def _copy_observation(observation):
+  """Copy an `Observation`, so that later renderings don't change it."""
+  return rendering.Observation(
+      board=np.copy(observation.board),
+      symbolic_board=np.copy(observation.symbolic_board),
+      layers={character: np.copy(layer)
+              for character, layer in six.iteritems(observation.layers)})
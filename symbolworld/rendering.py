@@ -150,7 +150,8 @@ class BaseObservationRenderer(object):
     Args:
       character: a string of length 1 containing an ASCII character.
       curtain: a 2-D `np.bool_` array whose dimensions are the same as this
-          `BaseObservationRenderer`s.
+          `BaseObservationRenderer`s. It may be a strided, read-only view into
+          a larger array, like the curtain of a `Scrolly` with `curtain_view`.
 
     Raises:
       ValueError: `character` is not a valid character for this game, according
@@ -202,7 +203,7 @@ class SymbolicObservationRenderer(object):
   3. Call the `render()` method to obtain the finished observation.
   """
 
-  def __init__(self, rows, cols, characters):
+  def __init__(self, rows, cols, characters, instance_maps=False):
     """Construct a BaseObservationRenderer.
 
     Args:
@@ -210,22 +211,46 @@ class SymbolicObservationRenderer(object):
       cols: width of the game board.
       characters: an iterable of ASCII characters that are allowed to appear
           on the game board. (A string will work as an argument here.)
+      instance_maps: if True, the renderer also maintains the `instance_ids`
+          and `footprint_board` maps (see their docstrings), stamping them in
+          the same pass that paints the RGB `board`.
     """
     self._board = np.zeros((rows, cols, 3), dtype='uint8')#rgb
     self._symbolic_board = np.zeros((rows, cols), dtype=np.uint8)  # rgb
     self._layers = {
         char: np.zeros((rows, cols), dtype=np.bool_) for char in characters}
-
-  def clear(self):
+    # Whether the `paint*` methods should stamp colours onto the RGB `board`.
+    self._paint_rgb = True
+
+    # Optional per-pixel maps of entity instances and their characters.
+    self._instance_ids = (
+        np.zeros((rows, cols), dtype=np.uint16) if instance_maps else None)
+    self._footprint_board = (
+        np.zeros((rows, cols), dtype=np.uint8) if instance_maps else None)
+    # The ID to give to the next entity instance painted onto the canvas.
+    self._next_instance_id = 1
+
+  def clear(self, rgb=True):
     """Reset the "canvas" of this `BaseObservationRenderer`.
 
     After a `clear()`, a call to `render()` would return an `Observation` whose
     `board` contains only `np.uint8(0)` values and whose layers contain only
     `np.bool_(False)` values.
+
+    Args:
+      rgb: if False, the RGB `board` is neither cleared nor painted until the
+          next `clear()`; only `symbolic_board` and the layers are kept up to
+          date. This is for intermediate renders whose RGB output nobody will
+          ever look at, e.g. the skipped frames of a repeated action. The
+          contents of `board` are *undefined* after such a render.
     """
-    self._board.fill(0)
+    self._paint_rgb = rgb
+    if rgb: self._board.fill(0)
+    if self._instance_ids is not None:
+      self._instance_ids.fill(0)
+      self._next_instance_id = 1
 
-  def paint_all_of(self, curtain):
+  def paint_all_of(self, curtain, curtain_version=None):
     """Copy a pattern onto the "canvas" of this `BaseObservationRenderer`.
 
     Copies all of the characters from `curtain` onto this object's canvas,
@@ -235,8 +260,13 @@ class SymbolicObservationRenderer(object):
     Args:
       curtain: a 2-D `np.uint8` array whose dimensions are the same as this
           `BaseObservationRenderer`'s.
+      curtain_version: the `Backdrop.curtain_version` of `curtain`, if known.
+          Unused here, since the whole canvas is repainted anyway.
     """
+    del curtain_version  # Unused.
     np.copyto(self._symbolic_board, curtain, casting='no')
+    if self._footprint_board is not None:
+      np.copyto(self._footprint_board, curtain, casting='no')
 
   def paint_sprite(self, character, position, entity:things.LargeSprite):
     """Draw a character onto the "canvas" of this `BaseObservationRenderer`.
@@ -258,15 +288,7 @@ class SymbolicObservationRenderer(object):
       raise ValueError('character {} does not seem to be a valid character for '
                        'this game'.format(str(character)))
 
-    img = entity.absimg(position)
-    keys = list(img.keys())
-    values = list(img.values())
-    row_indices, col_indices = zip(*keys)
-
-
-    what = self._board[row_indices, col_indices ]
-    self._board[row_indices, col_indices] = values # TODO Check if this works
-
+    self._stamp(character, entity, [position])
     self._symbolic_board[tuple(position)] = ord(character)
 
   def paint_drape(self, character, curtain, entity:things.LargeDrape):
@@ -279,7 +301,8 @@ class SymbolicObservationRenderer(object):
     Args:
       character: a string of length 1 containing an ASCII character.
       curtain: a 2-D `np.bool_` array whose dimensions are the same as this
-          `BaseObservationRenderer`s.
+          `BaseObservationRenderer`s. It may be a strided, read-only view into
+          a larger array, like the curtain of a `Scrolly` with `curtain_view`.
 
     Raises:
       ValueError: `character` is not a valid character for this game, according
@@ -289,14 +312,7 @@ class SymbolicObservationRenderer(object):
       raise ValueError('character {} does not seem to be a valid character for '
                        'this game'.format(str(character)))
 
-    drapelist = entity.drape_list
-    for drape_loc in drapelist:
-      img = entity.absimg(drape_loc)
-      keys = img.keys()
-      values = list(img.values())
-      row_indices, col_indices = zip(*keys)
-      self._board[row_indices, col_indices] = values
-
+    self._stamp(character, entity, entity.drape_list)
 
     self._symbolic_board[curtain] = ord(character)
 
@@ -325,11 +341,344 @@ class SymbolicObservationRenderer(object):
     """The 2-D dimensions of this `BaseObservationRenderer`."""
     return self._board.shape
 
+  @property
+  def instance_ids(self):
+    """Per-pixel IDs of the entity instances painted since the last `clear()`.
+
+    A 2-D `np.uint16` array, or None if this renderer was not constructed with
+    `instance_maps=True`. The `Backdrop` has ID 0; every subsequently painted
+    `Sprite`, and every instance of a `Drape` (in the order of its
+    `drape_list`), gets the next ID in painting order. Each ID is written over
+    the whole footprint of its instance, so later instances occlude earlier
+    ones. As with `render()`, the array should be treated as read-only.
+    """
+    return self._instance_ids
+
+  @property
+  def footprint_board(self):
+    """Like `symbolic_board`, but with characters over whole footprints.
+
+    `symbolic_board` only marks the anchor cell of each `Sprite` and `Drape`
+    instance; this 2-D `np.uint8` array holds the character of the entity that
+    owns each pixel. None if this renderer was not constructed with
+    `instance_maps=True`. As with `render()`, treat it as read-only.
+    """
+    return self._footprint_board
+
+  def _stamp(self, character, entity, anchors):
+    """Paint the image of `entity` at every location in `anchors`.
+
+    All instances are stamped with one vectorised assignment per canvas, which
+    paints the RGB `board` (unless disabled by `clear()`) and, if enabled, the
+    instance ID and footprint maps. Pixels that fall outside of the canvas are
+    dropped.
+
+    Args:
+      character: the character of `entity`.
+      entity: an `ILarge` game entity.
+      anchors: a sequence of row, column locations of instances of `entity`.
+
+    Raises:
+      RuntimeError: there are too many entity instances for `np.uint16` IDs.
+    """
+    if not (self._paint_rgb or self._instance_ids is not None): return
+    num_anchors = len(anchors)
+    if not num_anchors: return
+
+    offsets = np.array(list(entity.img.keys()), dtype=np.int64).reshape(-1, 2)
+    colors = np.array([np.asarray(rgb) for rgb in entity.img.values()],
+                      dtype=np.uint8).reshape(-1, 3)
+    coords = (np.reshape(anchors, (num_anchors, 1, 2)) + offsets).reshape(-1, 2)
+    on_canvas = np.all((coords >= 0) & (coords < self._symbolic_board.shape),
+                       axis=1)
+    rows, cols = coords[on_canvas].T
+
+    if self._paint_rgb:
+      self._board[rows, cols] = np.tile(colors, (num_anchors, 1))[on_canvas]
+
+    if self._instance_ids is not None:
+      first_id = self._next_instance_id
+      self._next_instance_id += num_anchors
+      if self._next_instance_id > np.iinfo(np.uint16).max + 1:
+        raise RuntimeError('Too many game entity instances to give each one a '
+                           'distinct ID in the instance ID map.')
+      ids = np.repeat(np.arange(first_id, self._next_instance_id, dtype=np.uint16),
+                      len(offsets))
+      self._instance_ids[rows, cols] = ids[on_canvas]
+      self._footprint_board[rows, cols] = ord(character)
+
   def printa(self):
     import matplotlib.pyplot as plt
     plt.imshow(self._board)
     plt.show()
 
+class DirtyTileObservationRenderer(SymbolicObservationRenderer):
+  """A `SymbolicObservationRenderer` for very large boards.
+
+  `SymbolicObservationRenderer` repaints its whole canvas for every
+  observation, so its cost grows with the area of the board, even if only a
+  handful of small sprites ever move. This renderer keeps its canvas from one
+  rendering to the next, divides it into square tiles, and repaints only the
+  tiles where something has changed. Its `Observation`s are identical to those
+  of `SymbolicObservationRenderer`.
+
+  The `paint*` methods only take note of what to paint; `render()` compares
+  those notes with the notes from the last rendering to find the tiles to
+  repaint. Painting is only done for tiles where something changed. The
+  `Backdrop` curtain is only compared with a copy of the one painted last time
+  if its `curtain_version` says it may have changed, and each
+  `LargeDrape.drape_list` is cached while its curtain stays the same. For
+  `Backdrop`s and `Drape`s that don't note their changes (see
+  `things.Drape.curtain_version`), these checks still scan the whole board.
+  Drapes are painted at the locations in their `drape_list`, which should be
+  the `True` cells of their curtains.
+
+  Per-pixel instance maps are not supported.
+  """
+
+  def __init__(self, rows, cols, characters, tile_size=32):
+    """Construct a DirtyTileObservationRenderer.
+
+    Args:
+      rows: height of the game board.
+      cols: width of the game board.
+      characters: an iterable of ASCII characters that are allowed to appear
+          on the game board. (A string will work as an argument here.)
+      tile_size: height and width of the square tiles that are repainted as a
+          unit. Smaller tiles repaint fewer pixels for each change, but there
+          are more of them to visit.
+
+    Raises:
+      ValueError: `tile_size` is less than 1.
+    """
+    super(DirtyTileObservationRenderer, self).__init__(rows, cols, characters)
+    if tile_size < 1:
+      raise ValueError('DirtyTileObservationRenderer tiles must be at least '
+                       'one cell wide, not {}.'.format(tile_size))
+    self._tile_size = tile_size
+    self._tiles_shape = (-(-rows // tile_size), -(-cols // tile_size))
+
+    # Tiles whose RGB pixels have not been repainted since something changed
+    # in them, because the renderings since then were made with rgb=False.
+    self._stale_rgb_tiles = np.zeros(self._tiles_shape, dtype=np.bool_)
+
+    # The backdrop curtain to paint this time and its version, and a copy of
+    # the one painted last time (None until the first rendering) and its
+    # version (None if unknown).
+    self._backdrop = None
+    self._backdrop_version = None
+    self._painted_backdrop = None
+    self._painted_backdrop_version = None
+
+    # Notes on each Sprite and Drape to paint this time, and the notes from
+    # last time (None until the first rendering), in painting order. Each note
+    # is a tuple: the entity's character, its image, a (N, 2) array of the
+    # locations to paint it at, and either None or a (M, 2) array of just the
+    # locations that have changed since last time.
+    self._to_paint = []
+    self._painted = None
+
+    # For each Drape character, the `drape_list` painted last time.
+    self._drape_lists = {}
+
+    # Per-image cache of offsets, colours and bounding boxes (see `_footprint`);
+    # each entry also holds the image itself, to keep its id unique.
+    self._footprints = {}
+
+  def clear(self, rgb=True):
+    """Begin a new rendering; see `SymbolicObservationRenderer.clear`.
+
+    Unlike `SymbolicObservationRenderer.clear`, nothing is erased: the canvas
+    is kept for comparison with the next rendering.
+
+    Args:
+      rgb: see `SymbolicObservationRenderer.clear`.
+    """
+    self._paint_rgb = rgb
+    self._backdrop = None
+    self._to_paint = []
+
+  def paint_all_of(self, curtain, curtain_version=None):
+    """Note a `Backdrop` curtain to paint; see `SymbolicObservationRenderer`."""
+    self._backdrop = curtain
+    self._backdrop_version = curtain_version
+
+  def paint_sprite(self, character, position, entity):
+    """Note a `Sprite` to paint; see `SymbolicObservationRenderer`."""
+    if character not in self._layers:
+      raise ValueError('character {} does not seem to be a valid character for '
+                       'this game'.format(str(character)))
+    anchors = np.array([tuple(position)], dtype=np.int64)
+    self._to_paint.append((character, entity.img, anchors, None))
+
+  def paint_drape(self, character, curtain, entity):
+    """Note a `Drape` to paint; see `SymbolicObservationRenderer`."""
+    if character not in self._layers:
+      raise ValueError('character {} does not seem to be a valid character for '
+                       'this game'.format(str(character)))
+    del curtain  # Unused; we paint the drape_list, which is usually cached.
+    anchors = entity.drape_list
+    last = self._drape_lists.get(character)
+    if last is None:
+      changed = anchors
+    elif last is anchors or np.array_equal(last, anchors):
+      changed = anchors[:0]
+    else:
+      # Locations in one list but not the other, by flat index.
+      cols = self._symbolic_board.shape[1]
+      changed_flat = np.setxor1d(last[:, 0] * cols + last[:, 1],
+                                 anchors[:, 0] * cols + anchors[:, 1])
+      changed = np.stack(np.divmod(changed_flat, cols), axis=1)
+    self._drape_lists[character] = anchors
+    self._to_paint.append((character, entity.img, anchors, changed))
+
+  def render(self):
+    """Repaint changed tiles and derive an `Observation` from the canvas.
+
+    See `SymbolicObservationRenderer.render` for the reminders that apply to
+    the returned `Observation`.
+
+    Returns:
+      An `Observation` of everything painted since the last call to `clear()`.
+    """
+    dirty = self._find_dirty_tiles()
+    if self._paint_rgb:
+      rgb_tiles = dirty | self._stale_rgb_tiles
+      self._stale_rgb_tiles.fill(False)
+    else:
+      rgb_tiles = None
+      self._stale_rgb_tiles |= dirty
+
+    # Repaint the backdrop, and erase the RGB board, in the affected tiles.
+    for region in self._regions(dirty):
+      self._symbolic_board[region] = self._backdrop[region]
+    if rgb_tiles is not None:
+      for region in self._regions(rgb_tiles):
+        self._board[region] = 0
+
+    # Repaint all Sprites and Drapes, from back to front, in those tiles.
+    tile_size = self._tile_size
+    for character, img, anchors, _ in self._to_paint:
+      if not len(anchors): continue
+      in_dirty = dirty[anchors[:, 0] // tile_size, anchors[:, 1] // tile_size]
+      rows, cols = anchors[in_dirty].T
+      self._symbolic_board[rows, cols] = ord(character)
+
+      if rgb_tiles is None: continue
+      offsets, colors, _, _ = self._footprint(img)
+      coords = (anchors[:, np.newaxis, :] + offsets).reshape(-1, 2)
+      paint = np.all((coords >= 0) & (coords < self._symbolic_board.shape),
+                     axis=1)
+      paint[paint] = rgb_tiles[coords[paint, 0] // tile_size,
+                               coords[paint, 1] // tile_size]
+      rows, cols = coords[paint].T
+      self._board[rows, cols] = np.tile(colors, (len(anchors), 1))[paint]
+
+    # Bring the layers up to date.
+    for region in self._regions(dirty):
+      symbolic = self._symbolic_board[region]
+      for character, layer in six.iteritems(self._layers):
+        np.equal(symbolic, ord(character), out=layer[region])
+
+    self._painted = self._to_paint
+    return Observation(board=self._board, symbolic_board=self._symbolic_board,
+                       layers=self._layers)
+
+  @property
+  def instance_ids(self):
+    """Always None: this renderer doesn't make instance maps."""
+    return None
+
+  @property
+  def footprint_board(self):
+    """Always None: this renderer doesn't make instance maps."""
+    return None
+
+  def _find_dirty_tiles(self):
+    """Compare notes with the last rendering to find the tiles to repaint."""
+    dirty = np.zeros(self._tiles_shape, dtype=np.bool_)
+    if self._painted is None:
+      dirty.fill(True)
+      self._painted_backdrop = np.copy(self._backdrop)
+      self._painted_backdrop_version = self._backdrop_version
+      return dirty
+
+    # Changed backdrop cells, unless the backdrop's version rules them out.
+    # The array_equal check is a quick way out for backdrops that don't note
+    # their changes, but it scans the whole board.
+    if (self._backdrop_version is None or
+        self._backdrop_version != self._painted_backdrop_version):
+      if not np.array_equal(self._painted_backdrop, self._backdrop):
+        rows, cols = np.nonzero(self._painted_backdrop != self._backdrop)
+        dirty[rows // self._tile_size, cols // self._tile_size] = True
+        np.copyto(self._painted_backdrop, self._backdrop)
+      self._painted_backdrop_version = self._backdrop_version
+
+    # If entities have come, gone or changed places in the z-order, we mark
+    # everywhere they were and are now.
+    if [note[0] for note in self._painted] != [
+        note[0] for note in self._to_paint]:
+      for _, img, anchors, _ in self._painted + self._to_paint:
+        self._mark_footprints(dirty, img, anchors)
+      return dirty
+
+    # Otherwise, we only mark the entities, or parts of entities, that changed.
+    for (_, old_img, old_anchors, _), (_, img, anchors, changed) in zip(
+        self._painted, self._to_paint):
+      if old_img is not img:
+        self._mark_footprints(dirty, old_img, old_anchors)
+        self._mark_footprints(dirty, img, anchors)
+      elif changed is not None:
+        self._mark_footprints(dirty, img, changed)
+      elif not np.array_equal(old_anchors, anchors):
+        self._mark_footprints(dirty, img, old_anchors)
+        self._mark_footprints(dirty, img, anchors)
+    return dirty
+
+  def _mark_footprints(self, dirty, img, anchors):
+    """Mark tiles under the bounding boxes of `img` at `anchors` as dirty."""
+    if not len(anchors): return
+    _, _, low, high = self._footprint(img)
+    limit = np.array(self._symbolic_board.shape) - 1
+    first = np.clip(anchors + low, 0, limit) // self._tile_size
+    last = np.clip(anchors + high, 0, limit) // self._tile_size
+    spans = last - first
+    # Footprints rarely span more than a couple of tiles, so we mark them with
+    # one vectorised assignment per tile offset rather than per footprint.
+    for row_offset in six.moves.range(spans[:, 0].max() + 1):
+      for col_offset in six.moves.range(spans[:, 1].max() + 1):
+        mark = (spans[:, 0] >= row_offset) & (spans[:, 1] >= col_offset)
+        dirty[first[mark, 0] + row_offset, first[mark, 1] + col_offset] = True
+
+  def _footprint(self, img):
+    """Cached offsets, colours and bounding box corners of an entity image.
+
+    The bounding box includes the entity's anchor, (0, 0), since the anchor is
+    what gets painted onto the symbolic board.
+    """
+    cached = self._footprints.get(id(img))
+    if cached is None:
+      offsets = np.array(list(img.keys()), dtype=np.int64).reshape(-1, 2)
+      colors = np.array([np.asarray(rgb) for rgb in img.values()],
+                        dtype=np.uint8).reshape(-1, 3)
+      low = np.minimum(offsets.min(axis=0), 0) if len(offsets) else np.zeros(2)
+      high = np.maximum(offsets.max(axis=0), 0) if len(offsets) else np.zeros(2)
+      cached = (offsets, colors, low.astype(np.int64), high.astype(np.int64),
+                img)
+      self._footprints[id(img)] = cached
+    return cached[:4]
+
+  def _regions(self, tiles):
+    """Yield slice pairs for the regions of the canvas under marked `tiles`."""
+    if tiles.all():
+      yield (slice(None), slice(None))
+      return
+    tile_size = self._tile_size
+    for row, col in zip(*np.nonzero(tiles)):
+      yield (slice(row * tile_size, (row + 1) * tile_size),
+             slice(col * tile_size, (col + 1) * tile_size))
+
+
 class BaseUnoccludedObservationRenderer(object):
   """Renderer of "base" pycolab observations.
 
@@ -805,3 +1154,162 @@ class ObservationToFeatureArray(object):
       return self._array
     else:
       return np.transpose(self._array, self._permute)
+
+
+# Structured dtype of the entity records made by `EngineToEntityArray`.
+ENTITY_DTYPE = np.dtype([
+    ('valid', np.bool_),      # False for padding records.
+    ('character', np.uint8),  # ASCII value of the entity's character.
+    ('instance', np.uint16),  # Index of this instance of a `Drape`; 0 if Sprite.
+    ('row', np.int32),        # Row of the entity's anchor (its "centre" pixel).
+    ('col', np.int32),        # Column of the entity's anchor.
+    ('visible', np.bool_),    # Whether the entity is painted on the board.
+    ('height', np.uint16),    # Height of the bounding box of the footprint.
+    ('width', np.uint16),     # Width of the bounding box of the footprint.
+    ('color', np.uint8, (3,)),  # Mean RGB colour of the footprint.
+])
+
+
+class EngineToEntityArray(object):
+  """Derive an object-centric "entity list" observation from an `Engine`.
+
+  Agents that reason about objects often don't need pixels at all: everything
+  they want is already known to the game entities themselves. This class reads
+  it straight from `Engine.things` and emits a 1-D structured numpy array (with
+  dtype `ENTITY_DTYPE`) holding one record per `Sprite` and one record per
+  instance of a `Drape` (i.e. per `True` cell of its curtain, or per entry of
+  `drape_list` for a `LargeDrape`), in z-order. Nothing is painted.
+
+  Sprites are placed at their `virtual_position` if they have one (e.g.
+  `LargerObject`s), and at their `position` otherwise. The footprint size and
+  colour of an entity come from its `img` if it is an `ILarge`; entities
+  without an image are treated as a single black pixel.
+
+  The returned array always has `capacity` records. Records past the last
+  entity are padding, and have their `valid` field set to False. For vector
+  environments, `stack_entity_arrays` can pad several of these arrays to a
+  common capacity and stack them.
+  """
+
+  def __init__(self, capacity, characters=None):
+    """Construct an `EngineToEntityArray`.
+
+    Args:
+      capacity: number of records in the arrays made by this object.
+      characters: an optional iterable of ASCII characters (a string will do);
+          if specified, only entities with these characters are listed.
+
+    Raises:
+      ValueError: `capacity` is less than 1.
+    """
+    if capacity < 1:
+      raise ValueError('An EngineToEntityArray must have room for at least one '
+                       'entity, but capacity was {}.'.format(capacity))
+    self._characters = None if characters is None else set(characters)
+    self._array = np.zeros(capacity, dtype=ENTITY_DTYPE)
+    # Footprint sizes and colours only change if an entity gets a new `img`, so
+    # we cache them, keyed by the identity of the `img` dict.
+    self._footprints = {}
+
+  def __call__(self, engine):
+    """Derives an entity array from the current state of `engine`.
+
+    Note: the returned array should be accessed in a *read-only* manner
+    exclusively; furthermore, if this method is called again, the contents of
+    the array returned in any prior call to this method are *undefined* (i.e.
+    not guaranteed to be anything---could be blank, random garbage, whatever).
+
+    Args:
+      engine: the `Engine` whose entities should be listed.
+
+    Returns:
+      a 1-D numpy array with dtype `ENTITY_DTYPE` as described.
+
+    Raises:
+      RuntimeError: `engine` has more entities than there are records in the
+          array.
+    """
+    array = self._array
+    array['valid'] = False
+    size = 0
+
+    for character, entity in six.iteritems(engine.things):
+      if self._characters is not None and character not in self._characters:
+        continue
+
+      if isinstance(entity, things.Drape):
+        anchors = (entity.drape_list if isinstance(entity, things.LargeDrape)
+                   else np.argwhere(entity.curtain))
+        visible = True
+      else:
+        anchors = [getattr(entity, 'virtual_position', entity.position)]
+        visible = entity.visible
+
+      count = len(anchors)
+      if size + count > len(array):
+        raise RuntimeError(
+            'This EngineToEntityArray has room for {} entities, but the game '
+            'has more than that.'.format(len(array)))
+      if not count: continue
+
+      height, width, color = self._footprint(entity)
+      records = array[size:size + count]
+      records['valid'] = True
+      records['character'] = ord(character)
+      records['instance'] = np.arange(count)
+      records['row'], records['col'] = np.asarray(anchors).reshape(-1, 2).T
+      records['visible'] = visible
+      records['height'] = height
+      records['width'] = width
+      records['color'] = color
+      size += count
+
+    return array
+
+  def _footprint(self, entity):
+    """Height, width, and colour of the footprint of `entity`."""
+    img = getattr(entity, 'img', None)
+    if not img: return 1, 1, (0, 0, 0)
+
+    key = id(img)
+    if key not in self._footprints:
+      offsets = np.array(list(img.keys()))
+      extent = offsets.max(axis=0) - offsets.min(axis=0) + 1
+      color = np.mean([np.asarray(rgb) for rgb in img.values()], axis=0)
+      # Keep a reference to `img` so that its `id` can't be reused.
+      self._footprints[key] = (img, extent[0], extent[1], np.round(color))
+    _, height, width, color = self._footprints[key]
+    return height, width, color
+
+
+def stack_entity_arrays(entity_arrays, capacity=None):
+  """Pad and stack entity arrays into a batch, e.g. for vector environments.
+
+  Args:
+    entity_arrays: a sequence of 1-D arrays with dtype `ENTITY_DTYPE`, such as
+        those made by `EngineToEntityArray`s. They may have different lengths.
+    capacity: number of records per batch element. If unspecified, the length
+        of the longest array in `entity_arrays` is used.
+
+  Returns:
+    A 2-tuple with the following members:
+      * A 2-D array with dtype `ENTITY_DTYPE` and shape
+        `(len(entity_arrays), capacity)`, whose rows are the arrays in
+        `entity_arrays`, padded with invalid records.
+      * A 2-D `np.bool_` array of the same shape; True for valid records.
+
+  Raises:
+    ValueError: one of the `entity_arrays` has valid records beyond `capacity`.
+  """
+  if capacity is None:
+    capacity = max([len(a) for a in entity_arrays] or [0])
+
+  batch = np.zeros((len(entity_arrays), capacity), dtype=ENTITY_DTYPE)
+  for row, entity_array in zip(batch, entity_arrays):
+    if entity_array[capacity:]['valid'].any():
+      raise ValueError('An entity array has valid records beyond the batch '
+                       'capacity of {}.'.format(capacity))
+    length = min(len(entity_array), capacity)
+    row[:length] = entity_array[:length]
+
+  return batch, batch['valid'].copy()
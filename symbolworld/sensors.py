@@ -0,0 +1,161 @@
+# Copyright 2017 the pycolab Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Range sensors: "lidar" features computed from pycolab game boards.
+
+Some agents don't look at images of the game board at all; instead, they see
+how far away things are in a few directions, and what those things are. A
+`RaySensor` computes these features from the `symbolic_board`s of any number
+of games at once, without needing their RGB `board`s, so games whose agents
+only use a `RaySensor` can skip painting them (see the `rgb` argument of
+`Engine.play`):
+
+    sensor = sensors.RaySensor(num_rays=8, max_range=10)
+    observations = [engine.play(action, rgb=False)[0]
+                    for engine, action in zip(engines, actions)]
+    distances, characters = sensor.sense(
+        [o.symbolic_board for o in observations],
+        [engine.things['P'].position for engine in engines])
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+
+
+class RaySensor(object):
+  """Cast rays from positions on game boards to find the nearest things.
+
+  A `RaySensor` casts `num_rays` rays, evenly spaced around the circle and
+  starting with one pointing north (up), then going clockwise. Each ray visits
+  the cells it passes through one at a time, out to `max_range` cells away
+  (in Euclidean distance, counting cells), and stops at the first cell that
+  holds a character other than one of the `transparent` characters. The edge
+  of the board stops rays as well. Cells covered by a `footprint` around the
+  position are skipped, so that an entity doesn't see itself.
+
+  All of the rays for all of the boards are cast at once, with one gather from
+  a stack of padded copies of the boards.
+  """
+
+  # The character reported for rays that stop at the edge of the board, or
+  # that don't hit anything at all.
+  NOTHING = 0
+
+  def __init__(self, num_rays, max_range, transparent=' ', footprint=None):
+    """Initialise a `RaySensor`.
+
+    Args:
+      num_rays: the number of rays to cast from each position.
+      max_range: how far the rays go, in cells.
+      transparent: an indexable of ASCII characters that rays pass through. A
+          string value containing these characters works.
+      footprint: the row, column offsets of the cells to skip around each
+          position, e.g. the keys of a `LargerObject`'s image. By default, just
+          the position itself is skipped.
+
+    Raises:
+      ValueError: `num_rays` or `max_range` is less than 1.
+    """
+    if num_rays < 1 or max_range < 1:
+      raise ValueError('A RaySensor needs at least one ray that goes at least '
+                       'one cell, not {} rays that go {} cells.'.format(
+                           num_rays, max_range))
+    self._num_rays = num_rays
+    self._max_range = max_range
+    self._transparent = np.zeros(256, dtype=bool)
+    self._transparent[[ord(c) for c in transparent]] = True
+
+    # The cells that each ray visits, as offsets from the position, and how
+    # far away they are. Each step along a ray moves one cell in the row or the
+    # column direction, whichever the ray is closer to, so no cell is missed.
+    angles = 2 * np.pi * np.arange(num_rays) / num_rays
+    directions = np.stack([-np.cos(angles), np.sin(angles)], axis=1)
+    directions /= np.abs(directions).max(axis=1, keepdims=True)
+    steps = np.arange(1, int(np.ceil(max_range)) + 1)
+    along = directions[:, np.newaxis, :] * steps[:, np.newaxis]
+    self._offsets = np.round(along).astype(np.int64)
+    self._ranges = np.linalg.norm(along, axis=2).astype(np.float32)
+    self._reach = int(np.abs(self._offsets).max())
+
+    # Cells that don't count: those too far away and those in the footprint.
+    self._ignored = self._ranges > max_range
+    footprint = [(0, 0)] if footprint is None else list(footprint)
+    for drow, dcol in footprint:
+      self._ignored |= np.all(self._offsets == (drow, dcol), axis=2)
+
+    # A stack of padded boards, allocated by `sense`.
+    self._padded = None
+
+  def sense(self, boards, positions):
+    """Cast rays from `positions` on `boards`.
+
+    Args:
+      boards: a `symbolic_board` (a 2-D uint8 character array), or a sequence
+          of `B` of them. The boards may be different sizes.
+      positions: a row, column position on the board, or a sequence of `B` of
+          them, one for each board, or an equivalent `(B, 2)` integer array.
+
+    Returns:
+      a 2-tuple of arrays with one entry for each ray, for each board if there
+      are many: how far the ray went before it stopped (as a float32, or
+      `max_range` if it didn't stop), and the character that stopped it (as a
+      uint8, or `NOTHING`).
+    """
+    single = isinstance(boards, np.ndarray) and boards.ndim == 2
+    if single: boards = [boards]
+    positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+
+    # Copy the boards into the stack of padded boards. Everything outside the
+    # boards is NOTHING, which stops rays just as the edge of the board should.
+    reach = self._reach
+    shape = (len(boards), max(b.shape[0] for b in boards) + 2 * reach,
+             max(b.shape[1] for b in boards) + 2 * reach)
+    if self._padded is None or self._padded.shape != shape:
+      self._padded = np.empty(shape, dtype=np.uint8)
+    padded = self._padded
+    padded.fill(self.NOTHING)
+    for padded_board, board in zip(padded, boards):
+      padded_board[reach:reach + board.shape[0],
+                   reach:reach + board.shape[1]] = board
+
+    # Look at every cell along every ray, and find the first that stops it.
+    cells = positions[:, np.newaxis, np.newaxis, :] + reach + self._offsets
+    characters = padded[np.arange(len(boards))[:, np.newaxis, np.newaxis],
+                        cells[..., 0], cells[..., 1]]
+    stops = ~self._transparent[characters] & ~self._ignored
+    first = np.argmax(stops, axis=2)[..., np.newaxis]
+    stopped = np.take_along_axis(stops, first, axis=2)[..., 0]
+
+    ranges = np.broadcast_to(self._ranges, stops.shape)
+    distances = np.where(stopped,
+                         np.take_along_axis(ranges, first, axis=2)[..., 0],
+                         np.float32(self._max_range))
+    hits = np.where(stopped,
+                    np.take_along_axis(characters, first, axis=2)[..., 0],
+                    np.uint8(self.NOTHING))
+    if single: return distances[0], hits[0]
+    return distances, hits
+
+  @property
+  def num_rays(self):
+    """The number of rays cast from each position."""
+    return self._num_rays
+
+  @property
+  def max_range(self):
+    """How far the rays go, in cells."""
+    return self._max_range
@@ -21,7 +21,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-import collections
+from concurrent import futures
 
 import numpy as np
 
@@ -30,6 +30,7 @@ from pycolab import engine
 from pycolab import things
 
 import six
+from six.moves import collections_abc
 
 
 class Story(object):
@@ -100,9 +101,15 @@ class Story(object):
      discarded. The final reward of all but the very last game is added to the
      first reward of the game that follows it. See documentation for the `play`
      method for further details.
+  3. Building a game can take a while. A story can build the games that are
+     likely to follow the current game in a background thread while the
+     current game is being played, so that switching games is quick. See the
+     `prefetch` argument to `__init__`. Game builders must be thread-safe if
+     you use this feature.
   """
 
-  def __init__(self, chapters, first_chapter=None, croppers=None):
+  def __init__(self, chapters, first_chapter=None, croppers=None,
+               prefetch=False, prefetch_candidates=None):
     """Initialise a Story.
 
     Args:
@@ -122,6 +129,18 @@ class Story(object):
             the corresponding game should not be cropped.
           Note that unlike the human_ui, it's not possible to specify more than
           one cropper per entry in `chapters`.
+      prefetch: If True, then whenever a game starts, the games that are
+          likely to follow it are built (but not started) in a background
+          thread. If the next game turns out to be one of them, it is used
+          instead of building a new one. Builders are called in that thread, so
+          they must be safe to call concurrently with gameplay.
+      prefetch_candidates: Which games are likely to follow a game. Either a
+          callable that takes a key/index of `chapters` and returns an iterable
+          of keys/indices, or a dict with keys/indices of `chapters` as keys and
+          such iterables as values. If None, then when `chapters` is a
+          list/tuple, each game is expected to be followed by the next one in
+          the list; for a dict, no games are prefetched. Games built
+          during prefetching but never played are simply discarded.
 
     Raises:
       ValueError: Arguments to the constructor are malformed, or the games
@@ -130,7 +149,7 @@ class Story(object):
     # If chapters is a list/tuple, the user will expect the game to progress
     # through the games automatically. The user will also expect the game to
     # start on the first list element by default.
-    self._auto_advance = not isinstance(chapters, collections.Mapping)
+    self._auto_advance = not isinstance(chapters, collections_abc.Mapping)
     if self._auto_advance and first_chapter is None: first_chapter = 0
 
     # Argument checking and normalisation. If chapters and croppers were
@@ -147,6 +166,20 @@ class Story(object):
          _check_game_compatibility_and_collect_game_facts(
              self._chapters, self._croppers))
 
+    # Set up prefetching, if desired. Maps keys in self._chapters to futures
+    # for games being built in the background.
+    if prefetch_candidates is None and self._auto_advance:
+      prefetch_candidates = lambda chapter: [chapter + 1]
+    elif prefetch_candidates is None:
+      prefetch_candidates = lambda chapter: []
+    elif isinstance(prefetch_candidates, collections_abc.Mapping):
+      prefetch_candidates = (
+          lambda chapter, candidates=prefetch_candidates: candidates.get(
+              chapter, []))
+    self._prefetch_candidates = prefetch_candidates
+    self._executor = futures.ThreadPoolExecutor(1) if prefetch else None
+    self._prefetched = {}
+
     # Obtain the initial game and its cropper.
     self._current_game = self._chapters[first_chapter]()
     self._current_cropper = self._croppers[first_chapter]
@@ -160,6 +193,9 @@ class Story(object):
       next_ch = plot.this_chapter + 1
       plot.next_chapter = next_ch if next_ch in self._chapters else None
 
+    # Start building the games that could follow the initial game.
+    self._prefetch_successors(first_chapter)
+
     # True iff its_showtime() has been called and the game is underway.
     self._showtime = False
     # True iff the game has terminated. (It's still "showtime", though.)
@@ -428,11 +464,15 @@ class Story(object):
       # it on to the caller.
       if old_plot.next_chapter is None:
         self._game_over = True
+        self._stop_prefetching()
         return observation, reward, discount
 
-      # Otherwise, identify and build the next game.
+      # Otherwise, identify and build the next game, unless it has been built
+      # for us already in the background.
       try:
-        new_game = self._chapters[old_plot.next_chapter]()
+        prefetched = self._prefetched.pop(old_plot.next_chapter, None)
+        new_game = (self._chapters[old_plot.next_chapter]()
+                    if prefetched is None else prefetched.result())
         new_cropper = self._croppers[old_plot.next_chapter]
       except KeyError:
         # This error message seems like it could be misleading in the
@@ -456,10 +496,11 @@ class Story(object):
         next_ch = new_plot.this_chapter + 1
         new_plot.next_chapter = next_ch if next_ch in self._chapters else None
 
-      # The new game is now the current game.
+      # The new game is now the current game. Start building its successors.
       self._current_game = new_game
       self._current_cropper = new_cropper
       self._current_cropper.set_engine(self._current_game)
+      self._prefetch_successors(new_plot.this_chapter)
 
       # Start the new game. This game's first observation and discount replace
       # the observation and discount from the old game, but reward accumulates.
@@ -473,6 +514,34 @@ class Story(object):
       # observation and discount, along with the summed reward.
       if not self._current_game.game_over: return observation, reward, discount
 
+  def _prefetch_successors(self, chapter):
+    """Build games likely to follow `chapter` in the background, if enabled.
+
+    Games already built (or being built) for a previous chapter are kept if
+    they are also candidates to follow `chapter`; the rest are discarded.
+
+    Args:
+      chapter: key/index of the game that has just become the current game.
+    """
+    if self._executor is None: return
+    candidates = [c for c in self._prefetch_candidates(chapter)
+                  if c in self._chapters]
+    prefetched = {c: self._prefetched.pop(c) for c in candidates
+                  if c in self._prefetched}
+    for future in six.itervalues(self._prefetched): future.cancel()
+    for c in candidates:
+      if c not in prefetched:
+        prefetched[c] = self._executor.submit(self._chapters[c])
+    self._prefetched = prefetched
+
+  def _stop_prefetching(self):
+    """Discard all prefetched games and shut down the background thread."""
+    if self._executor is None: return
+    for future in six.itervalues(self._prefetched): future.cancel()
+    self._prefetched = {}
+    self._executor.shutdown(wait=False)
+    self._executor = None
+
 
 def is_fictional(thing):
   """Test whether a `Sprite` or `Drape` is a dummy.
@@ -519,12 +588,12 @@ def _check_and_normalise_story_init_args(chapters, first_chapter, croppers):
 
   # First, if the `chapters` argument is a list or tuple, convert it into a
   # dict, and convert a list/tuple `croppers` argument into a dict as well.
-  if isinstance(chapters, collections.Sequence):
+  if isinstance(chapters, collections_abc.Sequence):
     chapters = dict(enumerate(chapters))
-    if isinstance(croppers, collections.Sequence):
+    if isinstance(croppers, collections_abc.Sequence):
       croppers = dict(enumerate(croppers))
 
-  if not isinstance(chapters, collections.Mapping): raise ValueError(
+  if not isinstance(chapters, collections_abc.Mapping): raise ValueError(
       'The chapters argument to the Story constructor must be either a dict '
       'or a list.')
 
@@ -539,7 +608,7 @@ def _check_and_normalise_story_init_args(chapters, first_chapter, croppers):
   if croppers is None: croppers = cropping.ObservationCropper()
   if isinstance(croppers, cropping.ObservationCropper):
     croppers = {k: croppers for k in chapters.keys()}
-  if (not isinstance(croppers, collections.Mapping) or
+  if (not isinstance(croppers, collections_abc.Mapping) or
       set(chapters.keys()) != set(croppers.keys())): raise ValueError(
           'Since the croppers argument to the Story constructor was not None '
           'or a single ObservationCropper, it must be a collection with the '
@@ -592,7 +661,8 @@ def _check_game_compatibility_and_collect_game_facts(chapters, croppers):
     observation, _, _ = game.its_showtime()
 
     # Save the shape of the current observation.
-    observation_shapes.add(tuple(cropper.crop(observation).board.shape))
+    observation_shapes.add(
+        tuple(cropper.crop(observation).symbolic_board.shape))
     # Save the ways that the engine uses characters.
     chars_backdrops.update(game.backdrop.palette)
     for char, thing in six.iteritems(game.things):
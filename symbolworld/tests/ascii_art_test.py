@@ -24,7 +24,10 @@ from __future__ import print_function
 import sys
 import unittest
 
+import numpy as np
+
 from pycolab import ascii_art
+from pycolab.tests import test_things as tt
 
 import six
 
@@ -58,6 +61,44 @@ class AsciiArtTest(unittest.TestCase):
         TypeError, 'Did you pass a list of list of single characters?'):
       _ = ascii_art.ascii_art_to_uint8_nparray(art)
 
+  def testCompiledGameSpec(self):
+    """Game templates build the same games as `ascii_art_to_game`."""
+    spec = dict(sprites={'P': ascii_art.Partial(tt.TestLargerObject,
+                                                impassable='#')},
+                drapes={'G': tt.TestLargeDrape},
+                update_schedule='GP', z_order='PG')
+    template = ascii_art.compile_game_spec(' ', **spec)
+
+    for art in [['#####',
+                 '#P G#',
+                 '#####'],
+                ['#G#',
+                 '#G#',
+                 '#P#']]:
+      expected, _, _ = ascii_art.ascii_art_to_game(
+          art, ' ', **spec).its_showtime()
+      engine = template.instantiate(art)
+      actual, _, _ = engine.its_showtime()
+      self.assertEqual(engine.z_order, ['P', 'G'])
+      np.testing.assert_array_equal(actual.symbolic_board,
+                                    expected.symbolic_board)
+      np.testing.assert_array_equal(actual.board, expected.board)
+
+      # Art can also be a numpy array, which is left unchanged.
+      art_array = ascii_art.ascii_art_to_uint8_nparray(art)
+      actual, _, _ = template.instantiate(art_array).its_showtime()
+      np.testing.assert_array_equal(actual.symbolic_board,
+                                    expected.symbolic_board)
+      np.testing.assert_array_equal(art_array,
+                                    ascii_art.ascii_art_to_uint8_nparray(art))
+
+    # Spec errors are caught by compile_game_spec, art errors by instantiate.
+    with self.assertRaises(ValueError):
+      ascii_art.compile_game_spec(' ', sprites={'P': tt.TestLargerObject},
+                                  z_order='PQ')
+    with self.assertRaises(ValueError):
+      template.instantiate(['PP G'])
+
 
 def main(argv=()):
   del argv  # Unused.
@@ -0,0 +1,94 @@
+# Copyright 2017 the pycolab Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests of the benchmark runner in `benchmarks/run.py`."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import sys
+import unittest
+
+from pycolab import ascii_art
+from pycolab.benchmarks import games
+from pycolab.benchmarks import run
+from pycolab.tests import test_things as tt
+
+
+def _make_episode(rng):
+  del rng  # Unused.
+  return games.EngineEpisode(ascii_art.ascii_art_to_game(
+      art=['#####',
+           '#P  #',
+           '#####'],
+      what_lies_beneath=' ',
+      sprites=dict(P=ascii_art.Partial(tt.TestLargerObject, impassable='#'))))
+
+
+class BenchmarksTest(unittest.TestCase):
+
+  def testRunBenchmark(self):
+    benchmark = games.Benchmark('corridor', _make_episode, ['e', 'w'])
+    result = run.run_benchmark(benchmark, steps=20, memory_steps=5)
+    self.assertEqual(result['steps'], 20)
+    self.assertEqual(result['episodes'], 1)  # The game never ends.
+    self.assertGreater(result['steps_per_sec'], 0)
+    self.assertLessEqual(result['step_p50_ms'], result['step_p99_ms'])
+    self.assertGreater(result['reset_mean_ms'], 0)
+    if sys.version_info >= (3,):  # No tracemalloc in Python 2.
+      self.assertGreater(result['peak_memory_bytes'], 0)
+
+  def testCompare(self):
+    baseline = {'results': {
+        'a': {'steps_per_sec': 100.0, 'step_p50_ms': 1.0, 'step_p99_ms': 2.0,
+              'reset_mean_ms': 5.0, 'peak_memory_bytes': 1000},
+        'b': {'steps_per_sec': 100.0},
+        'c': {'error': 'Broken.'},
+        'd': {'steps_per_sec': 100.0},
+        'e': {'skipped': 'Broken.'}}}
+    candidate = {'results': {
+        'a': {'steps_per_sec': 80.0, 'step_p50_ms': 1.05, 'step_p99_ms': 1.0,
+              'reset_mean_ms': 6.0, 'peak_memory_bytes': 1000},
+        'b': {'error': 'Broken now.'},
+        'c': {'steps_per_sec': 1.0},
+        'd': {'skipped': 'Broken now.'},
+        'e': {'steps_per_sec': 1.0}}}
+
+    regressions = run.compare(baseline, candidate, tolerance=0.1)
+    self.assertEqual(
+        [(r.benchmark, r.metric) for r in regressions],
+        [('a', 'steps_per_sec'), ('a', 'reset_mean_ms'), ('b', 'error'),
+         ('d', 'skipped')])
+    self.assertAlmostEqual(regressions[0].change, 0.2)
+    self.assertAlmostEqual(regressions[1].change, 0.2)
+
+    # Nothing compares worse to itself.
+    self.assertEqual(run.compare(baseline, baseline), [])
+
+  def testSkipped(self):
+    # Skipped benchmarks report why, unless they're asked for by name.
+    self.assertTrue(set(games.SKIPPED).issubset(games.BENCHMARKS))
+    name = next(iter(games.SKIPPED))
+    results = run.run_suite([name], steps=1, memory_steps=0)['results']
+    self.assertNotIn('skipped', results[name])
+
+
+def main(argv=()):
+  del argv  # Unused.
+  unittest.main()
+
+
+if __name__ == '__main__':
+  main(sys.argv)
@@ -21,6 +21,8 @@ from __future__ import print_function
 import sys
 import unittest
 
+import numpy as np
+
 from pycolab import ascii_art
 from pycolab import cropping
 from pycolab import things as plab_things
@@ -654,6 +656,229 @@ class CroppingTest(tt.PycolabTestCase):
     # pylint: enable=bad-whitespace
 
 
+  def testRgbCropping(self):
+    """Croppers crop RGB boards and symbolic boards, copying only at edges."""
+    engine = ascii_art.ascii_art_to_game(
+        art=['#####',
+             '#P  #',
+             '#   #',
+             '#####'],
+        what_lies_beneath=' ',
+        sprites={'P': ascii_art.Partial(tt.TestLargerObject, impassable='#')})
+    observation, _, _ = engine.its_showtime()
+
+    # A window inside the board is a view of the observation.
+    inside = cropping.FixedCropper((1, 1), 2, 3)
+    inside.set_engine(engine)
+    cropped = inside.crop(observation)
+    self.assertBoard(cropped.symbolic_board, ['P  ',
+                                              '   '])
+    self.assertEqual(cropped.board.shape, (2, 3, 3))
+    np.testing.assert_array_equal(cropped.board[0, 0], tt.TEST_IMG[0, 0])
+    self.assertTrue(np.shares_memory(cropped.board, observation.board))
+    self.assertTrue(np.shares_memory(cropped.symbolic_board,
+                                     observation.symbolic_board))
+    self.assertTrue(np.shares_memory(cropped.layers['P'],
+                                     observation.layers['P']))
+
+    # A window over the edge is padded. The RGB padding is black.
+    engine = ascii_art.ascii_art_to_game(
+        art=['P   ',
+             '   #'],
+        what_lies_beneath=' ',
+        sprites={'P': tt.TestLargerObject})
+    observation, _, _ = engine.its_showtime()
+    edge = cropping.ScrollingCropper(rows=3, cols=3, to_track=['P'],
+                                     pad_char='#', scroll_margins=(None, None))
+    edge.set_engine(engine)
+    cropped = edge.crop(observation)
+    self.assertBoard(cropped.symbolic_board, ['###',
+                                              '#P ',
+                                              '#  '])
+    self.assertFalse(np.shares_memory(cropped.board, observation.board))
+    np.testing.assert_array_equal(cropped.board[1, 1], tt.TEST_IMG[0, 0])
+    np.testing.assert_array_equal(cropped.board[0], 0)
+    np.testing.assert_array_equal(cropped.layers['#'], [[1, 1, 1],
+                                                        [1, 0, 0],
+                                                        [1, 0, 0]])
+
+    # Padding stays correct as the window moves across the edge.
+    for action, art in [('e', ['###',
+                               ' P ',
+                               '   ']),
+                        ('s', ['   ',
+                               ' P ',
+                               '###']),
+                        ('e', ['   ',
+                               ' P#',
+                               '###'])]:
+      observation, _, _ = engine.play(action)
+      self.assertBoard(edge.crop(observation).symbolic_board, art)
+
+  def testCharacterBoardPadding(self):
+    """2-D character boards are padded with the pad character, not NUL."""
+    engine = ascii_art.ascii_art_to_game(
+        art=['P   ',
+             '   #'],
+        what_lies_beneath=' ',
+        sprites={'P': tt.TestLargerObject})
+    observation, _, _ = engine.its_showtime()
+    observation = observation._replace(board=observation.symbolic_board)
+    cropper = cropping.FixedCropper((-1, -1), rows=3, cols=3, pad_char='#')
+    cropper.set_engine(engine)
+    self.assertBoard(cropper.crop(observation).board, ['###',
+                                                       '#P ',
+                                                       '#  '])
+    # The padding is also right when only the strips around the copy change.
+    cropper = cropping.ScrollingCropper(rows=3, cols=3, to_track=['P'],
+                                        pad_char='#',
+                                        scroll_margins=(None, None))
+    cropper.set_engine(engine)
+    self.assertBoard(cropper.crop(observation).board, ['###',
+                                                       '#P ',
+                                                       '#  '])
+    observation, _, _ = engine.play('e')
+    observation = observation._replace(board=observation.symbolic_board)
+    self.assertBoard(cropper.crop(observation).board, ['###',
+                                                       ' P ',
+                                                       '   '])
+
+
+  def testBatchCropping(self):
+    """Batch croppers make the same windows as one cropper per window."""
+    engine = ascii_art.ascii_art_to_game(
+        art=['#####',
+             '#P  #',
+             '#   #',
+             '#####'],
+        what_lies_beneath=' ',
+        sprites={'P': tt.TestLargerObject})
+    observation, _, _ = engine.its_showtime()
+
+    corners = [(0, 0), (1, 2), (-2, 3), (3, -1), (-9, 9)]
+    batch_cropper = cropping.BatchCropper(3, 3, pad_char='#')
+    batch_cropper.set_engine(engine)
+    batch = batch_cropper.crop(observation, corners)
+    self.assertEqual(batch.board.shape, (5, 3, 3, 3))
+    self.assertEqual(batch.symbolic_board.shape, (5, 3, 3))
+
+    for i, corner in enumerate(corners):
+      cropper = cropping.FixedCropper(corner, 3, 3, pad_char='#')
+      cropper.set_engine(engine)
+      cropped = cropper.crop(observation)
+      np.testing.assert_array_equal(batch.board[i], cropped.board)
+      np.testing.assert_array_equal(batch.symbolic_board[i],
+                                    cropped.symbolic_board)
+      for char, layer in cropped.layers.items():
+        np.testing.assert_array_equal(batch.layers[char][i], layer)
+
+    # 2-D character boards are padded like the symbolic board.
+    batch = batch_cropper.crop(
+        observation._replace(board=observation.symbolic_board), corners)
+    np.testing.assert_array_equal(batch.board, batch.symbolic_board)
+
+    # Scrolling croppers can supply the window corners.
+    tracker = cropping.ScrollingCropper(rows=3, cols=3, to_track=['P'],
+                                        pad_char='#',
+                                        scroll_margins=(None, None))
+    tracker.set_engine(engine)
+    batch = batch_cropper.crop(observation, [tracker.track()])
+    self.assertBoard(batch.symbolic_board[0], ['###',
+                                               '#P ',
+                                               '#  '])
+
+    # Without a pad character, windows must stay inside the observation.
+    batch_cropper = cropping.BatchCropper(3, 3)
+    batch_cropper.set_engine(engine)
+    with self.assertRaises(RuntimeError):
+      batch_cropper.crop(observation, [(0, 0), (2, 0)])
+
+
+  def testFieldOfView(self):
+    """Field-of-view croppers hide what walls and distance keep out of sight."""
+    engine = ascii_art.ascii_art_to_game(
+        art=['#######',
+             '#P #  #',
+             '#     #',
+             '#######'],
+        what_lies_beneath=' ',
+        sprites={'P': ascii_art.Partial(tt.TestLargerObject, impassable='#')})
+    observation, _, _ = engine.its_showtime()
+
+    viewer = cropping.FieldOfViewCropper('P', pad_char='#')
+    viewer.set_engine(engine)
+    cropped = viewer.crop(observation)
+    np.testing.assert_array_equal(viewer.visible, [[1, 1, 1, 1, 0, 0, 0],
+                                                   [1, 1, 1, 1, 0, 0, 0],
+                                                   [1, 1, 1, 1, 1, 1, 1],
+                                                   [1, 1, 1, 1, 1, 0, 0]])
+    self.assertBoard(cropped.symbolic_board, ['#######',
+                                              '#P ####',
+                                              '#     #',
+                                              '#######'])
+    np.testing.assert_array_equal(cropped.layers[' '],
+                                  cropped.symbolic_board == ord(' '))
+    self.assertEqual(cropped.board.shape, observation.board.shape)
+    np.testing.assert_array_equal(cropped.board[1, 1], tt.TEST_IMG[0, 0])
+    np.testing.assert_array_equal(cropped.board[~viewer.visible], 0)
+
+    # The visible cells are only worked out again when the viewer moves.
+    visible = viewer.visible
+    viewer.crop(observation)
+    self.assertIs(viewer.visible, visible)
+    observation, _, _ = engine.play('s')
+    viewer.crop(observation)
+    self.assertFalse(viewer.visible[1, 4])
+    self.assertTrue(viewer.visible[2].all())
+
+    # A radius hides cells that are too far away.
+    viewer = cropping.FieldOfViewCropper('P', pad_char='#', radius=1.5)
+    viewer.set_engine(engine)
+    self.assertBoard(viewer.crop(observation).symbolic_board, ['#######',
+                                                               '#  ####',
+                                                               '#P ####',
+                                                               '#######'])
+
+  def testLargeEntityTracking(self):
+    """Scrolling croppers track footprints and instances of large entities."""
+    engine = ascii_art.ascii_art_to_game(
+        art=['P.........',
+             '..........',
+             '.....G....',
+             '.........G',
+             '..........'],
+        what_lies_beneath='.',
+        sprites={'P': ascii_art.Partial(
+            tt.TestLargerObject,
+            img={(0, 0): (1, 1, 1), (0, 1): (1, 1, 1), (0, 2): (1, 1, 1),
+                 (1, 1): (1, 1, 1), (2, 1): (1, 1, 1)})},
+        drapes={'G': tt.TestLargeDrape})
+    observation, _, _ = engine.its_showtime()
+
+    # The sprite's footprint centroid is one cell down and right of it.
+    tracker = cropping.ScrollingCropper(rows=3, cols=3, to_track=['P'],
+                                        pad_char='.',
+                                        scroll_margins=(None, None))
+    tracker.set_engine(engine)
+    self.assertEqual(tracker.track(), (0, 0))
+
+    # The drape tracker keeps following one instance for as long as it lasts,
+    # then jumps to the instance nearest to it.
+    tracker = cropping.ScrollingCropper(rows=3, cols=3, to_track=['G'],
+                                        pad_char='.',
+                                        scroll_margins=(None, None))
+    tracker.set_engine(engine)
+    self.assertEqual(tracker.track(), (1, 4))
+    engine.things['G'].curtain[3, 9] = False
+    self.assertEqual(tracker.track(), (1, 4))
+    engine.things['G'].curtain[4, 0] = True
+    engine.things['G'].curtain[2, 5] = False
+    engine.things['G'].curtain[0, 9] = True
+    self.assertEqual(tracker.track(), (-1, 8))
+    engine.things['G'].curtain[:] = False
+    self.assertEqual(tracker.track(), (-1, 8))
+
+
 def main(argv=()):
   del argv  # Unused.
   unittest.main()
@@ -0,0 +1,145 @@
+# Copyright 2017 the pycolab Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests of the trajectory loader in `datasets.py`."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+from pycolab import datasets
+from pycolab import recording
+from pycolab.tests import recording_test
+
+
+# Like recording_test.LEVELS[1], but as wide as recording_test.LEVELS[0]: all
+# episodes in a batch must have boards of the same size.
+LEVEL = ['#######',
+         '#G   P#',
+         '#######']
+
+
+class DatasetsTest(unittest.TestCase):
+
+  def setUp(self):
+    super(DatasetsTest, self).setUp()
+    self._directory = tempfile.mkdtemp()
+    # Three episodes of 6, 5 and 3 steps.
+    recorder = recording.EpisodeRecorder(self._directory)
+    for level, actions in [(recording_test.LEVELS[0], [1, 0, 1, 1, 1, 1]),
+                           (LEVEL, [1, 0, 0, 0, 0]),
+                           (recording_test.LEVELS[0], [0, 1, 0])]:
+      engine = recorder.recording_engine(recording_test.make_game(level),
+                                         level)
+      engine.its_showtime()
+      for action in actions: engine.play(action)
+    recorder.close()
+
+  def tearDown(self):
+    shutil.rmtree(self._directory)
+    super(DatasetsTest, self).tearDown()
+
+  def testEpisode(self):
+    loader = datasets.TrajectoryLoader(self._directory,
+                                       recording_test.make_game, batch_size=4)
+    self.assertEqual(len(loader), 3)
+    episode = loader.episode(1)
+    self.assertEqual(episode.observations.shape, (5, 3, 7))
+    np.testing.assert_array_equal(episode.actions, [1, 0, 0, 0, 0])
+    np.testing.assert_array_equal(episode.rewards, [0, 0, 0, 0, 1])
+    np.testing.assert_array_equal(episode.dones, [False] * 4 + [True])
+    # Each observation is the last one's next observation.
+    np.testing.assert_array_equal(episode.observations[1:],
+                                  episode.next_observations[:-1])
+    self.assertEqual(chr(episode.next_observations[-1][1, 1]), 'P')
+
+  def testBatches(self):
+    loader = datasets.TrajectoryLoader(self._directory,
+                                       recording_test.make_game, batch_size=4,
+                                       num_workers=2, prefetch=2)
+    batches = list(loader.batches())
+    self.assertEqual([len(batch.actions) for batch in batches], [4, 4, 4, 2])
+    np.testing.assert_array_equal(
+        np.concatenate([batch.actions for batch in batches]),
+        [1, 0, 1, 1, 1, 1] + [1, 0, 0, 0, 0] + [0, 1, 0])
+    np.testing.assert_array_equal(
+        np.concatenate([batch.dones for batch in batches]).nonzero()[0],
+        [5, 10])
+
+    # Shuffled episodes still give every transition once, in full batches.
+    loader = datasets.TrajectoryLoader(
+        self._directory, recording_test.make_game, batch_size=4,
+        observation='layers', characters='PG', shuffle=True, seed=1,
+        drop_remainder=True)
+    batches = list(loader)
+    self.assertEqual(len(batches), 3)
+    self.assertEqual(batches[0].observations.shape, (4, 2, 3, 7))
+    self.assertEqual(batches[0].observations.dtype, np.bool_)
+
+  def testRgb(self):
+    loader = datasets.TrajectoryLoader(self._directory,
+                                       recording_test.make_game, batch_size=2,
+                                       observation='rgb')
+    batch = next(loader.batches(episodes=[2]))
+    self.assertEqual(batch.observations.shape, (2, 3, 7, 3))
+
+  def testWorkersAgree(self):
+    # Replaying gridworld episodes in parallel gives the same levels and
+    # colours as replaying them one at a time.
+    try:
+      from pycolab import level_generator  # pylint: disable=g-import-not-at-top
+      from pycolab.envs import symbolic_gridworld  # pylint: disable=g-import-not-at-top
+    except ImportError:
+      self.skipTest('The symbolic gridworld needs gym and PyQt5.')
+
+    directory = tempfile.mkdtemp()
+    self.addCleanup(shutil.rmtree, directory)
+    recorder = recording.EpisodeRecorder(directory)
+    rng = np.random.RandomState(0)
+    for seed in range(6):
+      level = level_generator.generate_level(seed)
+      engine = recorder.recording_engine(
+          symbolic_gridworld.make_replay_game(level, seed), level, seed)
+      engine.its_showtime()
+      for _ in range(20):
+        engine.play(rng.randint(4))
+        if engine.game_over: break
+      if not engine.game_over: recorder.end_episode()
+    recorder.close()
+
+    def read(num_workers):
+      loader = datasets.TrajectoryLoader(
+          directory, symbolic_gridworld.make_replay_game, batch_size=16,
+          observation='rgb', num_workers=num_workers, prefetch=6)
+      return list(loader.batches())
+
+    for serial, parallel in zip(read(1), read(4)):
+      for serial_field, parallel_field in zip(serial, parallel):
+        np.testing.assert_array_equal(serial_field, parallel_field)
+
+
+def main(argv=()):
+  del argv  # Unused.
+  unittest.main()
+
+
+if __name__ == '__main__':
+  main(sys.argv)
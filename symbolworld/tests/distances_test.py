@@ -0,0 +1,138 @@
+# Copyright 2017 the pycolab Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests of the distance field protocol."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import sys
+import unittest
+
+import numpy as np
+
+from pycolab import plot
+from pycolab.protocols import distances
+
+
+X = distances.UNREACHABLE
+
+
+def _board(art):
+  return np.array([list(row) for row in art]).view(np.uint32).astype(np.uint8)
+
+
+class DistancesTest(unittest.TestCase):
+
+  def setUp(self):
+    super(DistancesTest, self).setUp()
+    self._plot = plot.Plot()
+
+  def testDistanceField(self):
+    board = _board(['  #  ',
+                    ' P# #',
+                    '     '])
+    field = distances.distance_field(self._plot, board, 'P', '#')
+    np.testing.assert_array_equal(field, [[2, 1, X, 5, 6],
+                                          [1, 0, X, 4, X],
+                                          [2, 1, 2, 3, 4]])
+    with self.assertRaises(ValueError):
+      field[0, 0] = 0
+
+    # Positions where a two-cell-wide footprint would cover a wall, or leave
+    # the board, are unreachable.
+    field = distances.distance_field(self._plot, board, 'P', '#',
+                                     footprint=[(0, -1)])
+    np.testing.assert_array_equal(field, [[X, 1, X, X, X],
+                                          [X, 0, X, X, X],
+                                          [X, 1, 2, 3, 4]])
+
+    # Targets may also be positions, if they have a name.
+    field = distances.distance_field(self._plot, board, [(0, 4), (2, 0)], '#',
+                                     name='corners')
+    np.testing.assert_array_equal(field, [[2, 3, X, 1, 0],
+                                          [1, 2, X, 2, X],
+                                          [0, 1, 2, 3, 4]])
+    with self.assertRaises(ValueError):
+      distances.distance_field(self._plot, board, [(0, 4)], '#')
+
+  def testIncrementalUpdates(self):
+    # Opening and closing walls at random gives the same fields as computing
+    # them from scratch.
+    rng = np.random.RandomState(0)
+    board = np.where(rng.rand(15, 20) < 0.3, ord('#'), ord(' ')).astype(
+        np.uint8)
+    board[7, 10] = ord('P')
+    for _ in range(50):
+      row, col = rng.randint(15), rng.randint(20)
+      if board[row, col] != ord('P'):
+        board[row, col] = ord(' ') if board[row, col] == ord('#') else ord('#')
+      field = distances.distance_field(self._plot, board, 'P', '#',
+                                       footprint=[(0, 1), (1, 0)])
+      expected = distances.distance_field(plot.Plot(), board, 'P', '#',
+                                          footprint=[(0, 1), (1, 0)])
+      np.testing.assert_array_equal(field, expected)
+
+  def testDownhill(self):
+    board = _board(['  #  ',
+                    ' P# #',
+                    '     '])
+    field = distances.distance_field(self._plot, board, 'P', '#')
+    self.assertEqual(distances.downhill(field, (0, 4)), (0, -1))
+    np.testing.assert_array_equal(
+        distances.downhill(field, np.array([[2, 2], [1, 1], [0, 0]])),
+        [[0, -1], [0, 0], [1, 0]])
+
+  def testLegalMotions(self):
+    board = _board(['#####',
+                    '#  ##',
+                    '# P #',
+                    '#####'])
+    np.testing.assert_array_equal(
+        distances.passable(self._plot, board, '#', footprint=[(0, 1)]),
+        [[0, 0, 0, 0, 0],
+         [0, 1, 0, 0, 0],
+         [0, 1, 1, 0, 0],
+         [0, 0, 0, 0, 0]])
+
+    # North, south, west, east, and the four diagonals.
+    motions = [(-1, 0), (1, 0), (0, -1), (0, 1),
+               (-1, -1), (-1, 1), (1, -1), (1, 1)]
+    np.testing.assert_array_equal(
+        distances.legal_motions(self._plot, board, (2, 2), '#',
+                                motions=motions),
+        [1, 0, 1, 1, 1, 0, 0, 0])
+    board[1, 3] = ord(' ')
+    np.testing.assert_array_equal(
+        distances.legal_motions(self._plot, board, [(2, 2), (1, 1)], '#',
+                                motions=motions),
+        [[1, 0, 1, 1, 1, 1, 0, 0],
+         [0, 1, 0, 1, 0, 0, 0, 1]])
+
+    # Diagonal motions can't squeeze between two walls.
+    board[1, 2] = board[2, 3] = ord('#')
+    np.testing.assert_array_equal(
+        distances.legal_motions(self._plot, board, (2, 2), '#',
+                                motions=motions),
+        [0, 0, 1, 0, 1, 0, 0, 0])
+
+
+def main(argv=()):
+  del argv  # Unused.
+  unittest.main()
+
+
+if __name__ == '__main__':
+  main(sys.argv)
@@ -0,0 +1,219 @@
+# Copyright 2017 the pycolab Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests of the `TranslatingDrape` and `SpriteSwarm` prefabs."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import sys
+import unittest
+
+import numpy as np
+
+from pycolab import ascii_art
+from pycolab.prefab_parts import drapes as prefab_drapes
+from pycolab.tests import test_things as tt
+
+
+class SwarmDrape(prefab_drapes.TranslatingDrape, tt.TestLargeDrape):
+  """Moves in the direction of string actions, and is zapped by tuples."""
+
+  _MOTIONS = {'n': (-1, 0), 'e': (0, 1), 's': (1, 0), 'w': (0, -1)}
+
+  def real_update(self, actions, board, layers, backdrop, things, the_plot):
+    if isinstance(actions, str):
+      self._translate(*self._MOTIONS[actions])
+    elif actions is not None:
+      the_plot['hits'] = self._remove_at(actions)
+
+
+class TranslatingDrapeTest(tt.PycolabTestCase):
+
+  def setUp(self):
+    super(TranslatingDrapeTest, self).setUp()
+    self._engine = ascii_art.ascii_art_to_game(
+        art=['X X  ',
+             ' X   ',
+             '     '],
+        what_lies_beneath=' ', drapes={'X': SwarmDrape})
+
+  def testTranslation(self):
+    engine = self._engine
+    self.assertBoard(engine.its_showtime()[0].symbolic_board,
+                     ['X X  ',
+                      ' X   ',
+                      '     '])
+    self.assertBoard(engine.play('e')[0].symbolic_board,
+                     [' X X ',
+                      '  X  ',
+                      '     '])
+    # Instances moved off the board aren't shown, but still exist.
+    engine.play('n')
+    observation = engine.play('w')[0]
+    self.assertBoard(observation.symbolic_board,
+                     [' X   ',
+                      '     ',
+                      '     '])
+    swarm = engine.things['X']
+    self.assertEqual(swarm.offset, (-1, 0))
+    self.assertEqual(swarm.num_instances, 3)
+    np.testing.assert_array_equal(swarm.drape_list, [[0, 1]])
+    np.testing.assert_array_equal(swarm.curtain, observation.layers['X'])
+    self.assertBoard(engine.play('s')[0].symbolic_board,
+                     ['X X  ',
+                      ' X   ',
+                      '     '])
+
+  def testRemoval(self):
+    engine = self._engine
+    engine.its_showtime()
+    engine.play('s')
+    # Zap two places with instances, one without, and one off the board.
+    observation = engine.play([(1, 2), (2, 1), (0, 0), (-1, -1)])[0]
+    np.testing.assert_array_equal(engine.the_plot['hits'],
+                                  [True, True, False, False])
+    self.assertBoard(observation.symbolic_board,
+                     ['     ',
+                      'X    ',
+                      '     '])
+    swarm = engine.things['X']
+    self.assertEqual(swarm.num_instances, 1)
+    # Removed instances stay removed after moving.
+    self.assertBoard(engine.play('e')[0].symbolic_board,
+                     ['     ',
+                      ' X   ',
+                      '     '])
+    self.assertEqual(prefab_drapes.TranslatingDrape._remove_masked(
+        swarm, swarm.curtain), 1)
+    self.assertEqual(swarm.num_instances, 0)
+    self.assertFalse(swarm.curtain.any())
+
+
+class MarchingSwarm(prefab_drapes.SpriteSwarm, tt.TestDrape):
+  """A two-cell-tall `SpriteSwarm` driven by the actions under its character.
+
+  Actions are tuples: ('move', motions) moves the swarm (motions may be None),
+  ('kill', members) kills members, and ('touch',) checks for contact with the
+  Sprite 'P'. The results of moving and touching go in the Plot.
+  """
+
+  def __init__(self, curtain, character, impassable='#'):
+    super(MarchingSwarm, self).__init__(
+        {(0, 0): (0, 0, 255), (1, 0): (0, 255, 0)}, curtain, character,
+        impassable)
+    self._set_velocities((0, 1))
+
+  def real_update(self, actions, board, layers, backdrop, things, the_plot):
+    action = actions.get(self.character) if isinstance(actions, dict) else None
+    if action is None: return
+    if action[0] == 'move':
+      the_plot['blocked'] = self._move(board, action[1])
+    elif action[0] == 'kill':
+      self._kill(action[1])
+    elif action[0] == 'touch':
+      the_plot['touching'] = self._touching(things['P'])
+
+
+class SpriteSwarmTest(tt.PycolabTestCase):
+
+  def setUp(self):
+    super(SpriteSwarmTest, self).setUp()
+    self._engine = ascii_art.ascii_art_to_game(
+        art=['#######',
+             '#A   A#',
+             '#     #',
+             '#  P  #',
+             '#######'],
+        what_lies_beneath=' ',
+        sprites={'P': tt.TestLargerObject},
+        drapes={'A': MarchingSwarm},
+        update_schedule=['P', 'A'])
+
+  def testMotion(self):
+    engine = self._engine
+    engine.its_showtime()
+    swarm = engine.things['A']
+    np.testing.assert_array_equal(swarm.velocities, [[0, 1], [0, 1]])
+
+    # The member on the right runs into the wall.
+    observation = engine.play({'A': ('move', None)})[0]
+    np.testing.assert_array_equal(engine.the_plot['blocked'], [False, True])
+    self.assertBoard(observation.symbolic_board,
+                     ['#######',
+                      '# A  A#',
+                      '#     #',
+                      '#  P  #',
+                      '#######'])
+
+    # Only the member on the right moves, twice; the footprint of a member
+    # counts for obstruction, not just its position.
+    engine.play({'A': ('move', [[0, 0], [1, 0]])})
+    observation = engine.play({'A': ('move', [[0, 0], [1, 0]])})[0]
+    np.testing.assert_array_equal(engine.the_plot['blocked'], [False, True])
+    np.testing.assert_array_equal(swarm.positions, [[1, 2], [2, 5]])
+    np.testing.assert_array_equal(swarm.curtain, observation.layers['A'])
+
+    # Both members of the swarm are painted with the swarm's image.
+    np.testing.assert_array_equal(observation.board[2, 5], (0, 0, 255))
+    np.testing.assert_array_equal(observation.board[3, 5], (0, 255, 0))
+    np.testing.assert_array_equal(observation.board[2, 2], (0, 255, 0))
+
+    # The read-only state can't be changed from outside.
+    with self.assertRaises(ValueError):
+      swarm.positions[0, 0] = 0
+
+  def testKillingAndTouching(self):
+    engine = self._engine
+    engine.its_showtime()
+    engine.play({'A': ('move', (1, 0))})
+    engine.play({'A': ('touch',)})
+    np.testing.assert_array_equal(engine.the_plot['touching'], [False, False])
+
+    # The member on the left moves onto the player.
+    engine.play({'A': ('move', [[0, 1], [0, 0]])})
+    engine.play({'A': ('move', [[0, 1], [0, 0]])})
+    engine.play({'A': ('touch',)})
+    np.testing.assert_array_equal(engine.the_plot['touching'], [True, False])
+
+    # Dead members don't touch anything, don't move, and aren't painted.
+    engine.play({'A': ('kill', [0])})
+    engine.play({'A': ('touch',)})
+    np.testing.assert_array_equal(engine.the_plot['touching'], [False, False])
+    observation = engine.play({'A': ('move', (0, -1))})[0]
+    np.testing.assert_array_equal(engine.things['A'].positions,
+                                  [[2, 3], [2, 4]])
+    self.assertBoard(observation.symbolic_board,
+                     ['#######',
+                      '#     #',
+                      '#   A #',
+                      '#  P  #',
+                      '#######'])
+    np.testing.assert_array_equal(engine.things['A'].drape_list, [[2, 4]])
+
+  def testOwnCharacterImpassable(self):
+    with self.assertRaises(ValueError):
+      ascii_art.ascii_art_to_game(
+          art=['A#'], what_lies_beneath=' ',
+          drapes={'A': ascii_art.Partial(MarchingSwarm, impassable='#A')})
+
+
+def main(argv=()):
+  del argv  # Unused.
+  unittest.main()
+
+
+if __name__ == '__main__':
+  main(sys.argv)
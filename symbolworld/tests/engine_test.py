@@ -28,7 +28,10 @@ import numpy as np
 import sys
 import unittest
 
+import six
+
 from pycolab import ascii_art
+from pycolab import hashing
 from pycolab import rendering
 from pycolab import things as plab_things
 from pycolab.tests import test_things as tt
@@ -639,6 +642,372 @@ class EngineTest(tt.PycolabTestCase):
     self.assertBoard(observation.board, ['cb',
                                          'bb'])
 
+  def testPlayWithRepeat(self):
+    """play() can apply one action for several frames, stopping at game over."""
+
+    # The goal drape hands out a reward of 1 every frame, and ends the game when
+    # the player steps on top of it.
+    class GoalDrape(tt.TestLargeDrape):
+
+      def real_update(self, actions, board, layers, backdrop, things, the_plot):
+        the_plot.add_reward(1)
+        if self.curtain[things['P'].position]: the_plot.terminate_episode()
+
+    def build_engine():
+      engine = ascii_art.ascii_art_to_game(
+          art=['#######',
+               '#P   G#',
+               '#######'],
+          what_lies_beneath=' ',
+          sprites=dict(P=ascii_art.Partial(tt.TestLargerObject,
+                                           impassable='#')),
+          drapes=dict(G=GoalDrape),
+          update_schedule='PG', z_order='GP')
+      engine.its_showtime()
+      return engine
+
+    # Repeating an action sums the rewards of all of the frames it was applied
+    # for, and the observation is the one for the last frame.
+    engine = build_engine()
+    observation, reward, discount = engine.play('e', repeat=2)
+    self.assertBoard(observation.symbolic_board, ['#######',
+                                                  '#  P G#',
+                                                  '#######'])
+    self.assertEqual(reward, 2)
+    self.assertEqual(discount, 1.0)
+    self.assertEqual(engine.the_plot.frame, 2)
+
+    # The RGB board is the same as one painted without frame skipping.
+    reference = build_engine()
+    reference.play('e')
+    reference_observation, _, _ = reference.play('e')
+    np.testing.assert_array_equal(observation.board,
+                                  reference_observation.board)
+
+    # The game ends after two more frames, even though we asked for five.
+    observation, reward, discount = engine.play('e', repeat=5)
+    self.assertBoard(observation.symbolic_board, ['#######',
+                                                  '#    P#',
+                                                  '#######'])
+    self.assertEqual(reward, 2)
+    self.assertEqual(discount, 0.0)
+    self.assertTrue(engine.game_over)
+    self.assertEqual(engine.the_plot.frame, 4)
+    np.testing.assert_array_equal(observation.board[1, 5], tt.TEST_IMG[0, 0])
+
+    # Frame counts below one are not allowed.
+    with self.assertRaises(ValueError):
+      build_engine().play('e', repeat=0)
+
+    # Without RGB painting, the symbolic board is still up to date, and the
+    # RGB board catches up when it's painted again.
+    engine = build_engine()
+    observation, _, _ = engine.play('e', rgb=False)
+    self.assertBoard(observation.symbolic_board, ['#######',
+                                                  '# P  G#',
+                                                  '#######'])
+    observation, _, _ = engine.play('e')
+    np.testing.assert_array_equal(observation.board,
+                                  reference_observation.board)
+
+  def testSnapshotAndRestore(self):
+    """restore() brings back a snapshot, as many times as we like."""
+    engine = ascii_art.ascii_art_to_game(
+        art=['#####',
+             '#P  #',
+             '#####'],
+        what_lies_beneath=' ',
+        sprites=dict(P=ascii_art.Partial(tt.TestLargerObject, impassable='#')))
+    with six.assertRaisesRegex(self, RuntimeError, 'play mode'):
+      engine.snapshot()
+    engine.its_showtime()
+    snapshot = engine.snapshot()
+
+    for _ in range(2):
+      engine.play('e')
+      observation, _, _ = engine.play('e')
+      self.assertBoard(observation.symbolic_board, ['#####',
+                                                    '#  P#',
+                                                    '#####'])
+      self.assertEqual(engine.the_plot.frame, 2)
+
+      engine.restore(snapshot)
+      self.assertBoard(engine.board.symbolic_board, ['#####',
+                                                     '#P  #',
+                                                     '#####'])
+      self.assertEqual(engine.the_plot.frame, 0)
+      self.assertEqual(engine.things['P'].position, (1, 1))
+
+    # Snapshots belong to the engine that made them.
+    other = ascii_art.ascii_art_to_game(
+        art=['P'], what_lies_beneath=' ',
+        sprites=dict(P=ascii_art.Partial(tt.TestLargerObject)))
+    other.its_showtime()
+    with six.assertRaisesRegex(self, ValueError, 'not made by this Engine'):
+      other.restore(snapshot)
+
+  def testStateHash(self):
+    """state_hash is always the same as a from-scratch Zobrist hash."""
+    def build_engine():
+      return ascii_art.ascii_art_to_game(
+          art=['#####',
+               '#P .#',
+               '#####'],
+          what_lies_beneath=' ',
+          sprites=dict(P=ascii_art.Partial(tt.TestLargerObject,
+                                           impassable='#')))
+
+    engine = build_engine()
+    self.assertIsNone(engine.state_hash)
+    engine.its_showtime()
+    first_hash = engine.state_hash
+    snapshot = engine.snapshot()
+
+    hashes = [first_hash]
+    for action in ['e', 'e', 'e', 'w']:
+      engine.play(action)
+      self.assertEqual(engine.state_hash,
+                       hashing.zobrist_hash(engine.board.symbolic_board))
+      hashes.append(engine.state_hash)
+    # Walking into the wall doesn't change the board, and stepping back off the
+    # '.' restores it; other moves make new boards.
+    self.assertEqual(hashes[2], hashes[3])
+    self.assertEqual(hashes[1], hashes[4])
+    self.assertEqual(len(set(hashes)), 3)
+
+    # The hash keeps up with restores, and other engines agree with it.
+    engine.restore(snapshot)
+    self.assertEqual(engine.state_hash, first_hash)
+    other = build_engine()
+    other.its_showtime()
+    self.assertEqual(other.state_hash, first_hash)
+
+  def testStateHashWithDrapes(self):
+    """state_hash keeps up with Drapes and Backdrops, however they change."""
+
+    # A drape of coins that vanish when the player enters their column.
+    class CoinDrape(tt.TestLargeDrape):
+
+      def real_update(self, actions, board, layers, backdrop, things, the_plot):
+        self.curtain[:, things['P'].position[1]] = False
+
+    # A backdrop that marks the rows the player has visited along the left
+    # wall.
+    class TrailBackdrop(plab_things.Backdrop):
+      NOTES_CURTAIN_CHANGES = True
+
+      def update(self, actions, board, layers, things, the_plot):
+        row = things['P'].position[0]
+        if self.curtain[row, 0] != self.palette['.']:
+          self.curtain[row, 0] = self.palette['.']
+          self._curtain_changed()
+
+    engine = ascii_art.ascii_art_to_game(
+        art=['#######',
+             '.P c c#',
+             '#  c  #',
+             '#######'],
+        what_lies_beneath=' ',
+        sprites=dict(P=ascii_art.Partial(tt.TestLargerObject,
+                                         impassable='#')),
+        drapes=dict(c=CoinDrape),
+        backdrop=TrailBackdrop,
+        update_schedule='Pc', z_order='cP')
+    engine.its_showtime()
+    snapshot = engine.snapshot()
+    for action in ['e', 'e', 's', 'e', 'n', 'e', 'w', 'w', 'w']:
+      engine.play(action)
+      self.assertEqual(engine.state_hash,
+                       hashing.zobrist_hash(engine.board.symbolic_board))
+    engine.restore(snapshot)
+    self.assertEqual(engine.state_hash,
+                     hashing.zobrist_hash(engine.board.symbolic_board))
+
+  def testZobristUpdates(self):
+    """Updated Zobrist hashes match from-scratch ones, however much changed."""
+    rng = np.random.RandomState(0)
+    old_board = rng.randint(32, 127, size=(20, 30)).astype(np.uint8)
+    board_hash = hashing.zobrist_hash(old_board)
+    for num_changes in [0, 1, 5, 100, 600]:
+      new_board = np.copy(old_board)
+      positions = rng.choice(new_board.size, num_changes, replace=False)
+      new_board.flat[positions] = rng.randint(32, 127, size=num_changes)
+      board_hash = hashing.update_zobrist_hash(board_hash, old_board, new_board)
+      self.assertEqual(board_hash, hashing.zobrist_hash(new_board))
+      np.testing.assert_array_equal(old_board, new_board)
+
+      # Updates can be told where to look, with repeats and unchanged cells.
+      new_board.flat[positions] = rng.randint(32, 127, size=num_changes)
+      positions = np.concatenate([positions, positions, [0, 7]])
+      board_hash = hashing.update_zobrist_hash(board_hash, old_board, new_board,
+                                               positions)
+      self.assertEqual(board_hash, hashing.zobrist_hash(new_board))
+      np.testing.assert_array_equal(old_board, new_board)
+
+  def testDirtyTileRendering(self):
+    """Dirty-tile rendering makes the same observations as full rendering."""
+
+    # A drape of coins that the player collects by walking over them.
+    class CoinDrape(tt.TestLargeDrape):
+      NOTES_CURTAIN_CHANGES = True
+
+      def real_update(self, actions, board, layers, backdrop, things, the_plot):
+        if self.curtain[things['P'].position]:
+          self.curtain[things['P'].position] = False
+          self._curtain_changed()
+
+    # A backdrop that marks the columns the player has visited along the
+    # bottom wall.
+    class TrailBackdrop(plab_things.Backdrop):
+      NOTES_CURTAIN_CHANGES = True
+
+      def update(self, actions, board, layers, things, the_plot):
+        col = things['P'].position[1]
+        if self.curtain[4, col] != self.palette['.']:
+          self.curtain[4, col] = self.palette['.']
+          self._curtain_changed()
+
+    def build_engine(tile_size):
+      return ascii_art.ascii_art_to_game(
+          art=['##########',
+               '#P  c    #',
+               '#  c  c  #',
+               '# c  . c #',
+               '##########'],
+          what_lies_beneath=' ',
+          backdrop=TrailBackdrop,
+          sprites=dict(P=ascii_art.Partial(tt.TestLargerObject,
+                                           impassable='#',
+                                           img={(0, 0): (255, 0, 0),
+                                                (1, 1): (0, 255, 0)})),
+          drapes=dict(c=ascii_art.Partial(CoinDrape,
+                                          img={(0, 0): (0, 0, 255),
+                                               (0, 1): (9, 9, 9)})),
+          update_schedule='Pc', z_order='cP', tile_size=tile_size)
+
+    with six.assertRaisesRegex(self, ValueError, 'instance maps'):
+      ascii_art.ascii_art_to_game(['P'], ' ', instance_maps=True, tile_size=2)
+
+    def assert_same_observations(dense_observation, tiled_observation):
+      np.testing.assert_array_equal(dense_observation.board,
+                                    tiled_observation.board)
+      np.testing.assert_array_equal(dense_observation.symbolic_board,
+                                    tiled_observation.symbolic_board)
+      for character, layer in dense_observation.layers.items():
+        np.testing.assert_array_equal(layer,
+                                      tiled_observation.layers[character])
+
+    dense = build_engine(None)
+    tiled = build_engine(3)
+    assert_same_observations(dense.its_showtime()[0], tiled.its_showtime()[0])
+    actions = ['s', 'e', 'e', 'n', 'e', 'se', 'e', 'e', 's', 'w', 'w', 'w']
+    for step, action in enumerate(actions):
+      # Some frames are skipped with `repeat`, so their RGB isn't painted.
+      repeat = 2 if step % 3 == 2 else 1
+      assert_same_observations(dense.play(action, repeat=repeat)[0],
+                               tiled.play(action, repeat=repeat)[0])
+      # Going back to an earlier state repaints what changed since then.
+      if step == 4:
+        dense_snapshot, tiled_snapshot = dense.snapshot(), tiled.snapshot()
+    dense.restore(dense_snapshot)
+    tiled.restore(tiled_snapshot)
+    assert_same_observations(dense.play('w')[0], tiled.play('w')[0])
+
+    # The player really did collect some coins.
+    self.assertLess(dense.things['c'].curtain.sum(), 6)
+
+  def testEntityArray(self):
+    """Entity arrays list every Sprite and Drape instance without rendering."""
+
+    blue = (0, 0, 255)
+    engine = ascii_art.ascii_art_to_game(
+        art=['#######',
+             '#P  G #',
+             '# G   #',
+             '#######'],
+        what_lies_beneath=' ',
+        sprites=dict(P=ascii_art.Partial(
+            tt.TestLargerObject, impassable='#',
+            img={(0, 0): blue, (0, 1): blue, (1, 0): (0, 0, 0)})),
+        drapes=dict(G=tt.TestLargeDrape),
+        z_order='GP')
+    engine.its_showtime()
+    engine.play('e')
+
+    to_entities = rendering.EngineToEntityArray(capacity=4)
+    entities = to_entities(engine)
+    self.assertEqual(entities.dtype, rendering.ENTITY_DTYPE)
+    self.assertEqual(list(entities['valid']), [True, True, True, False])
+    self.assertEqual(''.join(chr(c) for c in entities['character'][:3]), 'GGP')
+    self.assertEqual(list(entities['instance'][:3]), [0, 1, 0])
+    self.assertEqual(list(zip(entities['row'][:3], entities['col'][:3])),
+                     [(1, 4), (2, 2), (1, 2)])
+    self.assertEqual(list(entities['height'][:3]), [1, 1, 2])
+    self.assertEqual(list(entities['width'][:3]), [1, 1, 2])
+    np.testing.assert_array_equal(entities['color'][:3],
+                                  [tt.TEST_IMG[0, 0], tt.TEST_IMG[0, 0],
+                                   (0, 0, 170)])
+
+    # Characters can be filtered, and too many entities is an error.
+    self.assertEqual(
+        rendering.EngineToEntityArray(1, characters='P')(engine)['col'][0], 2)
+    with self.assertRaises(RuntimeError):
+      rendering.EngineToEntityArray(capacity=2)(engine)
+
+    # Entity arrays can be padded and stacked into batches.
+    batch, mask = rendering.stack_entity_arrays(
+        [entities, rendering.EngineToEntityArray(2, characters='P')(engine)])
+    self.assertEqual(batch.shape, (2, 4))
+    np.testing.assert_array_equal(mask, [[1, 1, 1, 0], [1, 0, 0, 0]])
+    self.assertEqual(batch[1, 0]['character'], ord('P'))
+    with self.assertRaises(ValueError):
+      rendering.stack_entity_arrays([entities], capacity=2)
+
+  def testInstanceMaps(self):
+    """Renderings can label whole footprints with instance IDs and characters."""
+
+    engine = ascii_art.ascii_art_to_game(
+        art=['#####',
+             '#P G#',
+             '#  G#',
+             '#####'],
+        what_lies_beneath=' ',
+        sprites=dict(P=ascii_art.Partial(
+            tt.TestLargerObject,
+            img={(0, 0): (1, 1, 1), (1, 0): (2, 2, 2), (0, -1): (3, 3, 3)})),
+        drapes=dict(G=ascii_art.Partial(
+            tt.TestLargeDrape, img={(0, 0): (4, 4, 4), (0, 1): (5, 5, 5)})),
+        z_order='GP', instance_maps=True)
+    self.assertIsNone(engine.instance_ids)
+    observation, _, _ = engine.its_showtime()
+
+    # The backdrop has ID 0, then instances are numbered in painting order.
+    # Pixels that would fall off of the board are dropped.
+    np.testing.assert_array_equal(engine.instance_ids, [[0, 0, 0, 0, 0],
+                                                        [3, 3, 0, 1, 1],
+                                                        [0, 3, 0, 2, 2],
+                                                        [0, 0, 0, 0, 0]])
+    self.assertBoard(engine.footprint_board, ['#####',
+                                              'PP GG',
+                                              '#P GG',
+                                              '#####'])
+    # The symbolic board still marks only the anchors, and the RGB board is
+    # painted from the same stamps.
+    self.assertBoard(observation.symbolic_board, ['#####',
+                                                  '#P G#',
+                                                  '#  G#',
+                                                  '#####'])
+    np.testing.assert_array_equal(observation.board[1, :, 0], [3, 1, 0, 4, 5])
+    np.testing.assert_array_equal(observation.board[2, :, 0], [0, 2, 0, 4, 5])
+
+    # Without instance maps, these properties are None.
+    engine = ascii_art.ascii_art_to_game(
+        art=['P'], what_lies_beneath=' ',
+        sprites=dict(P=tt.TestLargerObject))
+    engine.its_showtime()
+    self.assertIsNone(engine.instance_ids)
+    self.assertIsNone(engine.footprint_board)
+
   def _assertMask(self, actual_mask, mask_art, err_msg=''):  # pylint: disable=invalid-name
     """Compares numpy bool_ arrays with "art" drawn as lists of '0' and '1'."""
     np.testing.assert_array_equal(
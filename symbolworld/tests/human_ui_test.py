@@ -0,0 +1,90 @@
+# Copyright 2017 the pycolab Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests of the redrawing logic of the curses UI in `human_ui.py`."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import sys
+import unittest
+
+import numpy as np
+
+from pycolab import human_ui
+
+
+def _board(art):
+  return np.array([list(row) for row in art]).view(np.uint32).astype(np.uint8)
+
+
+class ChangedRunsTest(unittest.TestCase):
+
+  def testEverythingIsDrawnAtFirst(self):
+    board = _board(['##P#',
+                    '#  #'])
+    colour_pairs = np.where(board == ord('#'), 1, 0)
+    self.assertEqual(human_ui._changed_runs(board, None, colour_pairs),
+                     [(0, 0, 2), (0, 2, 3), (0, 3, 4),
+                      (1, 0, 1), (1, 1, 3), (1, 3, 4)])
+
+  def testOnlyChangesAreDrawn(self):
+    drawn = _board(['#P   #',
+                    '#    #',
+                    '#  ab#'])
+    board = _board(['# P  #',
+                    '#    #',
+                    '#  ba#'])
+    colour_pairs = np.zeros(board.shape, dtype=np.int32)
+    # The changed cells in row 0 are adjacent and share a colour...
+    self.assertEqual(human_ui._changed_runs(board, drawn, colour_pairs),
+                     [(0, 1, 3), (2, 3, 5)])
+    # ...but not if the cells have different colours.
+    colour_pairs[0, 2] = 2
+    self.assertEqual(human_ui._changed_runs(board, drawn, colour_pairs),
+                     [(0, 1, 2), (0, 2, 3), (2, 3, 5)])
+    self.assertEqual(human_ui._changed_runs(board, board, colour_pairs), [])
+
+
+class ThrottleTest(unittest.TestCase):
+
+  def testWaitMs(self):
+    # Block without a timeout or a put-off frame; otherwise, wake for the
+    # earlier of the two, or right away if it has passed.
+    self.assertEqual(human_ui._wait_ms(10.0, None, None), -1)
+    self.assertEqual(human_ui._wait_ms(10.0, 10.5, None), 500)
+    self.assertEqual(human_ui._wait_ms(10.0, None, 10.02), 20)
+    self.assertEqual(human_ui._wait_ms(10.0, 10.5, 10.02), 20)
+    self.assertEqual(human_ui._wait_ms(10.0, 9.0, 10.02), 0)
+
+  def testWokenKeycode(self):
+    # Keypresses are always kept.
+    self.assertEqual(human_ui._woken_keycode(ord('w'), 10.0, None), ord('w'))
+    self.assertEqual(human_ui._woken_keycode(ord('w'), 10.0, 11.0), ord('w'))
+    # Waking with no keypress before the timeout, or with no timeout at all,
+    # was only to draw a put-off frame...
+    self.assertIsNone(human_ui._woken_keycode(-1, 10.0, None))
+    self.assertIsNone(human_ui._woken_keycode(-1, 10.0, 11.0))
+    # ...but at the timeout, the game gets the timeout "keycode".
+    self.assertEqual(human_ui._woken_keycode(-1, 11.0, 11.0), -1)
+
+
+def main(argv=()):
+  del argv  # Unused.
+  unittest.main()
+
+
+if __name__ == '__main__':
+  main(sys.argv)
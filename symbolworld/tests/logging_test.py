@@ -0,0 +1,93 @@
+# Copyright 2017 the pycolab Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests of the logging protocol in `protocols/logging.py`."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import copy
+import sys
+import unittest
+
+from pycolab import plot
+from pycolab.protocols import logging as plab_logging
+
+
+class _Formatted(object):
+  """Counts how many times it has been formatted."""
+
+  def __init__(self):
+    self.count = 0
+
+  def __format__(self, spec):
+    self.count += 1
+    return 'formatted'
+
+
+class LoggingTest(unittest.TestCase):
+
+  def testMessagesAreFormattedOnlyWhenConsumed(self):
+    the_plot = plot.Plot()
+    argument = _Formatted()
+    the_plot.log('Hello, {}!', argument)
+    the_plot.log('No {arguments}, no formatting.')
+    self.assertEqual(argument.count, 0)
+    self.assertEqual(plab_logging.consume(the_plot),
+                     ['Hello, formatted!', 'No {arguments}, no formatting.'])
+    self.assertEqual(argument.count, 1)
+    self.assertEqual(plab_logging.consume(the_plot), [])
+
+  def testLevels(self):
+    the_plot = plot.Plot()
+    argument = _Formatted()
+    the_plot.log('debug {}', argument, level=plab_logging.DEBUG)
+    plab_logging.set_level(the_plot, plab_logging.WARNING)
+    the_plot.log('info {}', argument)
+    the_plot.log('error', level=plab_logging.ERROR)
+    self.assertEqual(plab_logging.consume(the_plot), ['debug formatted', 'error'])
+
+    plab_logging.set_level(the_plot, plab_logging.OFF)
+    the_plot.log('error', level=plab_logging.ERROR)
+    self.assertEqual(plab_logging.consume(the_plot), [])
+
+    with self.assertRaises(TypeError):
+      the_plot.log('oops', levle=plab_logging.ERROR)
+
+  def testCapacity(self):
+    the_plot = plot.Plot()
+    for i in range(plab_logging.DEFAULT_CAPACITY + 5): the_plot.log('{}', i)
+    messages = plab_logging.consume(the_plot)
+    self.assertEqual(len(messages), plab_logging.DEFAULT_CAPACITY)
+    self.assertEqual(messages[0], '5')
+
+    for i in range(5): the_plot.log('{}', i)
+    plab_logging.set_level(the_plot, plab_logging.WARNING)
+    plab_logging.set_capacity(the_plot, 3)
+    the_plot.log('{}', 5, level=plab_logging.WARNING)
+    the_plot.log('{}', 6)
+    # The level survives changes of capacity and copying the Plot.
+    the_plot = copy.deepcopy(the_plot)
+    the_plot.log('{}', 7)
+    self.assertEqual(plab_logging.consume(the_plot), ['3', '4', '5'])
+
+
+def main(argv=()):
+  del argv  # Unused.
+  unittest.main()
+
+
+if __name__ == '__main__':
+  main(sys.argv)
@@ -0,0 +1,83 @@
+# Copyright 2017 the pycolab Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests of the transition table exporter in `mdp.py`."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import sys
+import unittest
+
+import numpy as np
+import six
+
+from pycolab import ascii_art
+from pycolab import mdp
+from pycolab.tests import test_things as tt
+
+
+class GoalDrape(tt.TestLargeDrape):
+  """Ends the game with a reward of 1 when the player `P` steps onto it."""
+
+  def real_update(self, actions, board, layers, backdrop, things, the_plot):
+    if self.curtain[things['P'].position]:
+      the_plot.add_reward(1)
+      the_plot.terminate_episode()
+
+
+def build_corridor():
+  engine = ascii_art.ascii_art_to_game(
+      art=['######',
+           '# P G#',
+           '######'],
+      what_lies_beneath=' ',
+      sprites=dict(P=ascii_art.Partial(tt.TestLargerObject, impassable='#')),
+      drapes=dict(G=GoalDrape),
+      update_schedule='PG', z_order='GP')
+  engine.its_showtime()
+  return engine
+
+
+class MdpTest(tt.PycolabTestCase):
+
+  def testCorridor(self):
+    table = mdp.transition_table(build_corridor(), actions=['w', 'e'])
+
+    # States, in breadth-first order: the start, one step west, one step east,
+    # and two steps east (the goal, which is terminal).
+    self.assertEqual(len(table.keys), 4)
+    np.testing.assert_array_equal(table.transitions, [[1, 2],
+                                                      [1, 0],
+                                                      [0, 3],
+                                                      [3, 3]])
+    np.testing.assert_array_equal(table.rewards, [[0, 0],
+                                                  [0, 0],
+                                                  [0, 1],
+                                                  [0, 0]])
+    np.testing.assert_array_equal(table.terminal, [False, False, False, True])
+
+  def testTooManyStates(self):
+    with six.assertRaisesRegex(self, RuntimeError, 'maximum of 2 states'):
+      mdp.transition_table(build_corridor(), actions=['w', 'e'], max_states=2)
+
+
+def main(argv=()):
+  del argv  # Unused.
+  unittest.main()
+
+
+if __name__ == '__main__':
+  main(sys.argv)
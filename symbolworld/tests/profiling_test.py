@@ -0,0 +1,97 @@
+# Copyright 2017 the pycolab Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests of the `Engine`'s profiling hooks and the `Profiler`."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import functools
+import itertools
+import sys
+import unittest
+
+import numpy as np
+
+from pycolab import ascii_art
+from pycolab import profiling
+from pycolab.tests import test_things as tt
+
+
+class ProfilingTest(tt.PycolabTestCase):
+
+  def testEngineTiming(self):
+    engine = ascii_art.ascii_art_to_game(
+        art=['#####',
+             '#P  #',
+             '#####'],
+        what_lies_beneath=' ',
+        sprites=dict(P=ascii_art.Partial(tt.TestLargerObject, impassable='#')))
+
+    # A fake clock that ticks by a second every time somebody looks at it.
+    profiler = profiling.Profiler(
+        window=3, timer=functools.partial(next, itertools.count()))
+    engine.set_profiler(profiler)
+    self.assertIs(engine.profiler, profiler)
+    engine.its_showtime()
+    for action in ['e', 'e', 'w', 'w']:
+      engine.play(action)
+
+    # Five frames were timed, counting its_showtime, but only three are kept.
+    self.assertEqual(profiler.frames, 3)
+    report = profiler.report()
+    self.assertEqual(list(report)[0], 'frame')
+    self.assertEqual(
+        set(report),
+        {'frame', 'backdrop', 'update/P', 'group/00000', 'render',
+         'apply_and_clear_plot'})
+    self.assertEqual(report['frame'].share, 1.0)
+    for name, stats in report.items():
+      self.assertGreater(stats.mean, 0.0, name)
+      self.assertLessEqual(stats.share, 1.0, name)
+    self.assertEqual(profiler.frame_times('update/P').shape, (3,))
+    self.assertEqual(profiler.frame_times('update/P', frames=2).shape, (2,))
+    self.assertIn('update/P', profiler.format_report())
+    self.assertEqual(profiler.report(frames=0), {})
+
+    # Turning the profiler off means no more timing.
+    engine.set_profiler(None)
+    engine.play('e')
+    self.assertEqual(profiler.frames, 3)
+
+  def testRollingHistogram(self):
+    profiler = profiling.Profiler(window=4)
+    for seconds in [1e-3, 1e-3, 1e-3, 1.0, 1e-3, 1e-3]:
+      profiler.add('frame', seconds)
+      profiler.end_frame()
+    # Only the last four frames are kept.
+    counts, edges = profiler.histogram('frame', bins=[0.0, 0.01, 10.0])
+    np.testing.assert_array_equal(counts, [3, 1])
+    np.testing.assert_array_equal(edges, [0.0, 0.01, 10.0])
+    counts, _ = profiler.histogram('frame', frames=2, bins=[0.0, 0.01, 10.0])
+    np.testing.assert_array_equal(counts, [2, 0])
+
+    profiler.reset()
+    self.assertEqual(profiler.frames, 0)
+    self.assertEqual(profiler.report(), {})
+
+
+def main(argv=()):
+  del argv  # Unused.
+  unittest.main()
+
+
+if __name__ == '__main__':
+  main(sys.argv)
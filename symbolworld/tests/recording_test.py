@@ -0,0 +1,138 @@
+# Copyright 2017 the pycolab Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests of episode recording and replay in `recording.py`."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import six
+
+from pycolab import ascii_art
+from pycolab import recording
+from pycolab.tests import test_things as tt
+
+
+LEVELS = [['#######',
+           '#P   G#',
+           '#######'],
+          ['######',
+           '#G  P#',
+           '######']]
+
+
+class PlayerSprite(tt.TestLargerObject):
+  """Walks west for action 0 and east for action 1."""
+
+  def real_update(self, actions, board, layers, backdrop, things, the_plot):
+    super(PlayerSprite, self).real_update(
+        {0: 'w', 1: 'e'}.get(actions), board, layers, backdrop, things,
+        the_plot)
+
+
+class GoalDrape(tt.TestLargeDrape):
+  """Ends the game with a reward of 1 when the player `P` steps onto it."""
+
+  def real_update(self, actions, board, layers, backdrop, things, the_plot):
+    if self.curtain[things['P'].position]:
+      the_plot.add_reward(1)
+      the_plot.terminate_episode()
+
+
+def make_game(level, seed=None):
+  del seed  # Unused.
+  return ascii_art.ascii_art_to_game(
+      art=level, what_lies_beneath=' ',
+      sprites=dict(P=ascii_art.Partial(PlayerSprite, impassable='#')),
+      drapes=dict(G=GoalDrape),
+      update_schedule='PG', z_order='GP')
+
+
+class RecordingTest(tt.PycolabTestCase):
+
+  def setUp(self):
+    super(RecordingTest, self).setUp()
+    self._directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    shutil.rmtree(self._directory)
+    super(RecordingTest, self).tearDown()
+
+  def _record(self, level, actions, seed=None):
+    """Record an episode; return copies of the observations made in it."""
+    recorder = recording.EpisodeRecorder(self._directory)
+    engine = recorder.recording_engine(make_game(level), level, seed)
+    observations = [engine.its_showtime()[0].symbolic_board.copy()]
+    for action in actions:
+      observations.append(engine.play(action)[0].symbolic_board.copy())
+      if engine.game_over: break
+    recorder.close()
+    return observations
+
+  def testRecordAndReplay(self):
+    first = self._record(LEVELS[0], [1, 0, 1, 1, 1, 1, 1], seed=7)
+    # A second recorder appends to the same recording.
+    second = self._record(LEVELS[1], [1, 0, 0, 0, 1])
+
+    episodes = recording.Recording(self._directory, make_game,
+                                   keyframe_interval=2)
+    self.assertEqual(len(episodes), 2)
+    self.assertEqual(episodes.num_steps, 6 + 4)
+
+    episode = episodes.episode(0)
+    self.assertEqual(episode.seed, 7)
+    self.assertBoard(episode.level, LEVELS[0])
+    np.testing.assert_array_equal(episode.actions, [1, 0, 1, 1, 1, 1])
+    np.testing.assert_array_equal(episode.rewards, [np.nan] * 5 + [1.0])
+    np.testing.assert_array_equal(episode.discounts, [1] * 5 + [0])
+    self.assertIsNone(episodes.episode(1).seed)
+
+    # Replay recreates every observation, in order or out of it.
+    for index, recorded in enumerate([first, second]):
+      replayed = [observation.symbolic_board
+                  for observation in episodes.replay(index)]
+      np.testing.assert_array_equal(replayed, recorded)
+    for index, step in [(0, 6), (0, 1), (1, 3), (0, 5), (0, 0), (0, 3)]:
+      np.testing.assert_array_equal(
+          episodes.observation(index, step).symbolic_board,
+          [first, second][index][step])
+
+    with self.assertRaises(IndexError):
+      episodes.observation(0, 7)
+
+  def testUnfinishedEpisodesAreNotSaved(self):
+    recorder = recording.EpisodeRecorder(self._directory)
+    recorder.begin_episode(LEVELS[0])
+    recorder.record_step(1, None, 1.0)
+    with six.assertRaisesRegex(self, RuntimeError, 'in progress'):
+      recorder.begin_episode(LEVELS[0])
+    self.assertEqual(len(recording.Recording(self._directory)), 0)
+    recorder.end_episode()
+    self.assertEqual(len(recording.Recording(self._directory)), 1)
+
+
+def main(argv=()):
+  del argv  # Unused.
+  unittest.main()
+
+
+if __name__ == '__main__':
+  main(sys.argv)
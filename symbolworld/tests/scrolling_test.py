@@ -503,6 +503,53 @@ class ScrollingTest(tt.PycolabTestCase):
         ],
     )
 
+  def testScrollyCurtainView(self):
+    """A `Scrolly` with a view for a curtain scrolls like one with a copy."""
+    pattern_art = ['#########',
+                   '#+  #   #',
+                   '# #   # #',
+                   '#########']
+    board_art = ['   ',
+                 '   ',
+                 '   ']
+    scrolly_info = prefab_drapes.Scrolly.PatternInfo(
+        pattern_art, board_art,
+        board_northwest_corner_mark='+', what_lies_beneath=' ')
+
+    def make_engine(curtain_view):
+      return ascii_art.ascii_art_to_game(
+          art=board_art, what_lies_beneath=' ',
+          drapes={'#': ascii_art.Partial(
+              tt.TestLargeScrolly, scroll_margins=None,
+              curtain_view=curtain_view, **scrolly_info.kwargs('#'))})
+
+    copying, viewing = make_engine(False), make_engine(True)
+    observations = [copying.its_showtime()[0], viewing.its_showtime()[0]]
+    for action in ['e', 'e', 's', 'e', 'e', 'e', 'n', 'w']:
+      np.testing.assert_array_equal(observations[0].symbolic_board,
+                                    observations[1].symbolic_board)
+      observations = [copying.play(action)[0], viewing.play(action)[0]]
+    self.assertBoard(observations[1].symbolic_board, ['###',
+                                                      '   ',
+                                                      ' # '])
+
+    # The curtain is a view of the pattern, and can't be written to itself.
+    scrolly = viewing.things['#']
+    scrolly.whole_pattern[2, 6] = False
+    self.assertFalse(scrolly.curtain[2].any())
+    with self.assertRaises(ValueError):
+      scrolly.curtain[0, 0] = True
+
+    # After a restore, the curtain is a view of the restored pattern.
+    snapshot = viewing.snapshot()
+    viewing.restore(snapshot)
+    scrolly = viewing.things['#']
+    scrolly.whole_pattern[2, 6] = True
+    self.assertBoard(viewing.play('w')[0].symbolic_board, ['###',
+                                                           '#  ',
+                                                           '  #'])
+
+
 
 def main(argv=()):
   del argv  # Unused.
@@ -0,0 +1,85 @@
+# Copyright 2017 the pycolab Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests of the `RaySensor`."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import sys
+import unittest
+
+import numpy as np
+
+from pycolab import sensors
+
+
+def _board(art):
+  return np.array([list(row) for row in art]).view(np.uint32).astype(np.uint8)
+
+
+class RaySensorTest(unittest.TestCase):
+
+  def testSense(self):
+    board = _board(['#######',
+                    '#  a  #',
+                    '#  P  #',
+                    '#     #',
+                    '#######'])
+    sensor = sensors.RaySensor(num_rays=8, max_range=5)
+    distances, characters = sensor.sense(board, (2, 3))
+    np.testing.assert_allclose(distances, [1, 2 * np.sqrt(2), 3, 2 * np.sqrt(2),
+                                           2, 2 * np.sqrt(2), 3, 2 * np.sqrt(2)],
+                               rtol=1e-6)
+    self.assertEqual(characters.tobytes(), b'a#######')
+
+    # A footprint hides what's inside it, and rays that run out of range stop
+    # with NOTHING.
+    sensor = sensors.RaySensor(num_rays=4, max_range=2,
+                               footprint=[(-1, 0), (0, 0)])
+    distances, characters = sensor.sense(board, (2, 3))
+    np.testing.assert_array_equal(distances, [2, 2, 2, 2])
+    self.assertEqual(characters.tobytes(), b'#\x00#\x00')
+
+  def testBatchedSense(self):
+    # Boards may be different sizes; the edge of each stops rays with NOTHING.
+    boards = [_board(['     ',
+                      '  P  ',
+                      '     ']),
+              _board(['   ',
+                      ' P ',
+                      '  #'])]
+    sensor = sensors.RaySensor(num_rays=4, max_range=3)
+    distances, characters = sensor.sense(boards, [(1, 2), (1, 1)])
+    np.testing.assert_array_equal(distances, [[2, 3, 2, 3],
+                                              [2, 2, 2, 2]])
+    np.testing.assert_array_equal(characters, [[0, 0, 0, 0],
+                                               [0, 0, 0, 0]])
+
+    # Each board's results are the same as for that board alone.
+    for board, position, board_distances, board_characters in zip(
+        boards, [(1, 2), (1, 1)], distances, characters):
+      alone = sensor.sense(board, position)
+      np.testing.assert_array_equal(alone[0], board_distances)
+      np.testing.assert_array_equal(alone[1], board_characters)
+
+
+def main(argv=()):
+  del argv  # Unused.
+  unittest.main()
+
+
+if __name__ == '__main__':
+  main(sys.argv)
@@ -19,6 +19,7 @@ from __future__ import division
 from __future__ import print_function
 
 import sys
+import threading
 import unittest
 
 from pycolab import ascii_art
@@ -336,6 +337,64 @@ class StoryTest(tt.PycolabTestCase):
       ])
 
 
+  def testPrefetching(self):
+    """A `Story` can build upcoming games in the background."""
+
+    class DieAtOnce(tt.TestLargerObject):
+      """Like _DieRightward, but renderable, and it doesn't move."""
+
+      def real_update(self, actions, board, layers, backdrop, things, the_plot):
+        if the_plot.frame == 1:
+          the_plot.terminate_episode()
+          if 'chapter_names' in the_plot:
+            the_plot.next_chapter = the_plot['chapter_names'].pop(0)
+
+    # Builders log which games they built, and in which threads.
+    builds = []
+    def build(art, name):
+      builds.append((name, threading.current_thread()))
+      return ascii_art.ascii_art_to_game(art, what_lies_beneath='.',
+                                         sprites={'P': DieAtOnce})
+
+    # In a list of games, each game's successor is prefetched. (The first
+    # three builds are made by the constructor for compatibility checking.)
+    arts = [['P..'], ['.P.'], ['..P']]
+    story = storytelling.Story(
+        [lambda art=a, i=i: build(art, i) for i, a in enumerate(arts)],
+        prefetch=True)
+    observation, _, _ = story.its_showtime()
+    self.assertBoard(observation.symbolic_board, arts[0])
+    for art in arts[1:]:
+      observation, _, _ = story.play(None)
+      self.assertBoard(observation.symbolic_board, art)
+    story.play(None)
+    self.assertTrue(story.game_over)
+    self.assertEqual(
+        [(name, thread is threading.current_thread())
+         for name, thread in builds[3:]],
+        [(0, True), (1, False), (2, False)])
+
+    # In a dict of games, candidates for prefetching must be specified. Games
+    # that weren't prefetched are built when needed, as usual.
+    del builds[:]
+    arts = {'one': ['P..'], 'two': ['.P.'], 'three': ['..P']}
+    story = storytelling.Story(
+        {k: lambda art=v, k=k: build(art, k) for k, v in arts.items()},
+        first_chapter='one', prefetch=True,
+        prefetch_candidates={'one': ['two'], 'two': ['one']})
+    story.its_showtime()
+    story.the_plot['chapter_names'] = ['two', 'three', None]
+    for art in [arts['two'], arts['three']]:
+      observation, _, _ = story.play(None)
+      self.assertBoard(observation.symbolic_board, art)
+    story.play(None)
+    self.assertTrue(story.game_over)
+    # Game 'one' may also have been prefetched in vain while 'two' was played.
+    built = set((name, thread is threading.current_thread())
+                for name, thread in builds[3:])
+    self.assertEqual(built - {('one', False)},
+                     {('one', True), ('two', False), ('three', True)})
+
 def main(argv=()):
   del argv  # Unused.
   unittest.main()
@@ -295,6 +295,48 @@ class TestScrolly(drapes.Scrolly, TestDrape):
       self._stay(the_plot)
 
 
+# A single red pixel: the default image for the large test entities below.
+TEST_IMG = {(0, 0): (255, 0, 0)}
+
+
+class TestLargerObject(sprites.LargerObject, TestSprite):
+  """A `LargerObject` that supports the injected callables of `TestSprite`.
+
+  Unlike `TestMazeWalker`, this `Sprite` can be painted by the engine's symbolic
+  renderer, which needs an image for every `Sprite`. The image defaults to the
+  single-pixel `TEST_IMG`; use `ascii_art.Partial` to supply a different one.
+  Actions are interpreted exactly as in `TestMazeWalker`.
+  """
+
+  def __init__(self, corner, position, character, impassable='', img=None,
+               **kwargs):
+    super(TestLargerObject, self).__init__(
+        TEST_IMG if img is None else img,
+        corner, position, character, impassable, **kwargs)
+
+  real_update = TestMazeWalker.real_update
+
+
+class TestLargeDrape(plab_things.LargeDrape, TestDrape):
+  """A `LargeDrape` that supports the injected callables of `TestDrape`.
+
+  The image stamped at each cell of the curtain defaults to `TEST_IMG`.
+  """
+
+  def __init__(self, curtain, character, img=None):
+    super(TestLargeDrape, self).__init__(
+        TEST_IMG if img is None else img, curtain, character)
+
+
+class TestLargeScrolly(drapes.Scrolly, TestLargeDrape):
+  """A `Scrolly` that the engine's symbolic renderer can paint.
+
+  Actions are interpreted exactly as in `TestScrolly`.
+  """
+
+  real_update = TestScrolly.real_update
+
+
 class PycolabTestCase(unittest.TestCase):
   """`TestCase` subclass with convenience methods for pycolab testing."""
 
@@ -51,6 +51,7 @@ from __future__ import print_function
 
 import abc
 import collections
+import itertools
 import six
 import numpy as np
 
@@ -63,6 +64,10 @@ class Backdrop(object):
   painted onto the board before any `Sprite` or `Drape` is added there.
   """
 
+  # Subclasses that call `_curtain_changed` after every change they make to the
+  # curtain may set this to True; see `curtain_version`.
+  NOTES_CURTAIN_CHANGES = False
+
   def __init__(self, curtain, palette):
     """Construct a `Backdrop`.
 
@@ -99,6 +104,7 @@ class Backdrop(object):
     # Direct access is highly discouraged. Use the properties instead.
     self._c_u_r_t_a_i_n = curtain
     self._p_a_l_e_t_t_e = palette
+    self._curtain_version = next(_curtain_versions)
 
   def update(self, actions, board, layers, things, the_plot):
     """Update this `Backdrop`'s curtain in response to the rest of the world.
@@ -157,6 +163,28 @@ class Backdrop(object):
     # Final. Do not override.
     return self._p_a_l_e_t_t_e
 
+  @property
+  def curtain_version(self):
+    """A number that changes whenever the curtain does, or None if unknown.
+
+    Renderers can skip looking at an unchanged curtain by comparing this with
+    the number they saw last time. No two changes to any curtain get the same
+    number, so equal numbers mean equal curtains, even across `Engine.restore`.
+
+    The number is only known for `Backdrop`s that never change (those that
+    don't override `update`), and for those that set `NOTES_CURTAIN_CHANGES`,
+    promising to call `_curtain_changed` after every change to the curtain.
+    """
+    # Final. Do not override.
+    if self.NOTES_CURTAIN_CHANGES or type(self).update is Backdrop.update:
+      return self._curtain_version
+    return None
+
+  def _curtain_changed(self):
+    """Note a change to the curtain; see `curtain_version`."""
+    # Final. Do not override.
+    self._curtain_version = next(_curtain_versions)
+
 @six.add_metaclass(abc.ABCMeta)
 class Drape(object):
   """A shape that "drapes" over parts of a pycolab game board.
@@ -166,6 +194,10 @@ class Drape(object):
   the mask will be filled with the character.
   """
 
+  # Subclasses that call `_curtain_changed` after every change they make to the
+  # curtain may set this to True; see `curtain_version`.
+  NOTES_CURTAIN_CHANGES = False
+
   def __init__(self, curtain, character):
     """Construct a `Drape`.
 
@@ -196,6 +228,7 @@ class Drape(object):
     # Direct access is highly discouraged. Use the properties instead.
     self._c_u_r_t_a_i_n = curtain
     self._c_h_a_r_a_c_t_e_r = character
+    self._curtain_version = next(_curtain_versions)
 
   @abc.abstractmethod
   def update(self, actions, board, layers, backdrop, things, the_plot):
@@ -260,6 +293,25 @@ class Drape(object):
     # Final. Do not override.
     return self._c_u_r_t_a_i_n
 
+  @property
+  def curtain_version(self):
+    """A number that changes whenever the curtain does, or None if unknown.
+
+    Caches derived from the curtain (like `LargeDrape.drape_list`) can skip
+    looking at it again when this is the same as last time. No two changes to
+    any curtain get the same number, so equal numbers mean equal curtains,
+    even across `Engine.restore`. The number is only known for `Drape`s that
+    set `NOTES_CURTAIN_CHANGES`, promising to call `_curtain_changed` after
+    every change to the curtain.
+    """
+    # Final. Do not override.
+    return self._curtain_version if self.NOTES_CURTAIN_CHANGES else None
+
+  def _curtain_changed(self):
+    """Note a change to the curtain; see `curtain_version`."""
+    # Final. Do not override.
+    self._curtain_version = next(_curtain_versions)
+
 
 @six.add_metaclass(abc.ABCMeta)
 class Sprite(object):
@@ -434,6 +486,20 @@ class ILarge(object):
       absimg[abscoord] = rgb
     return absimg
 
+  @property
+  def footprint_centre(self) -> (int, int):
+    '''
+    Offset of the centroid of the image's pixels from the object's coordinate,
+    rounded to whole cells. Cached until `img` is replaced or resized.
+    :return: (row offset, column offset)
+    '''
+    cache = getattr(self, '_footprint_centre_cache', None)
+    if cache is None or cache[0] is not self.img or cache[1] != len(self.img):
+      rows, cols = zip(*self.img.keys()) if self.img else ((0,), (0,))
+      centre = int(round(np.mean(rows))), int(round(np.mean(cols)))
+      self._footprint_centre_cache = (self.img, len(self.img), centre)
+    return self._footprint_centre_cache[2]
+
   @property
   def colors(self) -> list:
     '''
@@ -457,10 +523,27 @@ class LargeDrape(Drape, ILarge):
   @property
   def drape_list(self) -> np.ndarray:
     '''
-    Returns the drapes as a list of coordinates
+    Returns the drapes as a list of coordinates (a read-only (N, 2) array).
+    Cached while the curtain is unchanged. Drapes that note their changes (see
+    `Drape.curtain_version`) only search the curtain again after a change.
+    For the others, checking that the count of True cells is the same and that
+    the cached cells are all still True is cheaper than searching a large
+    curtain again, but still visits every cell of the curtain on each call.
     :return:
     '''
-    return np.argwhere(self.curtain)
+    version = self.curtain_version
+    cached_version, cache = getattr(self, '_drape_list_cache', (None, None))
+    curtain = self.curtain
+    if version is not None:
+      stale = cache is None or cached_version != version
+    else:
+      stale = (cache is None or np.count_nonzero(curtain) != len(cache) or
+               not curtain[cache[:, 0], cache[:, 1]].all())
+    if stale:
+      cache = np.argwhere(curtain)
+      cache.setflags(write=False)
+      self._drape_list_cache = (version, cache)
+    return cache
 
 
 @six.add_metaclass(abc.ABCMeta)
@@ -473,3 +556,5 @@ class LargeSprite(Sprite, ILarge):
     super(LargeSprite, self).__init__(*args, **kwargs)
 
 
+# Numbers for `curtain_version`s, unique across all Backdrops and Drapes.
+_curtain_versions = itertools.count()